@@ -0,0 +1,40 @@
+import argparse
+import sys
+
+from solution.solution import ParseError
+from solution.streaming import parse_file
+
+
+parser = argparse.ArgumentParser(
+    prog="python -m solution",
+    description="Python Discord Code Jam: example ISO-8601 parser"
+)
+subparsers = parser.add_subparsers(dest="command", required=True)
+
+parse_parser = subparsers.add_parser(
+    "parse",
+    help="parse a file with one timestamp per line",
+    description="Parse a newline-delimited timestamp file and write one ISO-8601 result per line.",
+)
+parse_parser.add_argument("file", help="the file to parse, or - to read from stdin")
+
+
+def parse_command(args: argparse.Namespace) -> int:
+    """Write the parsed timestamps to stdout and report the invalid lines on stderr."""
+    source = sys.stdin.buffer if args.file == "-" else args.file
+
+    invalid_lines = 0
+    for line_no, result in parse_file(source):
+        if isinstance(result, ParseError):
+            invalid_lines += 1
+            sys.stderr.write(f"line {line_no}: {result.message}\n")
+            sys.stdout.write("\n")
+        else:
+            sys.stdout.write(f"{result.isoformat()}\n")
+
+    return 1 if invalid_lines else 0
+
+
+args = parser.parse_args()
+if args.command == "parse":
+    sys.exit(parse_command(args))
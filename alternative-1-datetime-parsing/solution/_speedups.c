@@ -0,0 +1,269 @@
+/*
+ * An optional C implementation of the hot path of `solution.parse_iso8601`.
+ *
+ * `parse_ascii` parses an ASCII timestamp in one pass and returns the `datetime.datetime` that
+ * `parse_iso8601` would return. It accepts the same formats, reading them greedily like the regex
+ * and slicing engines do. Anything it can't parse, like an invalid format, an invalid value, or a
+ * timestamp with non-ASCII digits, makes it return `None` instead. The caller then hands the
+ * timestamp to the pure-Python parser, which raises the usual exception; that way, the error
+ * messages are defined in one place only.
+ *
+ * Build it with `python -m solution.build`; see `solution.accelerated` for the Python side.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <datetime.h>
+
+/* Valid UTC offsets are strictly between -24 and +24 hours */
+#define MAX_OFFSET_MINUTES (24 * 60 - 1)
+
+/* The interned timezone of every valid offset from `OFFSET_TIMEZONES`, indexed by offset + max */
+static PyObject *offset_timezones[2 * MAX_OFFSET_MINUTES + 1];
+
+static const int days_in_month[13] = {0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31};
+
+/* A fraction has one to six decimals; this turns it into millionths of its time unit */
+static const long long fraction_scales[7] = {0, 100000, 10000, 1000, 100, 10, 1};
+
+static int
+is_digit(char character)
+{
+    return character >= '0' && character <= '9';
+}
+
+/* Decode `width` digits at `position`, or return -1 if they aren't all there */
+static int
+decode_digits(const char *timestamp, Py_ssize_t length, Py_ssize_t position, int width)
+{
+    int value = 0;
+    if (position + width > length) {
+        return -1;
+    }
+    for (int index = 0; index < width; index++) {
+        if (!is_digit(timestamp[position + index])) {
+            return -1;
+        }
+        value = value * 10 + (timestamp[position + index] - '0');
+    }
+    return value;
+}
+
+static int
+is_leap_year(int year)
+{
+    return year % 4 == 0 && (year % 100 != 0 || year % 400 == 0);
+}
+
+static PyObject *
+parse_ascii(PyObject *module, PyObject *argument)
+{
+    if (!PyUnicode_Check(argument) || !PyUnicode_IS_ASCII(argument)) {
+        Py_RETURN_NONE;
+    }
+
+    const char *timestamp = (const char *)PyUnicode_DATA(argument);
+    Py_ssize_t length = PyUnicode_GET_LENGTH(argument);
+    Py_ssize_t position;
+
+    int year, month, day;
+    int hour = 0, minute = 0, second = 0, microsecond = 0;
+    PyObject *timezone = Py_None;
+
+    /* The date is either `YYYY-MM-DD` or `YYYYMMDD`; the separators are both there or both not */
+    int date_separator = length > 4 && timestamp[4] == '-';
+    year = decode_digits(timestamp, length, 0, 4);
+    month = decode_digits(timestamp, length, 4 + date_separator, 2);
+    day = decode_digits(timestamp, length, 6 + 2 * date_separator, 2);
+    if (year < 0 || month < 0 || day < 0 || (date_separator && timestamp[7] != '-')) {
+        Py_RETURN_NONE;
+    }
+    position = 8 + 2 * date_separator;
+
+    if (position < length) {
+        if (timestamp[position] != 'T') {
+            Py_RETURN_NONE;
+        }
+
+        if ((hour = decode_digits(timestamp, length, position + 1, 2)) < 0) {
+            Py_RETURN_NONE;
+        }
+        position += 3;
+
+        /* 0 for the hour, 1 for the minute, and 2 for the second */
+        int smallest_unit = 0;
+
+        /* The minutes and seconds are both preceded by a `:`, or neither of them is */
+        int time_separator = position < length && timestamp[position] == ':';
+        int value = decode_digits(timestamp, length, position + time_separator, 2);
+        if (value >= 0) {
+            minute = value;
+            position += time_separator + 2;
+            smallest_unit = 1;
+
+            int has_separator = !time_separator
+                || (position < length && timestamp[position] == ':');
+            value = decode_digits(timestamp, length, position + time_separator, 2);
+            if (has_separator && value >= 0) {
+                second = value;
+                position += time_separator + 2;
+                smallest_unit = 2;
+            }
+        }
+
+        if (position < length && timestamp[position] == '.') {
+            /* At most six decimals follow the `.`; a seventh one is an invalid timezone */
+            Py_ssize_t end = position + 1;
+            long long fraction = 0;
+            while (end < length && end < position + 7 && is_digit(timestamp[end])) {
+                fraction = fraction * 10 + (timestamp[end] - '0');
+                end++;
+            }
+            if (end == position + 1) {
+                Py_RETURN_NONE;
+            }
+
+            long long millionths = fraction * fraction_scales[end - position - 1];
+            if (smallest_unit == 2) {
+                microsecond = (int)millionths;
+            }
+            else if (smallest_unit == 1) {
+                second = (int)(millionths * 60 / 1000000);
+                microsecond = (int)(millionths * 60 % 1000000);
+            }
+            else {
+                long long rest = millionths * 3600 % 60000000;
+                minute = (int)(millionths * 3600 / 60000000);
+                second = (int)(rest / 1000000);
+                microsecond = (int)(rest % 1000000);
+            }
+            position = end;
+        }
+
+        if (position < length) {
+            char designator = timestamp[position];
+            if (designator == 'Z') {
+                timezone = PyDateTime_TimeZone_UTC;
+                position++;
+            }
+            else if (designator == '+' || designator == '-') {
+                int offset_hours = decode_digits(timestamp, length, position + 1, 2);
+                if (offset_hours < 0) {
+                    Py_RETURN_NONE;
+                }
+                position += 3;
+
+                /* Like `TIMEZONE_PATTERN`, we allow up to two `:` characters before the minutes */
+                Py_ssize_t start = position;
+                while (start < position + 2 && start < length && timestamp[start] == ':') {
+                    start++;
+                }
+
+                int offset_minutes = decode_digits(timestamp, length, start, 2);
+                if (offset_minutes >= 0) {
+                    position = start + 2;
+                }
+                else {
+                    offset_minutes = 0;
+                }
+
+                int offset = offset_hours * 60 + offset_minutes;
+                if (offset > MAX_OFFSET_MINUTES) {
+                    Py_RETURN_NONE;
+                }
+                timezone = offset_timezones[
+                    (designator == '-' ? -offset : offset) + MAX_OFFSET_MINUTES
+                ];
+            }
+            else {
+                Py_RETURN_NONE;
+            }
+
+            /* The timezone should be the last part of the timestamp */
+            if (position < length) {
+                Py_RETURN_NONE;
+            }
+        }
+    }
+
+    /* Validate the values ourselves, so an invalid value doesn't raise an exception here */
+    if (
+        year < 1 || month < 1 || month > 12 || day < 1 || day > days_in_month[month]
+        || (month == 2 && day == 29 && !is_leap_year(year))
+        || hour > 23 || minute > 59 || second > 59
+    ) {
+        Py_RETURN_NONE;
+    }
+
+    return PyDateTimeAPI->DateTime_FromDateAndTime(
+        year, month, day, hour, minute, second, microsecond, timezone,
+        PyDateTimeAPI->DateTimeType
+    );
+}
+
+static PyMethodDef speedups_methods[] = {
+    {
+        "parse_ascii", parse_ascii, METH_O,
+        "Parse an ASCII timestamp like `parse_iso8601`, or return `None` if we can't."
+    },
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "solution._speedups",
+    "An optional C implementation of the hot path of `solution.parse_iso8601`.",
+    -1,
+    speedups_methods,
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    PyDateTime_IMPORT;
+    if (PyDateTimeAPI == NULL) {
+        return NULL;
+    }
+
+    /*
+     * We return the interned timezones of `OFFSET_TIMEZONES` itself, so the results have the very
+     * same `tzinfo` objects as those of the pure-Python parser. They live as long as the
+     * interpreter, and we hold a reference to each of them.
+     */
+    PyObject *solution = PyImport_ImportModule("solution.solution");
+    if (solution == NULL) {
+        return NULL;
+    }
+    PyObject *timezones = PyObject_GetAttrString(solution, "OFFSET_TIMEZONES");
+    Py_DECREF(solution);
+    if (timezones == NULL) {
+        return NULL;
+    }
+
+    for (int offset = -MAX_OFFSET_MINUTES; offset <= MAX_OFFSET_MINUTES; offset++) {
+        if (offset_timezones[offset + MAX_OFFSET_MINUTES] != NULL) {
+            continue;
+        }
+
+        PyObject *key = PyLong_FromLong(offset);
+        if (key == NULL) {
+            Py_DECREF(timezones);
+            return NULL;
+        }
+        PyObject *timezone = PyObject_GetItem(timezones, key);
+        Py_DECREF(key);
+        if (timezone == NULL) {
+            Py_DECREF(timezones);
+            return NULL;
+        }
+        if (!PyTZInfo_Check(timezone)) {
+            PyErr_Format(PyExc_TypeError, "OFFSET_TIMEZONES[%d] is not a tzinfo object", offset);
+            Py_DECREF(timezone);
+            Py_DECREF(timezones);
+            return NULL;
+        }
+        offset_timezones[offset + MAX_OFFSET_MINUTES] = timezone;
+    }
+    Py_DECREF(timezones);
+
+    return PyModule_Create(&speedups_module);
+}
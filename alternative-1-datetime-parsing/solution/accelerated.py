@@ -0,0 +1,43 @@
+"""
+`parse_iso8601` with the optional C extension, if it has been built.
+
+The extension, `solution._speedups`, is built with `python -m solution.build`. If it can't be
+imported, or if the `ISO8601_PARSER_BACKEND` environment variable is set to `python`, this module
+falls back to the pure-Python `solution.solution.parse_iso8601`. Either way, the function accepts
+the same timestamps and raises the same exceptions; `BACKEND` tells which implementation is used.
+"""
+import datetime
+import os
+
+from typing import Optional
+
+from . import solution
+
+try:
+    from ._speedups import parse_ascii
+except ImportError:  # pragma: no cover - the extension is optional
+    parse_ascii = None
+
+if os.environ.get("ISO8601_PARSER_BACKEND", "c") == "python":
+    parse_ascii = None
+
+# The name of the implementation `parse_iso8601` uses
+BACKEND = "python" if parse_ascii is None else "c"
+
+
+def parse_iso8601(timestamp: str, engine: Optional[str] = None) -> datetime.datetime:
+    """
+    Parse an ISO-8601 formatted time stamp, with the C extension if it's available.
+
+    The extension parses valid ASCII timestamps in a single pass. It returns `None` for anything
+    else, like invalid values or non-ASCII digits, and we hand those timestamps to the pure-Python
+    parser to raise the usual exception. An explicit `engine` always selects the pure-Python parser.
+    """
+    if engine is None and (parsed := parse_ascii(timestamp)) is not None:
+        return parsed
+
+    return solution.parse_iso8601(timestamp, engine)
+
+
+if parse_ascii is None:
+    parse_iso8601 = solution.parse_iso8601  # noqa: F811
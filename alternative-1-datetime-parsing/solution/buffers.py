@@ -0,0 +1,127 @@
+import datetime
+import mmap
+import os
+
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .solution import ParseError, parse_iso8601, parse_iso8601_many
+
+
+# A memory-mapped file is decoded and parsed in chunks of about this many bytes, which are large
+# enough to make the per-chunk overhead negligible
+DEFAULT_CHUNK_BYTES = 1 << 20
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+ParseResult = Union[datetime.datetime, ParseError]
+
+
+def parse_iso8601_bytes(
+    buffer: Buffer, start: int = 0, end: Optional[int] = None
+) -> datetime.datetime:
+    """
+    Parse the ISO-8601 formatted time stamp in `buffer[start:end]`.
+
+    The `buffer` can be any buffer that supports slicing, like `bytes`, a `memoryview`, or an
+    `mmap.mmap`. The timestamp is decoded and passed to `parse_iso8601`, so we return the same
+    results and raise the same exceptions. Decoding a short timestamp costs less than parsing it
+    from the bytes in Python would; to parse many timestamps, use `parse_buffer`.
+    """
+    return parse_iso8601(bytes(buffer[start:end]).decode("utf-8", errors="replace"))
+
+
+def parse_buffer(
+    buffer: Buffer,
+    offsets: Iterable[Tuple[int, int]],
+    raise_errors: bool = True,
+    start: int = 0,
+) -> List[ParseResult]:
+    """
+    Parse the timestamps at the given `(start, end)` offsets of `buffer` and return a list.
+
+    The part of the buffer the offsets span is decoded in one go. If it's ASCII, which it is for
+    valid timestamps, the offsets of the characters are those of the bytes and we slice the
+    timestamps out of the decoded `str`; otherwise each timestamp is decoded on its own. The
+    timestamps are then parsed as a batch by `parse_iso8601_many`, so the results and errors are
+    the same: by default, the first error is raised. If `raise_errors` is `False`, a `ParseError`
+    record numbered from `start` is stored at the position of each invalid timestamp.
+    """
+    if not (offsets := list(offsets)):
+        return []
+
+    first = min(line_start for line_start, _ in offsets)
+    last = max(line_end for _, line_end in offsets)
+    span = bytes(buffer[first:last])
+    if (text := span.decode("utf-8", errors="replace")).isascii():
+        timestamps = [text[line_start - first:line_end - first] for line_start, line_end in offsets]
+    else:
+        timestamps = [
+            bytes(buffer[line_start:line_end]).decode("utf-8", errors="replace")
+            for line_start, line_end in offsets
+        ]
+
+    return parse_iso8601_many(timestamps, raise_errors, start)
+
+
+def line_offsets(buffer: Union[bytes, bytearray, mmap.mmap]) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the `(start, end)` offsets of the lines in `buffer`, excluding their line terminators.
+
+    The `buffer` should support `find`, like `bytes` and `mmap.mmap` do. Both `\\n` and `\\r\\n`
+    line terminators are supported and the last line doesn't need a terminator.
+    """
+    start = 0
+    size = len(buffer)
+    while start < size:
+        if (newline := buffer.find(b"\n", start)) == -1:
+            newline = size
+
+        end = newline - 1 if newline > start and buffer[newline - 1] == 0x0D else newline
+        yield start, end
+        start = newline + 1
+
+
+def chunk_buffer(buffer: Union[bytes, bytearray, mmap.mmap], chunk_bytes: int) -> Iterator[bytes]:
+    """Yield consecutive chunks of about `chunk_bytes` bytes of a buffer, split after a newline."""
+    start = 0
+    size = len(buffer)
+    while start < size:
+        if (end := buffer.find(b"\n", min(start + chunk_bytes, size) - 1)) == -1:
+            end = size
+
+        yield bytes(buffer[start:end + 1])
+        start = end + 1
+
+
+def split_lines(chunk: bytes) -> List[str]:
+    """Decode a chunk of whole lines like `solution.streaming.iter_lines` and return the lines."""
+    lines = chunk.decode("utf-8", errors="replace").split("\n")
+    if lines[-1] == "":
+        # The chunk ends with a newline, which doesn't start another line
+        lines.pop()
+
+    return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+
+def parse_mmap(
+    path: Union[str, os.PathLike], chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> Iterator[Tuple[int, ParseResult]]:
+    """
+    Memory-map a newline-delimited timestamp file and lazily yield `(line_no, result)` tuples.
+
+    This is the `mmap` counterpart of `solution.streaming.parse_file`. The file is split into
+    chunks of whole lines with `chunk_buffer`; each chunk is decoded once, split into lines, and
+    parsed as a batch by `parse_iso8601_many`. The result is either a `datetime.datetime` or a
+    `ParseError` record of an invalid timestamp, numbered by its line. Line numbers start at 1.
+    """
+    with open(path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            # An empty file can't be memory-mapped
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            line_no = 1
+            for chunk in chunk_buffer(buffer, chunk_bytes):
+                lines = split_lines(chunk)
+                results = parse_iso8601_many(lines, raise_errors=False, start=line_no)
+                yield from enumerate(results, start=line_no)
+                line_no += len(lines)
@@ -0,0 +1,45 @@
+"""
+Build the optional `solution._speedups` extension module in place.
+
+Run `python -m solution.build` from the directory containing the `solution` package. The
+extension is compiled with the C compiler and flags Python itself was built with, as reported by
+`sysconfig`, so no build dependencies are needed beyond the Python headers and a C toolchain.
+"""
+import os
+import shlex
+import subprocess
+import sys
+import sysconfig
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(PACKAGE_DIRECTORY, "_speedups.c")
+
+
+def extension_path() -> str:
+    """Return the path of the compiled extension module for this interpreter."""
+    return os.path.join(PACKAGE_DIRECTORY, "_speedups" + sysconfig.get_config_var("EXT_SUFFIX"))
+
+
+def build_command() -> list:
+    """Return the command that compiles and links the extension module in one step."""
+    compiler = shlex.split(sysconfig.get_config_var("CC") or "cc")
+    linker = shlex.split(sysconfig.get_config_var("LDSHARED") or "cc -shared")
+    flags = shlex.split(sysconfig.get_config_var("CFLAGS") or "")
+    flags += shlex.split(sysconfig.get_config_var("CCSHARED") or "")
+    includes = [f"-I{sysconfig.get_paths()['include']}"]
+
+    # `LDSHARED` starts with the compiler, followed by the flags it needs to link a shared library
+    return [*compiler, *linker[1:], *flags, "-O3", *includes, SOURCE, "-o", extension_path()]
+
+
+def build() -> str:
+    """Compile the extension module and return its path; a failed build raises an exception."""
+    if sys.platform == "win32":
+        raise RuntimeError("building the extension is only supported on POSIX platforms")
+
+    subprocess.run(build_command(), check=True)
+    return extension_path()
+
+
+if __name__ == "__main__":
+    print(f"Built {build()}")
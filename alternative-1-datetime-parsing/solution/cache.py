@@ -0,0 +1,88 @@
+import collections
+import datetime
+
+from typing import Callable, NamedTuple
+
+from .solution import parse_iso8601
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a `CachedParser`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class CachedParser:
+    """
+    Wrap a parser function with a bounded cache of the most recently parsed timestamps.
+
+    Event streams tend to repeat the same timestamps over and over again. Since `datetime.datetime`
+    objects are immutable, we can hand out the same object for every occurrence of a timestamp,
+    including its `tzinfo`. When the cache is full, the least recently used entry is evicted.
+
+    Only successfully parsed timestamps are cached. An invalid timestamp is passed on to the parser
+    every time, so it still raises an `InvalidFormat` exception.
+
+    A `CachedParser` isn't thread-safe. Unlike the parser functions, which don't share any mutable
+    state, it should not be shared between threads; give each thread a parser of its own instead.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        parser: Callable[[str], datetime.datetime] = parse_iso8601,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("the cache should be able to hold at least one timestamp")
+
+        self.maxsize = maxsize
+        self.parser = parser
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._cache = collections.OrderedDict()
+
+    def __call__(self, timestamp: str) -> datetime.datetime:
+        """Parse `timestamp`, using the cached result if we've seen it recently."""
+        try:
+            parsed = self._cache[timestamp]
+        except KeyError:
+            pass
+        else:
+            self._cache.move_to_end(timestamp)
+            self.hits += 1
+            return parsed
+
+        self.misses += 1
+        parsed = self.parser(timestamp)
+
+        self._cache[timestamp] = parsed
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+        return parsed
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the fraction of lookups that were served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def cache_info(self) -> CacheInfo:
+        """Return the statistics of this cache, like `functools.lru_cache` does."""
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._cache))
+
+    def cache_clear(self) -> None:
+        """Empty the cache and reset the statistics."""
+        self._cache.clear()
+        self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,127 @@
+import array
+import datetime
+import types
+
+from typing import Iterable, List, NamedTuple, Tuple
+
+from .solution import (
+    LEAP_YEARS,
+    OFFSET_TIMEZONES,
+    Fields,
+    ParseError,
+    extended_datetime_fields,
+    locate_error,
+    timestamp_fields,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is an optional dependency
+    numpy = None
+
+
+# The offset column uses this value for timestamps without a timezone designator. Valid offsets
+# are strictly between -24 and +24 hours, so it can't be confused with a real offset.
+NAIVE = -32768
+
+# The offset, in minutes, of each of the interned timezones
+TIMEZONE_OFFSETS = types.MappingProxyType(
+    {timezone: minutes for minutes, timezone in OFFSET_TIMEZONES.items()}
+)
+
+# The number of days between 1970-01-01 and January 1st of every four-digit year
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+DAYS_BEFORE_YEAR = (0,) + tuple(
+    (year - 1) * 365 + (year - 1) // 4 - (year - 1) // 100 + (year - 1) // 400 + 1 - EPOCH_ORDINAL
+    for year in range(1, 10_000)
+)
+
+# The number of days before the first day of each month, in a common and in a leap year
+DAYS_BEFORE_MONTH = (
+    (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334),
+    (0, 0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335),
+)
+
+
+class EpochColumns(NamedTuple):
+    """The columnar result of `parse_iso8601_epoch`."""
+
+    # Microseconds since 1970-01-01T00:00:00Z, normalized with the UTC offset of the timestamp
+    epoch_us: array.array
+    # The UTC offset in minutes, or `NAIVE` if the timestamp didn't have a timezone designator
+    offset_minutes: array.array
+    # A record of each invalid timestamp, ordered by its index; their rows contain zeroes
+    errors: List[ParseError]
+
+
+def epoch_from_fields(fields: Fields) -> Tuple[int, int]:
+    """Return the epoch microseconds and the UTC offset in minutes of valid timestamp fields."""
+    year, month, day, hour, minute, second, microsecond, timezone = fields
+    days = DAYS_BEFORE_YEAR[year] + DAYS_BEFORE_MONTH[LEAP_YEARS[year]][month] + day - 1
+    seconds = ((days * 24 + hour) * 60 + minute) * 60 + second
+
+    if timezone is None:
+        offset = NAIVE
+    else:
+        offset = TIMEZONE_OFFSETS[timezone]
+        seconds -= offset * 60
+
+    return seconds * 1_000_000 + microsecond, offset
+
+
+def parse_iso8601_epoch(timestamps: Iterable[str], raise_errors: bool = True) -> EpochColumns:
+    """
+    Parse an iterable of timestamps into contiguous columns of epoch microseconds and UTC offsets.
+
+    For analytics, we often don't need a `datetime.datetime` per timestamp. This function writes
+    the epoch microseconds directly into an `array.array("q")` and the UTC offsets into an
+    `array.array("h")`. The values agree with `parse_iso8601(timestamp).timestamp()` for aware
+    timestamps, and with the same computation in UTC for naive timestamps.
+
+    Like `parse_iso8601_many`, this function raises the first error by default. If `raise_errors`
+    is `False`, invalid rows are filled with zeroes and a `ParseError` record of each of them is
+    collected in the result.
+    """
+    epoch_us = array.array("q")
+    offset_minutes = array.array("h")
+    errors = []
+
+    # Look up the globals we need once instead of once per timestamp
+    fast_fields, general_fields, leap_years = extended_datetime_fields, timestamp_fields, LEAP_YEARS
+    days_before_year, days_before_month = DAYS_BEFORE_YEAR, DAYS_BEFORE_MONTH
+
+    for index, timestamp in enumerate(timestamps):
+        # Most timestamps are valid `YYYY-MM-DDThh:mm:ss` timestamps, whose epoch we can calculate
+        # right here; anything else is decoded by `timestamp_fields`, which doesn't raise
+        if (fields := fast_fields(timestamp)) is not None:
+            year, month, day, hour, minute, second = fields
+            days = days_before_year[year] + days_before_month[leap_years[year]][month] + day - 1
+            epoch_us.append((((days * 24 + hour) * 60 + minute) * 60 + second) * 1_000_000)
+            offset_minutes.append(NAIVE)
+            continue
+
+        if (fields := general_fields(timestamp)) is not None:
+            epoch, offset = epoch_from_fields(fields)
+        else:
+            error = ParseError(index, *locate_error(timestamp))
+            if raise_errors:
+                raise error.to_exception()
+            errors.append(error)
+            epoch = offset = 0
+
+        epoch_us.append(epoch)
+        offset_minutes.append(offset)
+
+    return EpochColumns(epoch_us, offset_minutes, errors)
+
+
+def to_datetime64(columns: EpochColumns) -> "numpy.ndarray":
+    """
+    Return the epoch column as a NumPy `datetime64[us]` array without copying it.
+
+    NumPy is an optional dependency; an `ImportError` is raised if it isn't installed.
+    """
+    if numpy is None:
+        raise ImportError("converting to datetime64 requires NumPy to be installed")
+
+    return numpy.frombuffer(columns.epoch_us, dtype="datetime64[us]")
@@ -0,0 +1,199 @@
+import datetime
+import functools
+import re
+import types
+
+from typing import Callable, Dict
+
+from .solution import (
+    OFFSET_TIMEZONES,
+    TWO_DIGIT_VALUES,
+    YEAR_VALUES,
+    InvalidFormat,
+    offset_timezone,
+)
+
+
+# A format spec is written like the layouts in the docstrings: `YYYY-MM-DDThh:mm:ss.ffffff±hh:mm`.
+# The spec pattern has the same structure as `TIMESTAMP_PATTERN`, so every format we can compile
+# is a format `parse_iso8601` accepts too.
+SPEC_PATTERN = re.compile(
+    r"YYYY(?P<dateseparator>-?)MM(?P=dateseparator)DD"
+    r"(?:T(?P<time>hh(?:(?P<timeseparator>:?)mm(?:(?P=timeseparator)ss)?)?)"
+    r"(?:\.(?P<fraction>f{1,6}))?"
+    r"(?P<timezone>Z|±hh(?::?mm)?)?)?"
+)
+
+# The single digits, for the odd digit out of a fraction with an odd number of decimals
+ONE_DIGIT_VALUES = types.MappingProxyType({str(value): value for value in range(10)})
+
+# The fields of a spec and the names we give their values in the generated code
+FIELDS = types.MappingProxyType(
+    {"YYYY": "year", "MM": "month", "DD": "day", "hh": "hour", "mm": "minute", "ss": "second"}
+)
+
+# The number of compiled parsers `compile_parser` keeps. A stream rarely has more than a handful of
+# formats, and compiling a parser again takes well under a millisecond.
+CACHE_SIZE = 64
+
+Parser = Callable[[str], datetime.datetime]
+
+
+def digits_expression(start: int, end: int) -> str:
+    """Return an expression that decodes `timestamp[start:end]` with the digit lookup tables."""
+    terms = []
+    for position in range(start, end, 2):
+        width = min(2, end - position)
+        table = "digits" if width == 2 else "single_digits"
+        term = f"{table}[timestamp[{position}:{position + width}]]"
+        if (exponent := end - position - width):
+            term += f" * {10 ** exponent}"
+        terms.append(term)
+    return " + ".join(terms)
+
+
+def generate_source(spec: str, name: str) -> str:
+    """Generate the source code of a parser function for the format `spec`."""
+    if not (match := SPEC_PATTERN.fullmatch(spec)):
+        raise ValueError(f"unsupported timestamp format: {spec!r}")
+
+    # Find the offsets of the fields and of the separators we need to check
+    fields = {}
+    separators = {}
+    position = 0
+    while position < len(spec):
+        for token in FIELDS:
+            if spec.startswith(token, position) and FIELDS[token] not in fields:
+                fields[FIELDS[token]] = (position, position + len(token))
+                position += len(token)
+                break
+        else:
+            if spec[position] == "f":
+                position += len(match["fraction"])
+            elif spec[position] == "±":
+                # The sign of the timezone designator; its fields are decoded separately
+                fields["sign"] = (position, position + 1)
+                if match["timezone"][3:4] == ":":
+                    separators[position + 3] = ":"
+                position += len(match["timezone"])
+            else:
+                separators[position] = spec[position]
+                position += 1
+
+    # Like the fixed-layout parsers, we check all separators with a single string comparison
+    condition = f"len(timestamp) != {len(spec)}"
+    if separators:
+        characters = " + ".join(f"timestamp[{index}]" for index in separators)
+        condition += f" or {characters} != {''.join(separators.values())!r}"
+
+    lines = [
+        f"def {name}(timestamp):",
+        f"    if {condition}:",
+        "        raise InvalidFormat(format_error)",
+        "    try:",
+    ]
+
+    # The arguments of the `datetime.datetime` constructor; the fields we don't have are zero
+    arguments = {
+        field: "0" for field in ("year", "month", "day", "hour", "minute", "second", "microsecond")
+    }
+    for field in arguments:
+        if field in fields:
+            expression = digits_expression(*fields[field])
+            if field == "year":
+                # Most years are in `YEAR_VALUES`, which decodes them with a single lookup
+                expression = f"years.get(timestamp[0:4]) or {expression}"
+            lines.append(f"        {field} = {expression}")
+            arguments[field] = field
+
+    if (fraction := match["fraction"]):
+        # Like `calculate_fractional_time`, we turn the fraction into millionths of the smallest
+        # time unit and split those into the smaller time units
+        start = spec.index(".") + 1
+        millionths = f"({digits_expression(start, start + len(fraction))})"
+        if (scale := 10 ** (6 - len(fraction))) > 1:
+            millionths += f" * {scale}"
+
+        if "second" in fields:
+            lines.append(f"        microsecond = {millionths}")
+            arguments.update(microsecond="microsecond")
+        elif "minute" in fields:
+            lines.append(f"        second, microsecond = divmod({millionths} * 60, 1_000_000)")
+            arguments.update(second="second", microsecond="microsecond")
+        else:
+            lines.append(f"        minute, rest = divmod({millionths} * 3600, 60_000_000)")
+            lines.append("        second, microsecond = divmod(rest, 1_000_000)")
+            arguments.update(minute="minute", second="second", microsecond="microsecond")
+
+    timezone = "None"
+    if (designator := match["timezone"]) == "Z":
+        timezone = "utc"
+    elif designator:
+        sign = fields["sign"][0]
+        hours = f"timestamp[{sign + 1}:{sign + 3}]"
+        lines.append(f"        sign = timestamp[{sign}]")
+        if len(designator) > 3:
+            minutes = f"timestamp[{len(spec) - 2}:{len(spec)}]"
+            lines.append(f"        offset = digits[{hours}] * 60 + digits[{minutes}]")
+        else:
+            minutes = "None"
+            lines.append(f"        offset = digits[{hours}] * 60")
+    lines += [
+        "    except KeyError:",
+        "        raise InvalidFormat(format_error) from None",
+    ]
+
+    if designator and designator != "Z":
+        lines += [
+            '    if sign == "+":',
+            "        timezone = offset_timezones.get(offset)",
+            '    elif sign == "-":',
+            "        timezone = offset_timezones.get(-offset)",
+            "    else:",
+            "        raise InvalidFormat(format_error)",
+            "    if timezone is None:",
+            "        # Let `offset_timezone` raise its usual exception for offsets of 24h or more",
+            f"        offset_timezone(sign, {hours}, {minutes})",
+        ]
+        timezone = "timezone"
+
+    lines.append(f"    return new_datetime({', '.join(arguments.values())}, {timezone})")
+    return "\n".join(lines) + "\n"
+
+
+# Unlike the lookup tables of `solution.solution`, the cache is mutable, but `functools.lru_cache`
+# is safe to share between threads
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_parser(spec: str) -> Parser:
+    """
+    Generate a parser function for timestamps with exactly the format `spec`.
+
+    The spec uses `YYYY`, `MM`, and `DD` for the date, `hh`, `mm`, and `ss` for the time, one to
+    six `f`s for the decimals of a fraction, and `Z` or `±hh:mm`, `±hhmm`, or `±hh` for the
+    timezone designator, like `YYYY-MM-DDThh:mm:ss.ffffff±hh:mm`. Any format `parse_iso8601`
+    accepts can be compiled; a `ValueError` is raised for other specs.
+
+    The generated parser knows the offset of every field, so it checks the separators and decodes
+    the fields without any of the branching of the general parsers. The values are validated by
+    the `datetime.datetime` constructor and the timezone designator by `offset_timezone`, so an
+    invalid value raises the same exception as it would in `parse_iso8601`. A timestamp with any
+    other format, or with non-ASCII digits, raises an `InvalidFormat` exception. The parsers of the
+    `CACHE_SIZE` most recently compiled specs are cached.
+    """
+    name = "parse_" + re.sub(r"\W", "_", spec.replace("±", "offset"))
+    namespace: Dict[str, object] = {
+        "InvalidFormat": InvalidFormat,
+        "format_error": f"the timestamp should be formatted as {spec}",
+        "digits": TWO_DIGIT_VALUES,
+        "years": YEAR_VALUES,
+        "single_digits": ONE_DIGIT_VALUES,
+        "offset_timezones": OFFSET_TIMEZONES,
+        "offset_timezone": offset_timezone,
+        "utc": datetime.timezone.utc,
+        "new_datetime": datetime.datetime,
+    }
+    exec(compile(generate_source(spec, name), f"<compiled parser for {spec}>", "exec"), namespace)
+
+    parser = namespace[name]
+    parser.__doc__ = f"Parse a timestamp formatted as `{spec}`."
+    return parser
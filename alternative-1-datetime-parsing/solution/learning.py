@@ -0,0 +1,167 @@
+import datetime
+
+from typing import Callable, Iterable, List, NamedTuple, Optional, Union
+
+from .compiled import compile_parser
+from .solution import TIMESTAMP_PATTERN, InvalidFormat, ParseError, locate_error, parse_iso8601
+
+
+class LearningInfo(NamedTuple):
+    """Statistics of a `FormatLearningParser`."""
+
+    # The spec of the format the fast path currently parses, if we've learned one
+    format: Optional[str]
+    # Timestamps parsed by the fast path
+    hits: int
+    # Timestamps the fast path rejected, which were handed to the general parser instead
+    fallbacks: int
+    # How often we switched to a newly learned format
+    switches: int
+
+
+def detect_format(timestamp: str) -> Optional[str]:
+    """
+    Return the `compile_parser` spec of the format of a timestamp, like `YYYYMMDDThhmmss±hh`.
+
+    The format is read from a match of `TIMESTAMP_PATTERN`: the `dateseparator` backreference tells
+    an extended date from a truncated one, and the `timeseparator` of `TIME_PATTERN` does the same
+    for the time. `None` is returned for timestamps that don't match the pattern and for formats
+    that can't be compiled, like timestamps with non-ASCII digits or a `±hh::mm` offset.
+    """
+    if not timestamp.isascii() or (match := TIMESTAMP_PATTERN.fullmatch(timestamp)) is None:
+        return None
+
+    separator = match["dateseparator"]
+    spec = f"YYYY{separator}MM{separator}DD"
+    if match["hour"] is None:
+        return spec
+
+    separator = match["timeseparator"]
+    spec += "Thh"
+    if match["minute"] is not None:
+        spec += f"{separator}mm"
+    if match["second"] is not None:
+        spec += f"{separator}ss"
+    if (fraction := match["fraction"]):
+        spec += "." + "f" * len(fraction)
+
+    if match["utc"]:
+        spec += "Z"
+    elif match["sign"]:
+        spec += "±hh"
+        if match["minutes"] is not None:
+            separator = timestamp[match.end("hours"):match.start("minutes")]
+            if separator == "::":
+                # `TIMEZONE_PATTERN` allows two separators, but a spec can't express that
+                return None
+            spec += f"{separator}mm"
+
+    return spec
+
+
+class FormatLearningParser:
+    """
+    Parse a stream of timestamps with a parser specialized for the format the stream currently has.
+
+    In most feeds, the format of the timestamps stays the same for long runs. This parser detects
+    the format of the timestamps it parses with `detect_format`. Once `learn_after` consecutive
+    timestamps share a format, it switches to the parser `compile_parser` generated for it. While
+    the format holds, every timestamp takes that fast path. A timestamp the fast path rejects falls
+    back to the general `parser` and counts towards learning its format; a single odd timestamp
+    doesn't make us give up a format that's still common.
+
+    The results and exceptions are those of the general parser; an invalid value in the learned
+    format, like a 13th month, raises the same `ValueError` on the fast path. The counters are
+    available with `learning_info`.
+
+    A `FormatLearningParser` isn't thread-safe; give each thread or stream a parser of its own.
+    """
+
+    def __init__(
+        self,
+        learn_after: int = 3,
+        parser: Callable[[str], datetime.datetime] = parse_iso8601,
+    ) -> None:
+        if learn_after < 1:
+            raise ValueError("a format should be learned from at least one timestamp")
+
+        self.learn_after = learn_after
+        self.parser = parser
+
+        self.hits = 0
+        self.fallbacks = 0
+        self.switches = 0
+
+        self.format = None
+        self._fast_parser = None
+
+        # The format we're learning, how many timestamps in a row had it, and the number of hits
+        # when we last saw it; a hit in between means the timestamps weren't consecutive
+        self._candidate = None
+        self._streak = 0
+        self._candidate_hits = 0
+
+    def __call__(self, timestamp: str) -> datetime.datetime:
+        """Parse `timestamp`, with the fast path for the learned format if it has that format."""
+        if (fast_parser := self._fast_parser) is not None:
+            try:
+                parsed = fast_parser(timestamp)
+            except InvalidFormat:
+                self.fallbacks += 1
+            else:
+                self.hits += 1
+                return parsed
+
+        # An invalid timestamp raises here, so we only learn the formats of valid timestamps
+        parsed = self.parser(timestamp)
+        self._learn(timestamp)
+        return parsed
+
+    def _learn(self, timestamp: str) -> None:
+        """Count a timestamp towards learning its format and switch formats once it's stable."""
+        if (spec := detect_format(timestamp)) is None:
+            self._candidate = None
+            return
+
+        if spec == self._candidate and self._candidate_hits == self.hits:
+            self._streak += 1
+        else:
+            self._candidate = spec
+            self._streak = 1
+            self._candidate_hits = self.hits
+
+        if self._streak >= self.learn_after and spec != self.format:
+            self.format = spec
+            self._fast_parser = compile_parser(spec)
+            self.switches += 1
+
+    def parse_many(
+        self, timestamps: Iterable[str], raise_errors: bool = True
+    ) -> List[Union[datetime.datetime, ParseError]]:
+        """
+        Parse an iterable of timestamps and return a list of results, like `parse_iso8601_many`.
+
+        By default, the first error is raised. If `raise_errors` is `False`, a `ParseError` record
+        is stored at the position of each invalid timestamp instead. The parsers still raise an
+        exception for an invalid timestamp, which we catch and replace with the record.
+        """
+        results = []
+        for index, timestamp in enumerate(timestamps):
+            try:
+                results.append(self(timestamp))
+            except ValueError:
+                if raise_errors:
+                    raise
+                results.append(ParseError(index, *locate_error(timestamp)))
+
+        return results
+
+    def learning_info(self) -> LearningInfo:
+        """Return the learned format and the statistics of this parser."""
+        return LearningInfo(self.format, self.hits, self.fallbacks, self.switches)
+
+    def reset(self) -> None:
+        """Forget the learned format and reset the statistics."""
+        self.format = self._fast_parser = self._candidate = None
+        self.hits = self.fallbacks = self.switches = 0
+        self._streak = self._candidate_hits = 0
@@ -0,0 +1,165 @@
+import array
+import collections
+import concurrent.futures
+import datetime
+import io
+import itertools
+import mmap
+import os
+
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .buffers import chunk_buffer, split_lines
+from .columnar import EpochColumns, parse_iso8601_epoch
+from .solution import ParseError, parse_iso8601_many
+
+# Each worker parses chunks of about this many lines, or of about this many bytes for files and
+# buffers. Chunks should be large enough that the cost of sending them to a worker is negligible.
+DEFAULT_CHUNK_LINES = 100_000
+DEFAULT_CHUNK_BYTES = 2 << 20
+
+Chunk = Union[List[str], bytes]
+Source = Union[Sequence[str], str, os.PathLike, BinaryIO, bytes, bytearray, memoryview, mmap.mmap]
+
+
+def parse_chunk(chunk: Chunk) -> EpochColumns:
+    """
+    Parse a chunk of timestamps in a worker process.
+
+    A chunk is either a list of timestamps or a `bytes` object with whole lines. We return the
+    `array.array` columns of `parse_iso8601_epoch`, which are pickled as plain bytes, instead of
+    a `datetime.datetime` per timestamp; the error indexes are relative to the chunk.
+    """
+    if isinstance(chunk, bytes):
+        chunk = split_lines(chunk)
+
+    return parse_iso8601_epoch(chunk, raise_errors=False)
+
+
+def chunk_sequence(timestamps: Sequence[str], chunk_lines: int) -> Iterator[List[str]]:
+    """Yield consecutive chunks of `chunk_lines` timestamps."""
+    iterator = iter(timestamps)
+    while (chunk := list(itertools.islice(iterator, chunk_lines))):
+        yield chunk
+
+
+def chunk_file(file: BinaryIO, chunk_bytes: int) -> Iterator[bytes]:
+    """Yield consecutive chunks of about `chunk_bytes` bytes of a file, split after a newline."""
+    remainder = b""
+    while (chunk := file.read(chunk_bytes)):
+        chunk = remainder + chunk
+        end = chunk.rfind(b"\n") + 1
+        if not end:
+            # We haven't seen the end of this line yet
+            remainder = chunk
+            continue
+
+        remainder = chunk[end:]
+        yield chunk[:end]
+
+    # The last line of a file doesn't have to end with a newline
+    if remainder:
+        yield remainder
+
+
+def parse_iso8601_parallel(
+    source: Source,
+    workers: Optional[int] = None,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    raise_errors: bool = True,
+) -> EpochColumns:
+    """
+    Parse a large number of timestamps in parallel with a pool of `workers` processes.
+
+    The `source` can be a sequence of timestamps, a path or a binary file with one timestamp per
+    line, or a buffer with one timestamp per line, like `bytes` or an `mmap.mmap`. It's split into
+    chunks, which are parsed by `parse_iso8601_epoch` in the worker processes. The result has the
+    same columns as `parse_iso8601_epoch`, in the order of the source. The number of workers
+    defaults to the number of processors, like it does for the `ProcessPoolExecutor`.
+
+    Like `parse_iso8601_many`, this function raises the first error by default. If `raise_errors`
+    is `False`, invalid rows are filled with zeroes and a `ParseError` record of each of them is
+    collected in the result.
+    """
+    if isinstance(source, io.TextIOBase):
+        raise TypeError("the file should be opened in binary mode")
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            return parse_iso8601_parallel(file, workers, chunk_lines, chunk_bytes, raise_errors)
+
+    if isinstance(source, (bytes, bytearray, mmap.mmap)):
+        chunks = chunk_buffer(source, chunk_bytes)
+    elif isinstance(source, memoryview):
+        chunks = chunk_buffer(source.tobytes(), chunk_bytes)
+    elif hasattr(source, "read"):
+        chunks = chunk_file(source, chunk_bytes)
+    else:
+        chunks = chunk_sequence(source, chunk_lines)
+
+    epoch_us = array.array("q")
+    offset_minutes = array.array("h")
+    errors = []
+
+    def merge(columns: EpochColumns) -> None:
+        if columns.errors and raise_errors:
+            raise columns.errors[0].to_exception()
+
+        # The error records of a chunk are numbered by their index in the chunk
+        start = len(epoch_us)
+        errors.extend(error._replace(index=start + error.index) for error in columns.errors)
+        epoch_us.extend(columns.epoch_us)
+        offset_minutes.extend(columns.offset_minutes)
+
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        # We merge the chunks in the order we submitted them, whichever worker finishes first. A
+        # couple of chunks per worker keeps them busy without reading the whole source up front.
+        pending = collections.deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(parse_chunk, chunk))
+                if len(pending) == 2 * workers:
+                    merge(pending.popleft().result())
+
+            while pending:
+                merge(pending.popleft().result())
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    return EpochColumns(epoch_us, offset_minutes, errors)
+
+
+def parse_iso8601_threaded(
+    timestamps: Iterable[str],
+    workers: Optional[int] = None,
+    chunk_size: int = 10_000,
+    raise_errors: bool = True,
+) -> List[Union[datetime.datetime, ParseError]]:
+    """
+    Parse an iterable of ISO-8601 formatted time stamps with a pool of `workers` threads.
+
+    The timestamps are split into chunks of `chunk_size`, which are parsed by `parse_iso8601_many`
+    in a `concurrent.futures.ThreadPoolExecutor`. Since the parsers don't share any mutable state,
+    this is safe on every build of CPython; it's only faster on a free-threaded build, where the
+    threads can actually run at the same time. Unlike `parse_iso8601_parallel`, the results are
+    `datetime.datetime` objects, which don't have to be pickled and sent back by a worker process.
+
+    The results and errors are the same as those of `parse_iso8601_many`, in the same order.
+    """
+    timestamps = list(timestamps)
+    starts = range(0, len(timestamps), chunk_size)
+    chunks = [timestamps[start:start + chunk_size] for start in starts]
+
+    results = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        # `map` returns the results in the order of the chunks and raises the first error. The
+        # error records of a chunk are numbered by their index in `timestamps`.
+        for chunk_results in executor.map(
+            parse_iso8601_many, chunks, [raise_errors] * len(chunks), starts
+        ):
+            results.extend(chunk_results)
+
+    return results
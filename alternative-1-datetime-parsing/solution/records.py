@@ -0,0 +1,44 @@
+import datetime
+
+from typing import Iterable, List, NamedTuple, Optional
+
+from .solution import ParseError, extended_datetime_fields, parse_iso8601_many, timestamp_fields
+
+
+class BatchResult(NamedTuple):
+    """The result of `parse_iso8601_records`."""
+
+    # The parsed timestamps, with `None` at the positions of the invalid ones
+    results: List[Optional[datetime.datetime]]
+    # A record for each invalid timestamp, ordered by its index
+    errors: List[ParseError]
+
+
+def parse_if_valid(timestamp: str) -> Optional[datetime.datetime]:
+    """
+    Parse a timestamp like `parse_iso8601`, but return `None` instead of raising an exception.
+
+    The values are checked by `extended_datetime_fields` and `timestamp_fields` before we construct
+    the `datetime.datetime`, so an invalid timestamp doesn't raise anything.
+    """
+    if (fields := extended_datetime_fields(timestamp) or timestamp_fields(timestamp)) is None:
+        return None
+
+    return datetime.datetime(*fields)
+
+
+def parse_iso8601_records(timestamps: Iterable[str]) -> BatchResult:
+    """
+    Parse an iterable of ISO-8601 formatted time stamps without raising exceptions.
+
+    This is `parse_iso8601_many` with `raise_errors=False`, which stores a `ParseError` record at
+    the position of each invalid timestamp instead of an exception. Here, the results have `None`
+    at those positions and the records are collected in a separate list, ordered by their index. A
+    record can be turned into the exception `parse_iso8601` raises with `ParseError.to_exception`.
+    """
+    results = parse_iso8601_many(timestamps, raise_errors=False)
+    errors = [result for result in results if type(result) is ParseError]
+    for error in errors:
+        results[error.index] = None
+
+    return BatchResult(results, errors)
@@ -1,9 +1,18 @@
 import datetime
+import os
 import re
+import types
 
-from typing import Dict, Tuple, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 
+# All module-level state is immutable: compiled patterns, strings, tuples, frozensets, and lookup
+# tables wrapped in a read-only `types.MappingProxyType`. The parsers of this module don't cache
+# anything between calls either, so they can be called from any number of threads at once, even
+# without a GIL. Caches of parsed timestamps, like `solution.cache.CachedParser`, are objects that
+# each thread should create for itself. The only module-level cache of the package is the bounded
+# `functools.lru_cache` of generated parsers in `solution.compiled`, which is thread-safe.
+
 DATE_PATTERN = re.compile(
     r"(?P<year>\d\d\d\d)"     # A date should start with a four-digit year
     r"(?P<dateseparator>-?)"  # Optionally followed by a `-` separator
@@ -24,17 +33,115 @@ TIMEZONE_PATTERN = re.compile(
     r"(?P<utc>Z)|(?:(?P<sign>[-\+])(?P<hours>\d\d)(:?:?(?P<minutes>\d\d))?)"
 )
 
-TIME_UNIT_CONVERSION = {
-    "hour": (60, "minute"),
-    "minute": (60, "second"),
-    "second": (1_000_000, "microsecond")
-}
+# The batch parser matches a complete timestamp in one go by combining the three patterns above. A
+# timezone designator is only allowed after a time part, just like in `parse_iso8601`.
+TIMESTAMP_PATTERN = re.compile(
+    DATE_PATTERN.pattern
+    + r"(?:T" + TIME_PATTERN.pattern + r"(?:" + TIMEZONE_PATTERN.pattern + r")?)?"
+)
+
+# Converting a two-digit field with a dictionary lookup is considerably faster than calling `int`
+TWO_DIGIT_VALUES = types.MappingProxyType({f"{value:02}": value for value in range(100)})
+
+# A `YYYY-MM-DDThh:mm:ss` timestamp with ASCII digits and values in range. Matching a single pattern
+# is cheaper than decoding and checking six fields. The 29th of February has a group of its own,
+# since it's only valid in a leap year; `is_extended_datetime` checks the year of those.
+EXTENDED_DATETIME_PATTERN = re.compile(
+    r"(?!0000)[0-9]{4}-"
+    r"(?:(?:0[1-9]|1[0-2])-(?:0[1-9]|1[0-9]|2[0-8])"  # Every month has at least 28 days
+    r"|(?:0[13-9]|1[0-2])-(?:29|30)"                  # Every month but February has 30 days
+    r"|(?:0[13578]|1[02])-31"                         # Seven months have 31 days
+    r"|(?P<leapday>02-29))"
+    r"T(?:[01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9]"
+)
+
+# The standard only requires the years 1583 to 9999 by default. Decoding a year in this range
+# with a single dictionary lookup is faster than decoding it as two two-digit fields; the fixed
+# layouts leave the years before 1583 to the general parser.
+YEAR_VALUES = types.MappingProxyType({f"{year:04}": year for year in range(1583, 10_000)})
+
+# Leap-year flags for every four-digit year, which includes the years 1583 to 9999 the standard
+# requires by default. This lets us reject a February 29 without constructing a `datetime`.
+LEAP_YEARS = bytes(
+    year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) for year in range(10_000)
+)
+
+# Every valid combination of a month and a day. The 29th of February is included; it's only valid
+# if `LEAP_YEARS` says so.
+DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+VALID_MONTH_DAYS = frozenset(
+    (month, day)
+    for month, days in enumerate(DAYS_IN_MONTH, start=1)
+    for day in range(1, days + 1)
+)
+
+# Every valid UTC offset, in minutes, mapped to an interned `datetime.timezone`. Offsets have to be
+# strictly between -24 and +24 hours; `datetime.timezone` raises a ValueError for the others.
+OFFSET_TIMEZONES = types.MappingProxyType({
+    minutes: datetime.timezone(datetime.timedelta(minutes=minutes))
+    for minutes in range(-24 * 60 + 1, 24 * 60)
+})
+
+# The error messages are shared by the regex engine and the slicing engine
+DATE_ERROR = "the date part of a timestamp should be formatted as YYYY-MM-DD"
+SEPARATOR_ERROR = "the date and time part should be separated by a `T` character"
+TIME_ERROR = "the time part should be formatted as HH[:MM[:SS[.f+]]]"
+TIMEZONE_ERROR = "invalid timezone designator detected"
+TRAILING_CHARACTERS_ERROR = "a valid timestamp was followed by invalid characters"
+
+# The codes of the errors that `parse_iso8601` raises as an `InvalidFormat` exception, mapped to
+# their messages. The other codes (`offset`, `year`, `month`, `day`, `hour`, `minute`, `second`)
+# are for invalid values, which it raises as a plain `ValueError`.
+FORMAT_ERRORS = types.MappingProxyType({
+    "date": DATE_ERROR,
+    "separator": SEPARATOR_ERROR,
+    "time": TIME_ERROR,
+    "timezone": TIMEZONE_ERROR,
+    "trailing": TRAILING_CHARACTERS_ERROR,
+})
+
+# The message of the `ValueError` that `datetime.timezone` raises for offsets of 24 hours or more
+OFFSET_ERROR = (
+    "offset must be a timedelta strictly between -timedelta(hours=24) and timedelta(hours=24),"
+    " not {!r}."
+)
+
+# The code of an error, the offset of the character where parsing failed, and the message
+ErrorLocation = Tuple[str, int, str]
+
+# A fraction has one to six decimals. Scaling it by the power of ten at the index of its length
+# turns it into millionths of its time unit: 0.5 is 500_000 millionths, 0.000001 is one.
+FRACTION_SCALES = (0, 100_000, 10_000, 1_000, 100, 10, 1)
+
+
+# The fields of a timestamp in the order of the positional arguments of `datetime.datetime`
+Fields = Tuple[int, int, int, int, int, int, int, Optional[datetime.timezone]]
 
 
 class InvalidFormat(ValueError):
     """Raised when (a part of) the timestamp was provided in an invalid format."""
 
 
+class ParseError(NamedTuple):
+    """A record of an invalid timestamp in a batch, which we create instead of an exception."""
+
+    # The index of the timestamp in the batch
+    index: int
+    # What's wrong with the timestamp, like `time` for a malformed time part or `month` for a 13th
+    # month; see `FORMAT_ERRORS` for the codes of malformed timestamps
+    code: str
+    # The offset of the first character of the part of the timestamp that's wrong
+    offset: int
+    # The message of the exception `parse_iso8601` raises for the timestamp
+    message: str
+
+    def to_exception(self) -> ValueError:
+        """Create the exception `parse_iso8601` raises for the timestamp."""
+        if self.code in FORMAT_ERRORS:
+            return InvalidFormat(self.message)
+        return ValueError(self.message)
+
+
 def apply_pattern(timestamp: str, pattern: str, error_message: str) -> Tuple[re.Match, str]:
     """
     Match a regex pattern and return a Match object and the unmatched remainder.
@@ -49,6 +156,46 @@ def apply_pattern(timestamp: str, pattern: str, error_message: str) -> Tuple[re.
     return match, timestamp[match.end():]
 
 
+def is_valid_date(year: int, month: int, day: int) -> bool:
+    """
+    Return whether a year, month, and day make a valid date, without constructing anything.
+
+    The month and day are validated together with a single lookup in `VALID_MONTH_DAYS` and the
+    29th of February with `LEAP_YEARS`. The year should have at most four digits.
+    """
+    return bool(
+        year and (month, day) in VALID_MONTH_DAYS and (day != 29 or month != 2 or LEAP_YEARS[year])
+    )
+
+
+def validate_date(year: int, month: int, day: int) -> None:
+    """
+    Reject an invalid date before we try to construct a `datetime.datetime` with it.
+
+    An invalid date (see `is_valid_date`) raises a `ValueError` with the same message the
+    `datetime.datetime` constructor would have used.
+    """
+    if is_valid_date(year, month, day):
+        return
+
+    # Check the units in the same order as `datetime.datetime` does
+    if year < 1:
+        raise ValueError(f"year {year} is out of range")
+    if not 1 <= month <= 12:
+        raise ValueError("month must be in 1..12")
+    raise ValueError("day is out of range for month")
+
+
+def validate_time(hour: int, minute: int, second: int) -> None:
+    """Reject an invalid time with the same message the `datetime.datetime` constructor uses."""
+    if hour > 23:
+        raise ValueError("hour must be in 0..23")
+    if minute > 59:
+        raise ValueError("minute must be in 0..59")
+    if second > 59:
+        raise ValueError("second must be in 0..59")
+
+
 def extract_date(timestamp: str) -> Tuple[Dict[str, int], str]:
     """
     Extract the date from a timestamp and return it as a dictionary plus the remaining string.
@@ -59,7 +206,7 @@ def extract_date(timestamp: str) -> Tuple[Dict[str, int], str]:
     match, remainder = apply_pattern(
         timestamp,
         pattern=DATE_PATTERN,
-        error_message="the date part of a timestamp should be formatted as YYYY-MM-DD",
+        error_message=DATE_ERROR,
     )
 
     # Store the digits we've observed for our date units as `int` objects
@@ -68,32 +215,44 @@ def extract_date(timestamp: str) -> Tuple[Dict[str, int], str]:
     return date, remainder
 
 
+def fractional_seconds(fraction: str) -> int:
+    """Return the microseconds in a fraction of a second."""
+    return int(fraction) * FRACTION_SCALES[len(fraction)]
+
+
+def fractional_minutes(fraction: str) -> Tuple[int, int]:
+    """Return the seconds and microseconds in a fraction of a minute."""
+    return divmod(int(fraction) * FRACTION_SCALES[len(fraction)] * 60, 1_000_000)
+
+
+def fractional_hours(fraction: str) -> Tuple[int, int, int]:
+    """Return the minutes, seconds and microseconds in a fraction of an hour."""
+    minute, microseconds = divmod(int(fraction) * FRACTION_SCALES[len(fraction)] * 3600, 60_000_000)
+    second, microsecond = divmod(microseconds, 1_000_000)
+    return minute, second, microsecond
+
+
 def calculate_fractional_time(fraction: str, time_unit: str) -> Dict[str, int]:
     """
     Calculate fractional time given the relevant `time_unit` the fraction applies to.
 
-    To avoid floating point inaccuracies, the function use fractions combined with `divmod` to
-    calculate the values for the additional time units we need to add.
-    """
-    units = {}
-
-    # A fraction of 0.1 is 1/10; 0.01 = 1/100; and so on.
-    numerator = int(fraction)
-    denominator = 10**len(fraction)
+    To avoid floating point inaccuracies, we convert the fraction to an integer number of
+    millionths of its time unit. That's exact, since a fraction has at most six decimals. We then
+    multiply it by the number of microseconds in the time unit and split the result into the
+    smaller time units with `divmod`. Anything smaller than a microsecond is truncated.
 
-    # We do not convert to smaller time units than microsecond
-    while time_unit != "microsecond":
-        # Get the conversation rate of the current time unit into the next smaller time unit
-        conversion, time_unit = TIME_UNIT_CONVERSION[time_unit]
+    The `fractional_seconds`, `fractional_minutes`, and `fractional_hours` helpers return the
+    values directly, for parsers that don't need them in a dictionary.
+    """
+    if time_unit == "second":
+        return {"microsecond": fractional_seconds(fraction)}
 
-        # Store the amount needed of this time unit in the dict and the remainder as `numerator`
-        units[time_unit], numerator = divmod(numerator * conversion, denominator)
+    if time_unit == "minute":
+        second, microsecond = fractional_minutes(fraction)
+        return {"second": second, "microsecond": microsecond}
 
-        # If we don't have anything left to convert, break
-        if not numerator:
-            break
-
-    return units
+    minute, second, microsecond = fractional_hours(fraction)
+    return {"minute": minute, "second": second, "microsecond": microsecond}
 
 
 def extract_time(timestamp: str) -> Tuple[Dict[str, int], str]:
@@ -114,12 +273,12 @@ def extract_time(timestamp: str) -> Tuple[Dict[str, int], str]:
     if timestamp[0] != "T":
         # We could have made the `T` part of the regex pattern for time, but we wanted to raise an
         # exception with a specific message in case the `T` was missing.
-        raise InvalidFormat("the date and time part should be separated by a `T` character")
+        raise InvalidFormat(SEPARATOR_ERROR)
 
     match, remainder = apply_pattern(
         timestamp[1:],
         pattern=TIME_PATTERN,
-        error_message="the time part should be formatted as HH[:MM[:SS[.f+]]]"
+        error_message=TIME_ERROR
     )
 
     time = {}
@@ -145,6 +304,30 @@ def extract_time(timestamp: str) -> Tuple[Dict[str, int], str]:
     return time, remainder
 
 
+def offset_timezone(sign: str, hours: str, minutes: Optional[str]) -> datetime.timezone:
+    """
+    Return the interned `datetime.timezone` for a UTC offset of ±hours:minutes.
+
+    Repeated offsets return the same `datetime.timezone` instance from `OFFSET_TIMEZONES` instead of
+    creating a new `datetime.timedelta` and `datetime.timezone` for every timestamp. The `minutes`
+    may be `None` for offsets specified as ±HH.
+    """
+    try:
+        offset = TWO_DIGIT_VALUES[hours] * 60 + TWO_DIGIT_VALUES[minutes or "00"]
+    except KeyError:
+        # `\d` also matches non-ASCII digits, which are not in our lookup table
+        offset = int(hours) * 60 + int(minutes or 0)
+
+    if sign == "-":
+        offset = -offset
+
+    try:
+        return OFFSET_TIMEZONES[offset]
+    except KeyError:
+        # Let `datetime.timezone` raise its usual exception for offsets of 24 hours or more
+        return datetime.timezone(datetime.timedelta(minutes=offset))
+
+
 def extract_timezone(timestamp: str) -> Optional[datetime.timezone]:
     """
     Extract the timezone from the remaining `timestamp`.
@@ -153,10 +336,10 @@ def extract_timezone(timestamp: str) -> Optional[datetime.timezone]:
     have been extracted. If no timestamp remains, then we assume that the timestamp did not contain
     a timezone deignation.
 
-    If the timezone designator is `Z`, we return `datetime.timezone.utc`, otherwise we return a
-    `datetime.timezone` with an offset created with a `datetime.timedelta` equal to the provided
-    units. This function raises an `InvalidFormat` exception when either the timezone designator was
-    not recognized or if additional characters were detected after the timezone designation.
+    If the timezone designator is `Z`, we return `datetime.timezone.utc`, otherwise we return the
+    interned `datetime.timezone` with an offset equal to the provided units. This function raises an
+    `InvalidFormat` exception when either the timezone designator was not recognized or if
+    additional characters were detected after the timezone designation.
     """
     if not timestamp:
         # If `timestamp` is empty, we don't have a timezone part in this timestamp
@@ -165,27 +348,387 @@ def extract_timezone(timestamp: str) -> Optional[datetime.timezone]:
     match, remainder = apply_pattern(
         timestamp,
         pattern=TIMEZONE_PATTERN,
-        error_message="invalid timezone designator detected"
+        error_message=TIMEZONE_ERROR
     )
 
     # We should no longer have a remainder, since the timezone should be the last part
     if remainder:
-        raise InvalidFormat("a valid timestamp was followed by invalid characters")
+        raise InvalidFormat(TRAILING_CHARACTERS_ERROR)
 
     # If we matched a `Z`, return `timezone.utc`
     if match["utc"]:
         return datetime.timezone.utc
 
-    # Get the sign of the specified offset
-    sign = match["sign"]
+    # Look up the timezone for the specified offset
+    return offset_timezone(match["sign"], match["hours"], match["minutes"])
+
+
+def parse_basic_date(timestamp: str) -> Optional[datetime.datetime]:
+    """Parse a `YYYYMMDD` timestamp by slicing it at fixed offsets."""
+    digits = TWO_DIGIT_VALUES
+    year, month, day = YEAR_VALUES[timestamp[0:4]], digits[timestamp[4:6]], digits[timestamp[6:8]]
+    if not is_valid_date(year, month, day):
+        return None
+
+    return datetime.datetime(year, month, day)
+
+
+def parse_extended_date(timestamp: str) -> Optional[datetime.datetime]:
+    """Parse a `YYYY-MM-DD` timestamp by slicing it at fixed offsets."""
+    if timestamp[4] + timestamp[7] != "--":
+        return None
+
+    digits = TWO_DIGIT_VALUES
+    year, month, day = YEAR_VALUES[timestamp[0:4]], digits[timestamp[5:7]], digits[timestamp[8:10]]
+    if not is_valid_date(year, month, day):
+        return None
+
+    return datetime.datetime(year, month, day)
+
+
+def parse_basic_datetime(timestamp: str) -> Optional[datetime.datetime]:
+    """Parse a `YYYYMMDDThhmmss` timestamp by slicing it at fixed offsets."""
+    if timestamp[8] != "T":
+        return None
+
+    digits = TWO_DIGIT_VALUES
+    year, month, day = YEAR_VALUES[timestamp[0:4]], digits[timestamp[4:6]], digits[timestamp[6:8]]
+    hour, minute, second = (
+        digits[timestamp[9:11]], digits[timestamp[11:13]], digits[timestamp[13:15]]
+    )
+    if not (is_valid_date(year, month, day) and hour < 24 and minute < 60 and second < 60):
+        return None
+
+    return datetime.datetime(year, month, day, hour, minute, second)
 
-    # Create `int` objects from each non-zero timedelta unit with the correct sign
-    units = {unit: int(sign + amount) for unit in ("hours", "minutes") if (amount := match[unit])}
 
-    return datetime.timezone(datetime.timedelta(**units))
+def is_extended_datetime(timestamp: str) -> bool:
+    """Return whether `timestamp` is a valid `YYYY-MM-DDThh:mm:ss` timestamp with ASCII digits."""
+    if (match := EXTENDED_DATETIME_PATTERN.fullmatch(timestamp)) is None:
+        return False
 
+    # Only the 29th of February sets `lastindex`
+    return match.lastindex is None or LEAP_YEARS[int(timestamp[0:4])] == 1
 
-def parse_iso8601(timestamp: str) -> datetime.datetime:
+
+def extended_datetime_fields(timestamp: str) -> Optional[Tuple[int, int, int, int, int, int]]:
+    """
+    Return the fields of a valid `YYYY-MM-DDThh:mm:ss` timestamp, or `None` for anything else.
+
+    Most timestamps have this layout, so this is the fast path of the parsers that need the fields
+    rather than a `datetime.datetime`. The values are checked by `is_extended_datetime` before we
+    decode them, so an invalid value returns `None` too; the caller's general path deals with it.
+    """
+    if not is_extended_datetime(timestamp):
+        return None
+
+    digits = TWO_DIGIT_VALUES
+    return (
+        YEAR_VALUES.get(timestamp[0:4]) or int(timestamp[0:4]),
+        digits[timestamp[5:7]],
+        digits[timestamp[8:10]],
+        digits[timestamp[11:13]],
+        digits[timestamp[14:16]],
+        digits[timestamp[17:19]],
+    )
+
+
+def parse_extended_datetime(timestamp: str) -> Optional[datetime.datetime]:
+    """Parse a `YYYY-MM-DDThh:mm:ss` timestamp with `extended_datetime_fields`."""
+    if (fields := extended_datetime_fields(timestamp)) is None:
+        return None
+
+    return datetime.datetime(*fields)
+
+
+# The fixed layouts can be told apart by their length alone. Each layout parser checks the
+# separators at their fixed positions and the values with the lookup tables, and returns `None` if
+# the timestamp doesn't have the layout or has an invalid value.
+FIXED_LAYOUT_PARSERS = types.MappingProxyType({
+    8: parse_basic_date,
+    10: parse_extended_date,
+    15: parse_basic_datetime,
+    19: parse_extended_datetime,
+})
+
+
+def parse_fixed_layout(timestamp: str) -> Optional[datetime.datetime]:
+    """
+    Parse a timestamp with one of the fixed layouts in a single step.
+
+    This function returns `None` if the timestamp does not have one of the fixed layouts, so the
+    caller can fall back to the general parser. We never construct a `datetime.datetime` with
+    invalid values: a timestamp with a valid layout but an invalid value, like a 13th month, is
+    also left to the general parser, which rejects it with the usual `ValueError`.
+    """
+    if (layout_parser := FIXED_LAYOUT_PARSERS.get(len(timestamp))) is None:
+        return None
+
+    try:
+        return layout_parser(timestamp)
+    except KeyError:
+        # One of the fields contains something other than ASCII digits, or the year is before 1583
+        return None
+
+
+def parse_general(timestamp: str) -> datetime.datetime:
+    """Parse a timestamp by extracting its date, time, and timezone parts one after the other."""
+    date, remainder = extract_date(timestamp)
+    time, remainder = extract_time(remainder)
+    timezone = extract_timezone(remainder)
+
+    # Reject an invalid date ourselves; letting the `datetime` constructor raise is expensive
+    validate_date(**date)
+
+    return datetime.datetime(**date, **time, tzinfo=timezone)
+
+
+def timestamp_fields(timestamp: str) -> Optional[Fields]:
+    """
+    Return the fields of any timestamp `parse_iso8601` accepts, or `None` if it would raise.
+
+    The fields are in the order of the positional arguments of `datetime.datetime`. We match the
+    combined `TIMESTAMP_PATTERN` and check the values with the lookup tables, so this function
+    never raises and never constructs a `datetime.datetime`; the timezone is an interned one from
+    `OFFSET_TIMEZONES`. Callers that expect mostly `YYYY-MM-DDThh:mm:ss` timestamps should try
+    `extended_datetime_fields` first.
+    """
+    if (match := TIMESTAMP_PATTERN.fullmatch(timestamp)) is None:
+        return None
+
+    (
+        year, _, month, day, hour, _, minute, second, fraction, utc, sign, hours, _, minutes
+    ) = match.groups()
+
+    # `\d` also matches non-ASCII digits, which are not in our lookup table
+    decode = TWO_DIGIT_VALUES.__getitem__ if timestamp.isascii() else int
+
+    year = YEAR_VALUES.get(year) or int(year)
+    month, day = decode(month), decode(day)
+    if not is_valid_date(year, month, day):
+        return None
+
+    if hour is None:
+        return year, month, day, 0, 0, 0, 0, None
+
+    # Like `extract_time`, a fraction applies to the smallest time unit of the timestamp
+    microsecond = 0
+    if second is not None:
+        minute, second = decode(minute), decode(second)
+        if fraction:
+            microsecond = fractional_seconds(fraction)
+    elif minute is not None:
+        minute, second = decode(minute), 0
+        if fraction:
+            second, microsecond = fractional_minutes(fraction)
+    elif fraction:
+        minute, second, microsecond = fractional_hours(fraction)
+    else:
+        minute = second = 0
+
+    hour = decode(hour)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+
+    if utc:
+        timezone = datetime.timezone.utc
+    elif sign:
+        offset = decode(hours) * 60 + (decode(minutes) if minutes else 0)
+        if (timezone := OFFSET_TIMEZONES.get(-offset if sign == "-" else offset)) is None:
+            return None
+    else:
+        timezone = None
+
+    return year, month, day, hour, minute, second, microsecond, timezone
+
+
+def locate_error(timestamp: str) -> Optional[ErrorLocation]:
+    """
+    Find out what's wrong with a timestamp without raising an exception.
+
+    Return the code, the offset, and the message of the error `parse_iso8601` would raise for the
+    timestamp, or `None` if it's valid. Like `parse_general`, we match the date, time, and timezone
+    patterns one after the other and then check the values in the order `parse_iso8601` does.
+    """
+    length = len(timestamp)
+    if (date := DATE_PATTERN.match(timestamp)) is None:
+        return "date", 0, DATE_ERROR
+
+    time = None
+    if (position := date.end()) < length:
+        if timestamp[position] != "T":
+            return "separator", position, SEPARATOR_ERROR
+        if (time := TIME_PATTERN.match(timestamp, position + 1)) is None:
+            return "time", position + 1, TIME_ERROR
+
+        if (position := time.end()) < length:
+            if (timezone := TIMEZONE_PATTERN.match(timestamp, position)) is None:
+                return "timezone", position, TIMEZONE_ERROR
+            if timezone.end() < length:
+                return "trailing", timezone.end(), TRAILING_CHARACTERS_ERROR
+
+            if timezone["sign"]:
+                offset = int(timezone["hours"]) * 60 + int(timezone["minutes"] or 0)
+                if offset >= 24 * 60:
+                    sign = -1 if timezone["sign"] == "-" else 1
+                    delta = datetime.timedelta(minutes=sign * offset)
+                    return "offset", position, OFFSET_ERROR.format(delta)
+
+    year, month, day = int(date["year"]), int(date["month"]), int(date["day"])
+    if year < 1:
+        return "year", 0, f"year {year} is out of range"
+    if not 1 <= month <= 12:
+        return "month", date.start("month"), "month must be in 1..12"
+    if (month, day) not in VALID_MONTH_DAYS or (day == 29 and month == 2 and not LEAP_YEARS[year]):
+        return "day", date.start("day"), "day is out of range for month"
+
+    if time is not None:
+        if int(time["hour"]) > 23:
+            return "hour", time.start("hour"), "hour must be in 0..23"
+        if time["minute"] and int(time["minute"]) > 59:
+            return "minute", time.start("minute"), "minute must be in 0..59"
+        if time["second"] and int(time["second"]) > 59:
+            return "second", time.start("second"), "second must be in 0..59"
+
+    return None
+
+
+def slice_fields(timestamp: str) -> Fields:
+    """
+    Extract the fields of a timestamp without regular expressions by slicing it at their offsets.
+
+    This function determines the format by looking at the characters at the positions where a
+    separator (`-`, `:`, `T`, `.`, `Z`, `±`) may appear. It accepts the same timestamps as the regex
+    engine (`parse_general`) and raises the same `InvalidFormat` messages. Since the regex engine
+    accepts any decimal digit, we use `str.isdecimal` to validate the fields.
+
+    The values of the fields are not validated; that's left to the caller.
+    """
+    length = len(timestamp)
+
+    # The date part is either `YYYY-MM-DD` or `YYYYMMDD`; mixing the two is not allowed
+    if timestamp[4:5] == "-" and timestamp[7:8] == "-":
+        year, month, day, position = timestamp[0:4], timestamp[5:7], timestamp[8:10], 10
+    else:
+        year, month, day, position = timestamp[0:4], timestamp[4:6], timestamp[6:8], 8
+
+    if len(date_digits := year + month + day) != 8 or not date_digits.isdecimal():
+        raise InvalidFormat(DATE_ERROR)
+
+    hour = minute = second = microsecond = 0
+    timezone = None
+
+    if position < length:
+        if timestamp[position] != "T":
+            raise InvalidFormat(SEPARATOR_ERROR)
+
+        hour_digits = timestamp[position + 1:position + 3]
+        if len(hour_digits) != 2 or not hour_digits.isdecimal():
+            raise InvalidFormat(TIME_ERROR)
+
+        hour = int(hour_digits)
+        position += 3
+        smallest_unit = "hour"
+
+        # The minutes and seconds are both preceded by a `:`, or neither of them is. We use the
+        # boolean as the width of the separator.
+        separator = timestamp[position:position + 1] == ":"
+
+        minute_digits = timestamp[position + separator:position + separator + 2]
+        if len(minute_digits) == 2 and minute_digits.isdecimal():
+            minute = int(minute_digits)
+            position += separator + 2
+            smallest_unit = "minute"
+
+            second_digits = timestamp[position + separator:position + separator + 2]
+            has_separator = not separator or timestamp[position:position + 1] == ":"
+            if has_separator and len(second_digits) == 2 and second_digits.isdecimal():
+                second = int(second_digits)
+                position += separator + 2
+                smallest_unit = "second"
+
+        if timestamp[position:position + 1] == ".":
+            # Find the end of the (at most six) decimals following the `.`
+            end = position + 1
+            while end < min(length, position + 7) and timestamp[end].isdecimal():
+                end += 1
+
+            if (fraction := timestamp[position + 1:end]):
+                if smallest_unit == "second":
+                    microsecond = fractional_seconds(fraction)
+                elif smallest_unit == "minute":
+                    second, microsecond = fractional_minutes(fraction)
+                else:
+                    minute, second, microsecond = fractional_hours(fraction)
+                position = end
+
+        if position < length:
+            designator = timestamp[position]
+            if designator == "Z":
+                position += 1
+            elif designator == "+" or designator == "-":
+                offset_hours = timestamp[position + 1:position + 3]
+                if len(offset_hours) != 2 or not offset_hours.isdecimal():
+                    raise InvalidFormat(TIMEZONE_ERROR)
+                position += 3
+
+                # Like `TIMEZONE_PATTERN`, we allow up to two `:` characters before the minutes
+                start = position
+                while start < position + 2 and timestamp[start:start + 1] == ":":
+                    start += 1
+
+                offset_minutes = timestamp[start:start + 2]
+                if len(offset_minutes) == 2 and offset_minutes.isdecimal():
+                    position = start + 2
+                else:
+                    offset_minutes = None
+            else:
+                raise InvalidFormat(TIMEZONE_ERROR)
+
+            # The timezone should be the last part of the timestamp
+            if position < length:
+                raise InvalidFormat(TRAILING_CHARACTERS_ERROR)
+
+            if designator == "Z":
+                timezone = datetime.timezone.utc
+            else:
+                timezone = offset_timezone(designator, offset_hours, offset_minutes)
+
+    return int(year), int(month), int(day), hour, minute, second, microsecond, timezone
+
+
+def parse_sliced(timestamp: str) -> datetime.datetime:
+    """
+    Parse a timestamp with the fields extracted by `slice_fields`.
+
+    This is the slicing engine. It accepts the same timestamps as the regex engine and raises the
+    same exceptions, but it doesn't use regular expressions and it constructs the
+    `datetime.datetime` with positional arguments. Like the regex engine, it rejects invalid
+    values before it constructs the `datetime.datetime`.
+    """
+    fields = slice_fields(timestamp)
+    validate_date(*fields[:3])
+    validate_time(*fields[3:6])
+    return datetime.datetime(*fields)
+
+
+# The parser engines that `parse_iso8601` can use for timestamps without a fixed layout
+PARSER_ENGINES = types.MappingProxyType({
+    "regex": parse_general,
+    "slicing": parse_sliced,
+})
+
+# The default engine can be selected before the module is imported with an environment variable.
+# We check it right away: most timestamps never reach an engine, which would hide a typo.
+DEFAULT_ENGINE = os.environ.get("ISO8601_PARSER_ENGINE", "regex")
+if DEFAULT_ENGINE not in PARSER_ENGINES:
+    raise ValueError(
+        f"unknown parser engine in ISO8601_PARSER_ENGINE: {DEFAULT_ENGINE!r}; "
+        f"expected one of {', '.join(sorted(PARSER_ENGINES))}"
+    )
+
+
+def parse_iso8601(timestamp: str, engine: Optional[str] = None) -> datetime.datetime:
     """
     Parse an ISO-8601 formatted time stamp.
 
@@ -209,9 +752,52 @@ def parse_iso8601(timestamp: str) -> datetime.datetime:
     - Z
     - ±HH
     - ±HH:SS
+
+    The `engine` argument selects the engine (see `PARSER_ENGINES`) used for timestamps that do not
+    have one of the fixed layouts. If it's not given, we use the `DEFAULT_ENGINE`.
     """
-    date, remainder = extract_date(timestamp)
-    time, remainder = extract_time(remainder)
-    timezone = extract_timezone(remainder)
+    # Like the default engine, an explicit engine is checked even if the timestamp doesn't need it
+    if engine is not None and engine not in PARSER_ENGINES:
+        raise ValueError(f"unknown parser engine: {engine!r}")
 
-    return datetime.datetime(**date, **time, tzinfo=timezone)
+    # Most timestamps have one of a few fixed layouts that we can parse without regular expressions
+    if (parsed := parse_fixed_layout(timestamp)) is not None:
+        return parsed
+
+    return PARSER_ENGINES[engine or DEFAULT_ENGINE](timestamp)
+
+
+def parse_iso8601_many(
+    timestamps: Iterable[str], raise_errors: bool = True, start: int = 0
+) -> List[Union[datetime.datetime, ParseError]]:
+    """
+    Parse an iterable of ISO-8601 formatted time stamps and return a list of results.
+
+    This function accepts the same formats as `parse_iso8601`, but it avoids most of the per-call
+    overhead. The fields of a `YYYY-MM-DDThh:mm:ss` timestamp are decoded by
+    `extended_datetime_fields`, like the fixed-layout fast path of `parse_iso8601` does, and any
+    other timestamp is decoded by `timestamp_fields`. Both check the values without raising, so the
+    `datetime.datetime` is constructed from valid fields only.
+
+    If `timestamp_fields` rejects a timestamp, `locate_error` finds out what's wrong with it. By
+    default, the exception `parse_iso8601` would raise for the first invalid timestamp is raised.
+    If `raise_errors` is `False`, a `ParseError` record is stored at the position of each invalid
+    timestamp instead, so the returned list always lines up with the input and no exception is
+    ever created. The records are numbered from `start`, for a batch that's part of a larger one.
+    """
+    # Look up the globals we need once instead of once per timestamp
+    extended_fields, fields = extended_datetime_fields, timestamp_fields
+    new_datetime = datetime.datetime
+
+    results = []
+    append = results.append
+
+    for index, timestamp in enumerate(timestamps, start):
+        if (values := extended_fields(timestamp) or fields(timestamp)) is not None:
+            append(new_datetime(*values))
+        elif raise_errors:
+            raise ParseError(index, *locate_error(timestamp)).to_exception()
+        else:
+            append(ParseError(index, *locate_error(timestamp)))
+
+    return results
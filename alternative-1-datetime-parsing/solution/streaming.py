@@ -0,0 +1,132 @@
+import asyncio
+import datetime
+import io
+import os
+
+from typing import AsyncIterator, BinaryIO, Iterator, Tuple, Union
+
+from .buffers import split_lines
+from .solution import ParseError, parse_iso8601_many
+
+
+# Reading a newline-delimited file in chunks of this many bytes keeps the memory use constant,
+# while the chunks are large enough to make the per-chunk overhead negligible.
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# An asyncio stream is read in smaller chunks, since a chunk is parsed before we read the next one.
+# We hand control back to the event loop after every batch of lines.
+DEFAULT_STREAM_CHUNK_SIZE = 1 << 16
+DEFAULT_STREAM_BATCH_SIZE = 256
+
+Source = Union[str, os.PathLike, BinaryIO]
+ParseResult = Tuple[int, Union[datetime.datetime, ParseError]]
+
+
+def iter_lines(file: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the lines of a binary file without their line terminators, reading it in large chunks.
+
+    Each chunk is split at its last newline; the incomplete line after it is carried over to the
+    next chunk. This way we decode each chunk in one go and never hold more than a chunk (plus one
+    line) in memory. Both `\\n` and `\\r\\n` line terminators are supported.
+    """
+    remainder = b""
+    while (chunk := file.read(chunk_size)):
+        chunk = remainder + chunk
+        end = chunk.rfind(b"\n") + 1
+        if not end:
+            # We haven't seen the end of this line yet
+            remainder = chunk
+            continue
+
+        remainder = chunk[end:]
+        for line in chunk[:end].decode("utf-8", errors="replace").split("\n")[:-1]:
+            yield line[:-1] if line.endswith("\r") else line
+
+    # The last line of a file doesn't have to end with a newline
+    if remainder:
+        line = remainder.decode("utf-8", errors="replace")
+        yield line[:-1] if line.endswith("\r") else line
+
+
+def parse_lines(
+    lines: Iterator[str], batch_size: int = 10_000, start: int = 1
+) -> Iterator[ParseResult]:
+    """
+    Parse an iterator of timestamps in batches and lazily yield `(line_no, result)` tuples.
+
+    The result is either a `datetime.datetime` or a `ParseError` record of an invalid timestamp,
+    numbered by its line; one invalid line does not stop the stream.
+    """
+    line_no = start
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == batch_size:
+            results = parse_iso8601_many(batch, raise_errors=False, start=line_no)
+            yield from enumerate(results, start=line_no)
+            line_no += len(batch)
+            batch = []
+
+    if batch:
+        results = parse_iso8601_many(batch, raise_errors=False, start=line_no)
+        yield from enumerate(results, start=line_no)
+
+
+def parse_file(source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[ParseResult]:
+    """
+    Parse a newline-delimited timestamp file and lazily yield `(line_no, result)` tuples.
+
+    The `source` can be a path or a binary file object. If it's a path, the file is opened when
+    iteration starts and closed when the generator is exhausted or closed. Line numbers start at 1.
+    """
+    if isinstance(source, io.TextIOBase):
+        raise TypeError("the file should be opened in binary mode")
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            yield from parse_lines(iter_lines(file, chunk_size))
+    else:
+        yield from parse_lines(iter_lines(source, chunk_size))
+
+
+async def parse_stream(
+    reader: asyncio.StreamReader,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+) -> AsyncIterator[ParseResult]:
+    """
+    Parse the newline-delimited timestamps of an asyncio stream and yield `(line_no, result)`.
+
+    The stream is read in chunks of whole lines. Like `iter_lines`, we decode each chunk in one go
+    and split it into lines, which are parsed in batches of `batch_size` by `parse_iso8601_many`.
+    After every batch, we give the event loop a chance to run other tasks, so a busy stream doesn't
+    starve them. Like `parse_file`, the result is either a `datetime.datetime` or a `ParseError`
+    record of an invalid timestamp, numbered by its line.
+    """
+    line_no = 1
+    remainder = b""
+    while True:
+        if (chunk := await reader.read(chunk_size)):
+            chunk = remainder + chunk
+            end = chunk.rfind(b"\n") + 1
+            if not end:
+                # We haven't seen the end of this line yet
+                remainder = chunk
+                continue
+
+            remainder, chunk = chunk[end:], chunk[:end]
+        elif remainder:
+            # The last line of a stream doesn't have to end with a newline
+            remainder, chunk = b"", remainder
+        else:
+            return
+
+        lines = split_lines(chunk)
+        for start in range(0, len(lines), batch_size):
+            batch = lines[start:start + batch_size]
+            for result in parse_iso8601_many(batch, raise_errors=False, start=line_no):
+                yield line_no, result
+                line_no += 1
+
+            await asyncio.sleep(0)
@@ -0,0 +1,24 @@
+from typing import Iterable, List
+
+from .solution import is_extended_datetime, timestamp_fields
+
+
+def is_valid_iso8601(timestamp: str) -> bool:
+    """
+    Return whether `parse_iso8601` would accept `timestamp`, without parsing it.
+
+    The timestamp has to have one of the formats `parse_iso8601` accepts and values it accepts: a
+    valid day of the month (including the 29th of February in leap years only), a time no later
+    than 23:59:59, and a UTC offset strictly between -24 and +24 hours. The checks are those of
+    `is_extended_datetime` and `timestamp_fields`, so we never construct a `datetime.datetime`, a
+    `datetime.timezone`, an exception, or a dictionary.
+    """
+    # A `YYYY-MM-DDThh:mm:ss` timestamp only needs a single regular expression
+    return is_extended_datetime(timestamp) or timestamp_fields(timestamp) is not None
+
+
+def validate_iso8601_many(timestamps: Iterable[str]) -> List[bool]:
+    """Return whether `parse_iso8601` would accept each of the timestamps, in the same order."""
+    # Like `is_valid_iso8601`, without a call to it for each timestamp
+    is_extended, fields = is_extended_datetime, timestamp_fields
+    return [is_extended(timestamp) or fields(timestamp) is not None for timestamp in timestamps]
@@ -0,0 +1,212 @@
+"""
+A NumPy-backed parser for columns of timestamps that mostly share a fixed layout.
+
+This module requires NumPy, which is an optional dependency of the example solution.
+"""
+import types
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy
+
+from .columnar import DAYS_BEFORE_MONTH, DAYS_BEFORE_YEAR, NAIVE, EpochColumns, epoch_from_fields
+from .solution import DAYS_IN_MONTH, LEAP_YEARS, ParseError, locate_error, timestamp_fields
+
+
+class VectorLayout(NamedTuple):
+    """The separators and field offsets of a layout that can be parsed as a 2-D array."""
+
+    separators: Dict[int, str]
+    date: Tuple[int, int, int]
+    time: Optional[Tuple[int, int, int]] = None
+    # The offset of the `Z` or of the sign of a `±hh:mm` designator
+    timezone: Optional[int] = None
+
+
+# The layouts are told apart by their length, like `FIXED_LAYOUT_PARSERS`. Timestamps with another
+# length, or with unexpected characters, are parsed one at a time by `timestamp_fields`.
+VECTOR_LAYOUTS = types.MappingProxyType({
+    # YYYYMMDD
+    8: VectorLayout({}, (0, 4, 6)),
+    # YYYY-MM-DD
+    10: VectorLayout({4: "-", 7: "-"}, (0, 5, 8)),
+    # YYYYMMDDThhmmss
+    15: VectorLayout({8: "T"}, (0, 4, 6), (9, 11, 13)),
+    # YYYY-MM-DDThh:mm:ss
+    19: VectorLayout({4: "-", 7: "-", 10: "T", 13: ":", 16: ":"}, (0, 5, 8), (11, 14, 17)),
+    # YYYY-MM-DDThh:mm:ssZ
+    20: VectorLayout(
+        {4: "-", 7: "-", 10: "T", 13: ":", 16: ":", 19: "Z"}, (0, 5, 8), (11, 14, 17), 19
+    ),
+    # YYYY-MM-DDThh:mm:ss±hh:mm
+    25: VectorLayout(
+        {4: "-", 7: "-", 10: "T", 13: ":", 16: ":", 22: ":"}, (0, 5, 8), (11, 14, 17), 19
+    ),
+})
+
+# The lookup tables of `solution.columnar` as arrays, so we can index them with arrays
+DAYS_BEFORE_YEAR_ARRAY = numpy.array(DAYS_BEFORE_YEAR, dtype=numpy.int64)
+DAYS_BEFORE_MONTH_ARRAY = numpy.array(DAYS_BEFORE_MONTH, dtype=numpy.int64)
+LEAP_YEARS_ARRAY = numpy.frombuffer(LEAP_YEARS, dtype=numpy.uint8)
+# The number of days in each month, in a common and in a leap year, indexed by the month
+DAYS_IN_MONTH_ARRAY = numpy.array(
+    [
+        [0, DAYS_IN_MONTH[0], 28, *DAYS_IN_MONTH[2:]],
+        [0, *DAYS_IN_MONTH],
+    ],
+    dtype=numpy.int64,
+)
+
+# Like the lookup tables of `solution.solution`, the arrays are read-only
+for lookup_table in (DAYS_BEFORE_YEAR_ARRAY, DAYS_BEFORE_MONTH_ARRAY, DAYS_IN_MONTH_ARRAY):
+    lookup_table.flags.writeable = False
+del lookup_table
+
+# The checks of the `datetime.datetime` constructor, in the order it performs them, with the
+# codes of their `ParseError` records
+VALUE_ERRORS = (
+    ("year", "year {} is out of range"),
+    ("month", "month must be in 1..12"),
+    ("day", "day is out of range for month"),
+    ("hour", "hour must be in 0..23"),
+    ("minute", "minute must be in 0..59"),
+    ("second", "second must be in 0..59"),
+)
+
+ASCII_ZERO = ord("0")
+
+
+def decode(digits: numpy.ndarray, start: int, width: int) -> numpy.ndarray:
+    """Decode the `width` digit columns starting at `start` into an array of integers."""
+    values = numpy.zeros(len(digits), dtype=numpy.int64)
+    for column in range(start, start + width):
+        values = values * 10 + digits[:, column]
+    return values
+
+
+def parse_layout(
+    layout: VectorLayout, timestamps: numpy.ndarray
+) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, List[ParseError]]:
+    """
+    Parse a 2-D array of ASCII codes, one timestamp per row, that should share the same layout.
+
+    Return the epoch microseconds and UTC offsets of the rows, a mask of the rows that don't have
+    the layout after all, and a `ParseError` record of each row with invalid values, which is
+    numbered by the row.
+    """
+    rows, length = timestamps.shape
+
+    # Every column that isn't a separator or a timezone sign should contain a digit
+    digits = timestamps.astype(numpy.int64) - ASCII_ZERO
+    digit_columns = [
+        column for column in range(length)
+        if column not in layout.separators and column != layout.timezone
+    ]
+    mismatch = ((digits[:, digit_columns] < 0) | (digits[:, digit_columns] > 9)).any(axis=1)
+    for column, separator in layout.separators.items():
+        mismatch |= timestamps[:, column] != ord(separator)
+
+    # Zero the rows that don't have this layout, so their values stay usable as indexes
+    digits[mismatch] = 0
+
+    year = decode(digits, layout.date[0], 4)
+    month = decode(digits, layout.date[1], 2)
+    day = decode(digits, layout.date[2], 2)
+    if layout.time:
+        hour, minute, second = (decode(digits, start, 2) for start in layout.time)
+    else:
+        hour = minute = second = numpy.zeros(rows, dtype=numpy.int64)
+
+    offset = numpy.full(rows, NAIVE, dtype=numpy.int64)
+    if layout.timezone is not None and length > layout.timezone + 1:
+        # A `±hh:mm` offset; offsets of 24 hours or more are left to the scalar parser
+        sign = timestamps[:, layout.timezone]
+        mismatch |= (sign != ord("+")) & (sign != ord("-"))
+        hours = decode(digits, layout.timezone + 1, 2)
+        offset = hours * 60 + decode(digits, layout.timezone + 4, 2)
+        mismatch |= offset >= 24 * 60
+        offset = numpy.where(sign == ord("-"), -offset, offset)
+    elif layout.timezone is not None:
+        offset = numpy.zeros(rows, dtype=numpy.int64)
+
+    # Clamp the values we use as indexes, so the rows with invalid values can't raise an IndexError
+    safe_month = numpy.clip(month, 0, 12)
+    is_leap = LEAP_YEARS_ARRAY[year]
+    checks = (
+        year < 1,
+        (month < 1) | (month > 12),
+        (day < 1) | (day > DAYS_IN_MONTH_ARRAY[is_leap, safe_month]),
+        hour > 23,
+        minute > 59,
+        second > 59,
+    )
+
+    # The position of each field in the timestamp, in the order of the checks
+    positions = (*layout.date, *(layout.time or (0, 0, 0)))
+
+    errors = []
+    invalid = numpy.zeros(rows, dtype=bool)
+    for (code, message), position, check in zip(VALUE_ERRORS, positions, checks):
+        failed = check & ~invalid & ~mismatch
+        for row in numpy.flatnonzero(failed):
+            errors.append(ParseError(int(row), code, position, message.format(year[row])))
+        invalid |= failed
+
+    days = DAYS_BEFORE_YEAR_ARRAY[year] + DAYS_BEFORE_MONTH_ARRAY[is_leap, safe_month] + day - 1
+    seconds = ((days * 24 + hour) * 60 + minute) * 60 + second
+    seconds -= numpy.where(offset == NAIVE, 0, offset) * 60
+
+    epoch_us = numpy.where(invalid | mismatch, 0, seconds * 1_000_000)
+    return epoch_us, numpy.where(invalid | mismatch, 0, offset), mismatch, errors
+
+
+def parse_iso8601_vectorized(
+    timestamps: Sequence[str], raise_errors: bool = True
+) -> EpochColumns:
+    """
+    Parse a column of timestamps into NumPy arrays of epoch microseconds and UTC offsets.
+
+    The timestamps are grouped by their layout (see `VECTOR_LAYOUTS`) and each group is parsed as
+    a 2-D `uint8` array, with the digits decoded and the values validated by array operations.
+    Timestamps in other layouts are parsed one at a time by `timestamp_fields`. The result has
+    the same columns, values, and error messages as `solution.columnar.parse_iso8601_epoch`, but
+    the columns are `int64` and `int16` NumPy arrays.
+
+    This function raises the first error by default. If `raise_errors` is `False`, invalid rows are
+    filled with zeroes and a `ParseError` record of each of them is collected in the result,
+    ordered by their index.
+    """
+    epoch_us = numpy.zeros(len(timestamps), dtype=numpy.int64)
+    offset_minutes = numpy.zeros(len(timestamps), dtype=numpy.int16)
+    errors = []
+
+    groups = {}
+    scalar_rows = []
+    for index, timestamp in enumerate(timestamps):
+        if len(timestamp) in VECTOR_LAYOUTS and timestamp.isascii():
+            groups.setdefault(len(timestamp), []).append(index)
+        else:
+            scalar_rows.append(index)
+
+    for length, indexes in groups.items():
+        encoded = "".join([timestamps[index] for index in indexes]).encode("ascii")
+        group = numpy.frombuffer(encoded, dtype=numpy.uint8).reshape(len(indexes), length)
+        indexes = numpy.array(indexes)
+
+        epochs, offsets, mismatch, group_errors = parse_layout(VECTOR_LAYOUTS[length], group)
+        epoch_us[indexes] = epochs
+        offset_minutes[indexes] = offsets
+        errors.extend(error._replace(index=int(indexes[error.index])) for error in group_errors)
+        scalar_rows.extend(indexes[mismatch].tolist())
+
+    for index in scalar_rows:
+        if (fields := timestamp_fields(timestamps[index])) is not None:
+            epoch_us[index], offset_minutes[index] = epoch_from_fields(fields)
+        else:
+            errors.append(ParseError(index, *locate_error(timestamps[index])))
+
+    errors.sort()
+    if errors and raise_errors:
+        raise errors[0].to_exception()
+
+    return EpochColumns(epoch_us, offset_minutes, errors)
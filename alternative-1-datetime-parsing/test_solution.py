@@ -0,0 +1,1081 @@
+import asyncio
+import datetime
+import fractions
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import typing
+import unittest
+
+from solution import accelerated
+from solution.buffers import line_offsets, parse_buffer, parse_iso8601_bytes, parse_mmap
+from solution.cache import CacheInfo, CachedParser
+from solution.columnar import NAIVE, parse_iso8601_epoch, to_datetime64
+from solution.compiled import CACHE_SIZE, compile_parser
+from solution.solution import (
+    OFFSET_TIMEZONES,
+    PARSER_ENGINES,
+    InvalidFormat,
+    ParseError,
+    calculate_fractional_time,
+    fractional_hours,
+    fractional_minutes,
+    fractional_seconds,
+    is_valid_date,
+    locate_error,
+    parse_fixed_layout,
+    parse_general,
+    parse_iso8601,
+    parse_iso8601_many,
+    validate_date,
+)
+from solution.learning import FormatLearningParser, LearningInfo, detect_format
+from solution.parallel import parse_iso8601_parallel, parse_iso8601_threaded
+from solution.records import parse_if_valid, parse_iso8601_records
+from solution.streaming import iter_lines, parse_file, parse_lines, parse_stream
+from solution.validation import is_valid_iso8601, validate_iso8601_many
+from testsuite.corpora import CORPUS_GENERATORS, load_corpus
+
+try:
+    from solution.vectorized import parse_iso8601_vectorized
+except ImportError:  # NumPy is an optional dependency
+    parse_iso8601_vectorized = None
+
+
+# The outcome of parsing a timestamp: the `datetime.datetime` and its UTC offset, so an aware and a
+# naive result never compare equal, or the type and the message of the exception that was raised
+Outcome = typing.Tuple[typing.Any, typing.Any]
+
+UTC_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Fractions of every unit at the edges of what six decimals can express, and invalid fractions
+FRACTIONAL_EDGE_CASES = (
+    "2020-01-01T12.000001",
+    "2020-01-01T12.999999",
+    "2020-01-01T12.333333",
+    "20200101T12.999999",
+    "2020-01-01T12:00.000001",
+    "2020-01-01T12:59.999999",
+    "20200101T1259.999999",
+    "2020-01-01T12:34:56.000001",
+    "2020-01-01T12:34:56.999999",
+    "20200101T123456.999999",
+    "2020-02-29T23:59:59.999999",
+    "2020-12-31T23.999999Z",
+    "2020-12-31T23:59.999999+05:30",
+    "2020-12-31T23:59:59.999999-08:00",
+    "9999-12-31T23:59:59.999999",
+    "2020-01-01T12:34:56.1234567",
+    "2020-01-01T12:34:56.",
+    "2020-01-01T12:34:56,5",
+)
+
+# Timestamps with invalid values in a valid format, and timestamps in invalid formats
+INVALID_ROWS = (
+    "",
+    "2019-02-29",
+    "2019-02-29T12:00:00",
+    "1900-02-29T12:00:00",
+    "2020-13-01",
+    "2020-00-01T12:00:00",
+    "2020-04-31T12:00:00",
+    "0000-01-01",
+    "1582-12-31T12:00:00",
+    "2020-01-01T24:00:00",
+    "2020-01-01T12:60",
+    "2020-01-01T12:00:60",
+    "2020-01-01T12:00:00+24:00",
+    "2020-01-01T12:00:00-23:60",
+    "\uff12\uff10\uff12\uff10-01-01",
+    "2020-01-01T\u0661\u0662:00:00",
+    "2020-01-01T12:00:00abc",
+    "2020-01-01T12:00:00+",
+    "2020-01-01T12:00:00Z+01:00",
+    "2020-01-01 12:00:00",
+    "2020/01/01",
+    "2020-0101",
+    "2020-01-01T",
+    "2020-01-01T1200:00",
+    "2020-01-01Z",
+)
+
+# Every stored corpus, and the edge cases above
+TIMESTAMPS: typing.Dict[str, typing.List[str]] = {
+    **{name: load_corpus(name) for name in CORPUS_GENERATORS},
+    "fractional edge cases": list(FRACTIONAL_EDGE_CASES),
+    "invalid rows": list(INVALID_ROWS),
+}
+
+# The fractions we convert: every fraction of up to three decimals, and the edges of six decimals
+FRACTIONS = (
+    *(
+        "".join(digits)
+        for size in (1, 2, 3)
+        for digits in itertools.product("0123456789", repeat=size)
+    ),
+    "0000", "9999", "00001", "99999", "000001", "999999", "333333", "666667", "142857",
+)
+
+
+def unit_conversion_loop(fraction: str, time_unit: str) -> typing.Dict[str, int]:
+    """Convert a fraction with the unit-conversion loop `calculate_fractional_time` used to run."""
+    conversions = {
+        "hour": (60, "minute"),
+        "minute": (60, "second"),
+        "second": (1_000_000, "microsecond"),
+    }
+
+    units = {}
+    numerator = int(fraction)
+    denominator = 10**len(fraction)
+    while time_unit != "microsecond":
+        conversion, time_unit = conversions[time_unit]
+        units[time_unit], numerator = divmod(numerator * conversion, denominator)
+        if not numerator:
+            break
+
+    return units
+
+
+def outcome(parser: typing.Callable[[str], datetime.datetime], timestamp: str) -> Outcome:
+    """Parse `timestamp` with the parser and return the outcome."""
+    try:
+        parsed = parser(timestamp)
+    except ValueError as error:
+        return type(error), str(error)
+
+    return parsed, parsed.utcoffset()
+
+
+def result_outcome(result: typing.Union[datetime.datetime, ParseError]) -> Outcome:
+    """Return the outcome of an item of a batch, which is a `ParseError` record if it's invalid."""
+    if isinstance(result, ParseError):
+        return type(result.to_exception()), result.message
+
+    return result, result.utcoffset()
+
+
+def epoch_outcome(timestamp: str) -> typing.Union[Outcome, typing.Tuple[int, int]]:
+    """Return the epoch microseconds and the offset in minutes of `parse_iso8601`, or its error."""
+    try:
+        parsed = parse_iso8601(timestamp)
+    except ValueError as error:
+        return type(error), str(error)
+
+    if parsed.tzinfo is None:
+        # Naive timestamps are interpreted as UTC
+        return (parsed.replace(tzinfo=datetime.timezone.utc) - UTC_EPOCH) // MICROSECOND, NAIVE
+
+    return (parsed - UTC_EPOCH) // MICROSECOND, parsed.utcoffset() // datetime.timedelta(minutes=1)
+
+
+def encode_lines(timestamps: typing.List[str]) -> bytes:
+    """Encode the timestamps with one per line, with both kinds of line terminators."""
+    terminators = ("\n", "\r\n")
+    return "".join(
+        timestamp + terminators[index % 2] for index, timestamp in enumerate(timestamps)
+    ).encode()
+
+
+class EquivalenceTestCase(unittest.TestCase):
+    """A test case that compares the outcomes of the parsers with those of `parse_iso8601`."""
+
+    def _assert_same_outcomes(
+        self, parser: typing.Callable[[str], datetime.datetime], timestamps: typing.List[str]
+    ) -> None:
+        for timestamp in timestamps:
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(outcome(parse_iso8601, timestamp), outcome(parser, timestamp))
+
+    def _assert_same_results(
+        self,
+        results: typing.Iterable[typing.Union[datetime.datetime, ParseError]],
+        timestamps: typing.List[str],
+        start: int = 0,
+    ) -> None:
+        results = list(results)
+        self.assertEqual(len(timestamps), len(results))
+        for index, (timestamp, result) in enumerate(zip(timestamps, results), start):
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(outcome(parse_iso8601, timestamp), result_outcome(result))
+                if isinstance(result, ParseError):
+                    self.assertEqual(index, result.index)
+
+    def _assert_raises_first_error(
+        self, parser: typing.Callable[[typing.List[str]], typing.Any], timestamps: typing.List[str]
+    ) -> None:
+        for timestamp in timestamps:
+            if (expected := outcome(parse_iso8601, timestamp))[0] in (InvalidFormat, ValueError):
+                break
+        else:
+            parser(timestamps)
+            return
+
+        error_type, message = expected
+        with self.assertRaises(ValueError) as context:
+            parser(timestamps)
+        self.assertIs(error_type, type(context.exception))
+        self.assertEqual(message, str(context.exception))
+
+    def _assert_same_numbered_results(
+        self,
+        numbered_results: typing.Iterable[typing.Tuple[int, typing.Any]],
+        timestamps: typing.List[str],
+    ) -> None:
+        numbered_results = list(numbered_results)
+        self.assertEqual(len(timestamps), len(numbered_results))
+        # We compare the line numbers one at a time; a diff of two long lists takes ages
+        for line_no, (timestamp, (number, _)) in enumerate(zip(timestamps, numbered_results), 1):
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(line_no, number)
+
+        self._assert_same_results([result for _, result in numbered_results], timestamps, 1)
+
+    def _assert_same_epochs(self, columns: typing.Any, timestamps: typing.List[str]) -> None:
+        self.assertEqual(len(timestamps), len(columns.epoch_us))
+        self.assertEqual(len(timestamps), len(columns.offset_minutes))
+
+        # The records should be ordered by their index
+        indexes = [error.index for error in columns.errors]
+        self.assertTrue(all(index < next_index for index, next_index in zip(indexes, indexes[1:])))
+
+        errors = {error.index: error for error in columns.errors}
+        for index, timestamp in enumerate(timestamps):
+            with self.subTest(timestamp=timestamp):
+                actual = int(columns.epoch_us[index]), int(columns.offset_minutes[index])
+                if (error := errors.get(index)) is not None:
+                    # The row of an invalid timestamp is filled with zeroes
+                    self.assertEqual(epoch_outcome(timestamp), result_outcome(error))
+                    self.assertEqual((0, 0), actual)
+                else:
+                    self.assertEqual(epoch_outcome(timestamp), actual)
+
+
+class BatchParsingTests(EquivalenceTestCase):
+    """`parse_iso8601_many`."""
+
+    def test_001_same_outcomes(self) -> None:
+        """The results and the error records are those of `parse_iso8601`."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                self._assert_same_results(parse_iso8601_many(timestamps, False), timestamps)
+
+    def test_002_numbers_the_records_from_start(self) -> None:
+        """The error records are numbered from `start`."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                results = parse_iso8601_many(timestamps, raise_errors=False, start=7)
+                self._assert_same_results(results, timestamps, start=7)
+
+    def test_003_raises_the_first_error(self) -> None:
+        """By default, the exception `parse_iso8601` raises for the first invalid timestamp."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                self._assert_raises_first_error(parse_iso8601_many, timestamps)
+
+
+class FixedLayoutTests(EquivalenceTestCase):
+    """The fixed-layout fast path of `parse_iso8601`."""
+
+    def test_001_same_outcomes_as_the_general_parser(self) -> None:
+        """The fast path doesn't change the results or the errors of `parse_iso8601`."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                self._assert_same_outcomes(parse_general, timestamps)
+
+    def test_002_declines_what_it_cant_parse(self) -> None:
+        """The fast path either agrees with the general parser or returns `None`."""
+        for name, timestamps in TIMESTAMPS.items():
+            for timestamp in timestamps:
+                if (parsed := parse_fixed_layout(timestamp)) is not None:
+                    with self.subTest(corpus=name, timestamp=timestamp):
+                        expected = outcome(parse_general, timestamp)
+                        self.assertEqual(expected, (parsed, parsed.utcoffset()))
+
+
+class ParserEngineTests(EquivalenceTestCase):
+    """The parser engines of `parse_iso8601`."""
+
+    def test_001_same_outcomes(self) -> None:
+        """Every engine gives the results and the errors of the default engine."""
+        for engine, parser in PARSER_ENGINES.items():
+            for name, timestamps in TIMESTAMPS.items():
+                with self.subTest(engine=engine, corpus=name):
+                    self._assert_same_outcomes(parser, timestamps)
+                    self._assert_same_outcomes(
+                        lambda timestamp: parse_iso8601(timestamp, engine=engine), timestamps
+                    )
+
+    def test_002_rejects_an_unknown_engine(self) -> None:
+        """An unknown engine is rejected, even for a timestamp that doesn't need an engine."""
+        for timestamp in ("2020-01-01T12:34:56", "2020-01-01T12:34:56.5"):
+            with self.subTest(timestamp=timestamp):
+                with self.assertRaisesRegex(ValueError, "unknown parser engine: 'sliced'"):
+                    parse_iso8601(timestamp, engine="sliced")
+
+    def test_003_selects_the_default_engine_at_import_time(self) -> None:
+        """The `ISO8601_PARSER_ENGINE` environment variable selects the default engine."""
+        script = "import solution.solution as solution; print(solution.DEFAULT_ENGINE)"
+        for engine in PARSER_ENGINES:
+            with self.subTest(engine=engine):
+                environment = {**os.environ, "ISO8601_PARSER_ENGINE": engine}
+                process = subprocess.run(
+                    [sys.executable, "-c", script], env=environment, capture_output=True, text=True
+                )
+                self.assertEqual(f"{engine}\n", process.stdout)
+
+        environment = {**os.environ, "ISO8601_PARSER_ENGINE": "sliced"}
+        process = subprocess.run(
+            [sys.executable, "-c", script], env=environment, capture_output=True, text=True
+        )
+        self.assertNotEqual(0, process.returncode)
+        self.assertIn("unknown parser engine in ISO8601_PARSER_ENGINE: 'sliced'", process.stderr)
+
+
+class CachedParserTests(EquivalenceTestCase):
+    """`CachedParser`."""
+
+    def test_001_same_outcomes(self) -> None:
+        """A cached parser gives the results and the errors of `parse_iso8601`, hit or miss."""
+        for name, timestamps in TIMESTAMPS.items():
+            parser = CachedParser(maxsize=64)
+            with self.subTest(corpus=name):
+                self._assert_same_outcomes(parser, timestamps)
+                self._assert_same_outcomes(parser, timestamps[::-1])
+
+    def test_002_counts_hits_misses_and_evictions(self) -> None:
+        """The counters follow every lookup, and the parser is only called on a miss."""
+        # The fields of `CacheInfo` are the hits, misses, evictions, maxsize, and currsize
+        calls = []
+
+        def parse(timestamp: str) -> datetime.datetime:
+            calls.append(timestamp)
+            return parse_iso8601(timestamp)
+
+        parser = CachedParser(maxsize=2, parser=parse)
+
+        for timestamp in ("2020-01-01", "2020-01-02", "2020-01-01", "2020-01-01"):
+            parser(timestamp)
+        self.assertEqual(CacheInfo(2, 2, 0, 2, 2), parser.cache_info())
+        self.assertEqual(0.5, parser.hit_ratio)
+
+        parser("2020-01-03")
+        self.assertEqual(CacheInfo(2, 3, 1, 2, 2), parser.cache_info())
+        self.assertEqual(["2020-01-01", "2020-01-02", "2020-01-03"], calls)
+
+        parser.cache_clear()
+        self.assertEqual(CacheInfo(0, 0, 0, 2, 0), parser.cache_info())
+        self.assertEqual(0.0, parser.hit_ratio)
+
+    def test_003_evicts_the_least_recently_used_timestamp(self) -> None:
+        """A hit makes a timestamp the most recently used, so the other one is evicted first."""
+        parser = CachedParser(maxsize=2)
+        first, second = parser("2020-01-01"), parser("2020-01-02")
+
+        # Using the first timestamp again makes the second one the least recently used
+        self.assertIs(first, parser("2020-01-01"))
+        parser("2020-01-03")
+        self.assertIs(first, parser("2020-01-01"))
+        self.assertIsNot(second, parser("2020-01-02"))
+        self.assertEqual(CacheInfo(2, 4, 2, 2, 2), parser.cache_info())
+
+    def test_004_doesnt_cache_errors(self) -> None:
+        """An invalid timestamp raises every time, and it doesn't take up room in the cache."""
+        parser = CachedParser(maxsize=2)
+        for _ in range(3):
+            with self.assertRaises(InvalidFormat):
+                parser("2020-01-01T12:00:00abc")
+        self.assertEqual(CacheInfo(0, 3, 0, 2, 0), parser.cache_info())
+
+    def test_005_reuses_the_timezone(self) -> None:
+        """A hit returns the same aware `datetime.datetime`, with the same `tzinfo` object."""
+        parser = CachedParser()
+        parsed = parser("2020-01-01T12:00:00+05:30")
+        self.assertIs(parsed, parser("2020-01-01T12:00:00+05:30"))
+        self.assertIs(parsed.tzinfo, parser("2020-01-02T12:00:00+05:30").tzinfo)
+
+    def test_006_rejects_an_empty_cache(self) -> None:
+        """The cache should be able to hold at least one timestamp."""
+        with self.assertRaises(ValueError):
+            CachedParser(maxsize=0)
+
+
+class TimezoneTests(unittest.TestCase):
+    """The interned timezones of UTC offsets."""
+
+    def test_001_reuses_the_timezone_of_every_offset(self) -> None:
+        """Every engine returns the same `datetime.timezone` object for the same offset."""
+        for engine, parser in PARSER_ENGINES.items():
+            for minutes, timezone in OFFSET_TIMEZONES.items():
+                sign = "-" if minutes < 0 else "+"
+                hours, minute = divmod(abs(minutes), 60)
+                designators = [f"{sign}{hours:02}:{minute:02}", f"{sign}{hours:02}{minute:02}"]
+                if not minute:
+                    designators.append(f"{sign}{hours:02}")
+
+                for designator in designators:
+                    with self.subTest(engine=engine, designator=designator):
+                        self.assertIs(timezone, parser(f"2020-01-01T12{designator}").tzinfo)
+
+    def test_002_utc(self) -> None:
+        """A `Z` designator and an offset of zero are both `datetime.timezone.utc`."""
+        for engine, parser in PARSER_ENGINES.items():
+            for designator in ("Z", "+00:00", "-0000", "+00"):
+                with self.subTest(engine=engine, designator=designator):
+                    parsed = parser(f"2020-01-01T12{designator}")
+                    self.assertIs(datetime.timezone.utc, parsed.tzinfo)
+
+    def test_003_rejects_offsets_of_a_day(self) -> None:
+        """Offsets of 24 hours or more are rejected like `datetime.timezone` rejects them."""
+        for engine, parser in PARSER_ENGINES.items():
+            for designator in ("+24:00", "-24:00", "+2400", "+99"):
+                with self.subTest(engine=engine, designator=designator):
+                    with self.assertRaises(ValueError):
+                        parser(f"2020-01-01T12{designator}")
+
+
+class DateTableTests(unittest.TestCase):
+    """The lookup tables that validate a date without constructing it."""
+
+    def test_001_same_dates_as_the_datetime_constructor(self) -> None:
+        """A date is valid if, and only if, `datetime.datetime` accepts it, with the same error."""
+        years = sorted({*range(1, 10_000, 37), 4, 1582, 1583, 1600, 1900, 2000, 2100, 2400, 9999})
+        for year in years:
+            with self.subTest(year=year):
+                for month, day in itertools.product(range(14), range(33)):
+                    try:
+                        datetime.datetime(year, month, day)
+                    except ValueError as error:
+                        self.assertFalse(is_valid_date(year, month, day))
+                        with self.assertRaisesRegex(ValueError, f"^{error}$"):
+                            validate_date(year, month, day)
+                    else:
+                        self.assertTrue(is_valid_date(year, month, day))
+                        validate_date(year, month, day)
+
+    def test_002_year_zero(self) -> None:
+        """The year 0 is rejected with the message of the `datetime.datetime` constructor."""
+        self.assertFalse(is_valid_date(0, 1, 1))
+        with self.assertRaisesRegex(ValueError, "^year 0 is out of range$"):
+            validate_date(0, 1, 1)
+
+
+class StreamingTests(EquivalenceTestCase):
+    """Parsing newline-delimited timestamp files."""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_file(self, data: bytes) -> str:
+        """Write a file to the temporary directory of the test and return its path."""
+        path = os.path.join(self.directory, f"{len(os.listdir(self.directory))}.txt")
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    def test_001_parse_file(self) -> None:
+        """`parse_file` numbers the lines of a path or a binary file from 1."""
+        for name, timestamps in TIMESTAMPS.items():
+            path = self.write_file(encode_lines(timestamps))
+            with self.subTest(corpus=name, source="path"):
+                self._assert_same_numbered_results(parse_file(path), timestamps)
+            with self.subTest(corpus=name, source="file"), open(path, "rb") as file:
+                self._assert_same_numbered_results(parse_file(file, chunk_size=1000), timestamps)
+
+    def test_002_parse_lines(self) -> None:
+        """`parse_lines` numbers the lines across its batches, from `start`."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                results = parse_lines(iter(timestamps), batch_size=97)
+                self._assert_same_numbered_results(results, timestamps)
+
+                results = list(parse_lines(iter(timestamps), batch_size=97, start=11))
+                self.assertEqual(list(range(11, len(timestamps) + 11)), [no for no, _ in results])
+
+    def test_003_iter_lines(self) -> None:
+        """Lines can span chunks and end with either terminator, or none at the end of the file."""
+        data = "2020-01-01\r\n\n\uff12\uff10\uff12\uff10-01-01\n2020-01-01T12:00:00Z".encode()
+        expected = ["2020-01-01", "", "\uff12\uff10\uff12\uff10-01-01", "2020-01-01T12:00:00Z"]
+        for chunk_size in (1, 2, 7, 1 << 20):
+            with self.subTest(chunk_size=chunk_size), open(self.write_file(data), "rb") as file:
+                self.assertEqual(expected, list(iter_lines(file, chunk_size)))
+
+    def test_004_rejects_a_text_file(self) -> None:
+        """A file opened in text mode is rejected."""
+        with open(self.write_file(b"2020-01-01\n"), "r") as file:
+            with self.assertRaises(TypeError):
+                list(parse_file(file))
+
+    def test_005_command_line(self) -> None:
+        """`python -m solution parse` writes a line per timestamp and reports the invalid ones."""
+        timestamps = ["2020-01-01", "2020-13-01", "2020-01-01T12:00:00+05:30", "2020-01-01T"]
+        process = subprocess.run(
+            [sys.executable, "-m", "solution", "parse", self.write_file(encode_lines(timestamps))],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(1, process.returncode)
+        self.assertEqual("2020-01-01T00:00:00\n\n2020-01-01T12:00:00+05:30\n\n", process.stdout)
+        self.assertEqual(
+            f"line 2: {outcome(parse_iso8601, timestamps[1])[1]}\n"
+            f"line 4: {outcome(parse_iso8601, timestamps[3])[1]}\n",
+            process.stderr,
+        )
+
+        process = subprocess.run(
+            [sys.executable, "-m", "solution", "parse", "-"],
+            input="2020-01-01\n",
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual((0, "2020-01-01T00:00:00\n"), (process.returncode, process.stdout))
+
+    def test_006_parse_stream(self) -> None:
+        """`parse_stream` numbers the lines of an asyncio stream across its chunks and batches."""
+
+        async def collect(data: bytes) -> typing.List[typing.Tuple[int, typing.Any]]:
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            return [item async for item in parse_stream(reader, chunk_size=1024, batch_size=97)]
+
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                results = asyncio.run(collect(encode_lines(timestamps)))
+                self._assert_same_numbered_results(results, timestamps)
+
+    def test_007_parse_stream_yields_to_other_tasks(self) -> None:
+        """Other tasks run between the batches of a stream that's never short of data."""
+
+        async def count_ticks() -> int:
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"2020-01-01\n" * 1000)
+            reader.feed_eof()
+
+            ticks = 0
+
+            async def tick() -> None:
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            ticker = asyncio.create_task(tick())
+            async for _ in parse_stream(reader, batch_size=100):
+                pass
+            ticker.cancel()
+            return ticks
+
+        self.assertGreaterEqual(asyncio.run(count_ticks()), 9)
+
+
+class BufferTests(EquivalenceTestCase):
+    """Parsing timestamps in bytes buffers and memory-mapped files."""
+
+    def test_001_parse_iso8601_bytes(self) -> None:
+        """`parse_iso8601_bytes` parses a timestamp between two offsets of a buffer."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                self._assert_same_outcomes(
+                    lambda timestamp: parse_iso8601_bytes(b"[" + timestamp.encode() + b"]", 1, -1),
+                    timestamps,
+                )
+
+    def test_002_parse_buffer(self) -> None:
+        """`parse_buffer` has the same results for the lines of a buffer."""
+        for name, timestamps in TIMESTAMPS.items():
+            buffer = encode_lines(timestamps)
+            with self.subTest(corpus=name, raise_errors=False):
+                results = parse_buffer(buffer, line_offsets(buffer), raise_errors=False, start=5)
+                self._assert_same_results(results, timestamps, start=5)
+            with self.subTest(corpus=name, raise_errors=True):
+                self._assert_raises_first_error(
+                    lambda _: parse_buffer(memoryview(buffer), line_offsets(buffer)), timestamps
+                )
+
+    def test_003_parse_mmap(self) -> None:
+        """`parse_mmap` numbers the lines of a file from 1, across its chunks."""
+        with tempfile.TemporaryDirectory() as directory:
+            for name, timestamps in TIMESTAMPS.items():
+                path = os.path.join(directory, f"{name}.txt")
+                with open(path, "wb") as file:
+                    file.write(encode_lines(timestamps))
+                with self.subTest(corpus=name):
+                    results = parse_mmap(path, chunk_bytes=1024)
+                    self._assert_same_numbered_results(results, timestamps)
+
+            path = os.path.join(directory, "empty.txt")
+            open(path, "wb").close()
+            self.assertEqual([], list(parse_mmap(path)))
+
+
+class EpochColumnTests(EquivalenceTestCase):
+    """Parsing timestamps into columns of epoch microseconds and UTC offsets."""
+
+    def test_001_same_epochs(self) -> None:
+        """The columns agree with the `datetime.datetime` that `parse_iso8601` returns."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                self._assert_same_epochs(parse_iso8601_epoch(timestamps, False), timestamps)
+                self._assert_raises_first_error(parse_iso8601_epoch, timestamps)
+
+    def test_002_to_datetime64(self) -> None:
+        """The epoch column is viewed as `datetime64[us]` if NumPy is installed."""
+        columns = parse_iso8601_epoch(["1970-01-01T00:00:00.000001Z", "2020-02-29T12:00:00+01:00"])
+        try:
+            values = to_datetime64(columns)
+        except ImportError:
+            self.skipTest("NumPy isn't installed")
+
+        expected = ["1970-01-01T00:00:00.000001", "2020-02-29T11:00:00.000000"]
+        self.assertEqual(expected, [str(value) for value in values])
+
+
+@unittest.skipIf(parse_iso8601_vectorized is None, "NumPy isn't installed")
+class VectorizedTests(EquivalenceTestCase):
+    """Parsing a column of timestamps with NumPy array operations."""
+
+    def test_001_same_epochs(self) -> None:
+        """The arrays agree with the `datetime.datetime` that `parse_iso8601` returns."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                columns = parse_iso8601_vectorized(timestamps, raise_errors=False)
+                self._assert_same_epochs(columns, timestamps)
+                self._assert_raises_first_error(parse_iso8601_vectorized, timestamps)
+
+    def test_002_same_errors_as_the_epoch_columns(self) -> None:
+        """The error records are those of `parse_iso8601_epoch`, in the same order."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                expected = parse_iso8601_epoch(timestamps, raise_errors=False).errors
+                actual = parse_iso8601_vectorized(timestamps, raise_errors=False).errors
+                self.assertEqual(len(expected), len(actual))
+                for expected_error, actual_error in zip(expected, actual):
+                    self.assertEqual(expected_error, actual_error)
+
+    def test_003_mixed_layouts(self) -> None:
+        """Rows of every layout, and rows that only look like one, are put back in their place."""
+        timestamps = [
+            "20200101",
+            "2020-01-01T12:00:00+05:30",
+            "2020-01-01",
+            "2020-01-01T12:00:00+24:00",
+            "20200101T120000",
+            "2020-02-30",
+            "2020-01-01T12:00:00Z",
+            "2020-01-01T12:00",
+            "2020-01-01T12:00:00",
+            "2020-01-01T12:00:00-00:00",
+        ]
+        columns = parse_iso8601_vectorized(timestamps, raise_errors=False)
+        self._assert_same_epochs(columns, timestamps)
+        dtypes = columns.epoch_us.dtype.name, columns.offset_minutes.dtype.name
+        self.assertEqual(("int64", "int16"), dtypes)
+
+
+class ParallelTests(EquivalenceTestCase):
+    """Parsing timestamps into epoch columns with a pool of worker processes."""
+
+    def test_001_sequence(self) -> None:
+        """The columns of a sequence agree with `parse_iso8601`, across chunks."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                columns = parse_iso8601_parallel(
+                    timestamps, workers=2, chunk_lines=97, raise_errors=False
+                )
+                self._assert_same_epochs(columns, timestamps)
+                self._assert_raises_first_error(
+                    lambda batch: parse_iso8601_parallel(batch, workers=2, chunk_lines=97),
+                    timestamps,
+                )
+
+    def test_002_lines(self) -> None:
+        """The lines of a buffer, a path, or a binary file are split into chunks of whole lines."""
+        timestamps = [timestamp for corpus in TIMESTAMPS.values() for timestamp in corpus[:500]]
+        data = encode_lines(timestamps)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "timestamps.txt")
+            with open(path, "wb") as file:
+                file.write(data)
+
+            for source in (data, memoryview(data), path):
+                with self.subTest(source=type(source).__name__):
+                    columns = parse_iso8601_parallel(
+                        source, workers=2, chunk_bytes=1000, raise_errors=False
+                    )
+                    self._assert_same_epochs(columns, timestamps)
+
+            with self.subTest(source="file"), open(path, "rb") as file:
+                columns = parse_iso8601_parallel(
+                    file, workers=2, chunk_bytes=1000, raise_errors=False
+                )
+                self._assert_same_epochs(columns, timestamps)
+
+            with open(path, "r") as file:
+                with self.assertRaises(TypeError):
+                    parse_iso8601_parallel(file)
+
+
+class ThreadedTests(EquivalenceTestCase):
+    """Parsing a batch of timestamps with a pool of threads."""
+
+    def test_001_same_results(self) -> None:
+        """The results agree with `parse_iso8601` and are numbered across chunks."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                results = parse_iso8601_threaded(
+                    iter(timestamps), workers=2, chunk_size=97, raise_errors=False
+                )
+                self._assert_same_results(results, timestamps)
+                self._assert_raises_first_error(
+                    lambda batch: parse_iso8601_threaded(batch, workers=2, chunk_size=97),
+                    timestamps,
+                )
+
+
+class CompiledParserTests(EquivalenceTestCase):
+    """Parsers generated for a single timestamp format."""
+
+    def test_001_same_outcomes(self) -> None:
+        """The parser compiled for the detected format of a timestamp has the same outcome."""
+        for name, timestamps in TIMESTAMPS.items():
+            for timestamp in timestamps:
+                if (spec := detect_format(timestamp)) is not None:
+                    with self.subTest(corpus=name, timestamp=timestamp, spec=spec):
+                        self.assertEqual(
+                            outcome(parse_iso8601, timestamp),
+                            outcome(compile_parser(spec), timestamp),
+                        )
+
+    def test_002_rejects_other_formats(self) -> None:
+        """A compiled parser raises `InvalidFormat` for a timestamp with any other format."""
+        cases = (
+            ("YYYY-MM-DD", "20200101"),
+            ("YYYY-MM-DD", "2020-01-01T12"),
+            ("YYYY-MM-DD", "2020/01/01"),
+            ("YYYY-MM-DD", "\uff12\uff10\uff12\uff10-01-01"),
+            ("YYYYMMDDThhmmss", "20200101T12:00:00"),
+            ("YYYY-MM-DDThh:mm:ss.fff", "2020-01-01T12:00:00.1a3"),
+            ("YYYY-MM-DDThh±hh:mm", "2020-01-01T12*05:30"),
+            ("YYYY-MM-DDThhZ", "2020-01-01T12z"),
+        )
+        for spec, timestamp in cases:
+            with self.subTest(spec=spec, timestamp=timestamp):
+                with self.assertRaises(InvalidFormat) as context:
+                    compile_parser(spec)(timestamp)
+                message = f"the timestamp should be formatted as {spec}"
+                self.assertEqual(message, str(context.exception))
+
+    def test_003_rejects_unsupported_specs(self) -> None:
+        """Only formats `parse_iso8601` accepts can be compiled."""
+        specs = (
+            "",
+            "YYYY-MMDD",
+            "YYYY-MM-DDT",
+            "YYYY-MM-DDThh:mmss",
+            "YYYY-MM-DDThh:mm:ss.fffffff",
+            "YYYY-MM-DDThh:mm:ss+hh:mm",
+            "YYYY-MM-DDThh::mm",
+            "YYYY-MM-DD hh:mm:ss",
+        )
+        for spec in specs:
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    compile_parser(spec)
+
+    def test_004_caches_the_recent_parsers(self) -> None:
+        """The parsers of the `CACHE_SIZE` most recently compiled specs are kept."""
+        specs = [
+            f"YYYY{date}MM{date}DDThh{time}mm{time}ss{fraction}{timezone}"
+            for date, time in itertools.product(("-", ""), (":", ""))
+            for fraction in ("", ".f", ".fff", ".ffffff")
+            for timezone in ("", "Z", "±hh", "±hh:mm", "±hhmm")
+        ]
+        self.assertGreater(len(specs), CACHE_SIZE)
+
+        compile_parser.cache_clear()
+        parsers = [compile_parser(spec) for spec in specs]
+        self.assertIs(parsers[-1], compile_parser(specs[-1]))
+        self.assertEqual(CACHE_SIZE, compile_parser.cache_info().currsize)
+        self.assertIsNot(parsers[0], compile_parser(specs[0]))
+
+
+class FormatLearningTests(EquivalenceTestCase):
+    """Parsing a stream with a parser specialized for the format it learned."""
+
+    def test_001_same_outcomes(self) -> None:
+        """A parser that carries its learned format through a corpus has the same outcomes."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                self._assert_same_outcomes(FormatLearningParser(), timestamps)
+
+    def test_002_parse_many(self) -> None:
+        """`parse_many` stores a record of each error or raises the first one."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                results = FormatLearningParser().parse_many(timestamps, raise_errors=False)
+                self._assert_same_results(results, timestamps)
+                self._assert_raises_first_error(
+                    lambda batch: FormatLearningParser().parse_many(batch), timestamps
+                )
+
+    def test_003_counts_hits_fallbacks_and_switches(self) -> None:
+        """The fast path is taken after `learn_after` timestamps; odd ones fall back."""
+        parser = FormatLearningParser(learn_after=3)
+        for _ in range(3):
+            parser("2020-01-01T12:00:00")
+        self.assertEqual(LearningInfo("YYYY-MM-DDThh:mm:ss", 0, 0, 1), parser.learning_info())
+
+        parser("2020-01-02T12:00:00")
+        parser("20200101")
+        parser("2020-01-03T12:00:00")
+        self.assertEqual(LearningInfo("YYYY-MM-DDThh:mm:ss", 2, 1, 1), parser.learning_info())
+
+        # An invalid value in the learned format raises the error of the general parser
+        self.assertEqual(
+            outcome(parse_iso8601, "2020-02-30T12:00:00"), outcome(parser, "2020-02-30T12:00:00")
+        )
+        self.assertEqual(LearningInfo("YYYY-MM-DDThh:mm:ss", 2, 1, 1), parser.learning_info())
+
+    def test_004_learns_a_new_format(self) -> None:
+        """A new format is learned once it holds for `learn_after` consecutive timestamps."""
+        parser = FormatLearningParser(learn_after=3)
+        for timestamp in ("2020-01-01", "2020-01-02", "2020-01-03"):
+            parser(timestamp)
+
+        # Timestamps in the learned format in between keep the learned format
+        for _ in range(5):
+            parser("2020-01-01T12:00:00+05:30")
+            parser("2020-01-01")
+        self.assertEqual(LearningInfo("YYYY-MM-DD", 5, 5, 1), parser.learning_info())
+
+        for _ in range(3):
+            parser("2020-01-01T12:00:00+05:30")
+        expected = LearningInfo("YYYY-MM-DDThh:mm:ss±hh:mm", 5, 8, 2)
+        self.assertEqual(expected, parser.learning_info())
+
+        parser("2020-01-01T12:00:00-01:00")
+        self.assertEqual(6, parser.learning_info().hits)
+
+    def test_005_learn_after(self) -> None:
+        """A single timestamp can be enough to learn a format, but not none."""
+        parser = FormatLearningParser(learn_after=1)
+        parser("20200101T1200")
+        self.assertEqual(LearningInfo("YYYYMMDDThhmm", 0, 0, 1), parser.learning_info())
+
+        with self.assertRaises(ValueError):
+            FormatLearningParser(learn_after=0)
+
+    def test_006_reset(self) -> None:
+        """`reset` forgets the learned format and the statistics."""
+        parser = FormatLearningParser(learn_after=1)
+        parser("2020-01-01")
+        parser("2020-01-02")
+        parser.reset()
+        self.assertEqual(LearningInfo(None, 0, 0, 0), parser.learning_info())
+
+        parser("2020-01-03")
+        self.assertEqual(LearningInfo("YYYY-MM-DD", 0, 0, 1), parser.learning_info())
+
+
+class AcceleratedTests(EquivalenceTestCase):
+    """`parse_iso8601` with the optional C extension."""
+
+    def test_001_same_outcomes(self) -> None:
+        """The backend in use has the same outcomes, and reuses the interned timezones."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name, backend=accelerated.BACKEND):
+                self._assert_same_outcomes(accelerated.parse_iso8601, timestamps)
+
+        parsed = accelerated.parse_iso8601("2020-01-01T12:00:00+05:30")
+        self.assertIs(OFFSET_TIMEZONES[330], parsed.tzinfo)
+
+    def test_002_engine(self) -> None:
+        """An explicit engine selects the pure-Python parser, even for a valid timestamp."""
+        for engine in PARSER_ENGINES:
+            with self.subTest(engine=engine):
+                self._assert_same_outcomes(
+                    lambda timestamp: accelerated.parse_iso8601(timestamp, engine),
+                    list(FRACTIONAL_EDGE_CASES),
+                )
+
+        with self.assertRaises(ValueError):
+            accelerated.parse_iso8601("2020-01-01", engine="sliced")
+
+    def test_003_backend_environment_variable(self) -> None:
+        """`ISO8601_PARSER_BACKEND=python` selects the pure-Python parser at import time."""
+        script = "from solution import accelerated, solution; " \
+            "print(accelerated.BACKEND, accelerated.parse_iso8601 is solution.parse_iso8601)"
+        environment = {**os.environ, "ISO8601_PARSER_BACKEND": "python"}
+        process = subprocess.run(
+            [sys.executable, "-c", script], env=environment, capture_output=True, text=True
+        )
+        self.assertEqual("python True\n", process.stdout)
+
+
+class ValidationTests(unittest.TestCase):
+    """Checking timestamps without parsing them."""
+
+    # The edges of the values `parse_iso8601` accepts, with the ASCII-digit fast path and without
+    EDGE_CASES = (
+        "2020-02-29T23:59:59",
+        "2019-02-29T23:59:59",
+        "2000-02-29T00:00:00",
+        "1900-02-29T00:00:00",
+        "2020-04-31T00:00:00",
+        "2020-01-01T24:00:00",
+        "2020-01-01T23:60:00",
+        "2020-01-01T23:59:60",
+        "0000-01-01T00:00:00",
+        "\uff12\uff10\uff12\uff10-02-29T00:00:00",
+        "\uff12\uff10\uff11\uff19-02-29T00:00:00",
+        "2019-02-29",
+        "20200229",
+        "2020-01-01T12:00:00+23:59",
+        "2020-01-01T12:00:00+24:00",
+        "2020-01-01T12:00:00-2400",
+        "2020-01-01T12:00:00.999999999Z",
+    )
+
+    def test_001_same_verdicts_as_parse_iso8601(self) -> None:
+        """A timestamp is valid exactly when `parse_iso8601` returns a `datetime.datetime`."""
+        corpora = {**TIMESTAMPS, "edge cases": list(self.EDGE_CASES)}
+        for name, timestamps in corpora.items():
+            verdicts = validate_iso8601_many(timestamps)
+            self.assertEqual(len(timestamps), len(verdicts))
+            for timestamp, verdict in zip(timestamps, verdicts):
+                with self.subTest(corpus=name, timestamp=timestamp):
+                    expected = isinstance(outcome(parse_iso8601, timestamp)[0], datetime.datetime)
+                    self.assertIs(expected, is_valid_iso8601(timestamp))
+                    self.assertIs(expected, verdict)
+
+
+class ErrorRecordTests(EquivalenceTestCase):
+    """Parsing timestamps without raising exceptions for the invalid ones."""
+
+    def test_001_parse_iso8601_records(self) -> None:
+        """The results have `None` at the positions of the records of the invalid timestamps."""
+        for name, timestamps in TIMESTAMPS.items():
+            with self.subTest(corpus=name):
+                results, errors = parse_iso8601_records(iter(timestamps))
+                self.assertEqual(len(timestamps), len(results))
+
+                indexes = [error.index for error in errors]
+                self.assertTrue(all(index < next_ for index, next_ in zip(indexes, indexes[1:])))
+
+                records = {error.index: error for error in errors}
+                for index, (timestamp, result) in enumerate(zip(timestamps, results)):
+                    with self.subTest(timestamp=timestamp):
+                        if (error := records.get(index)) is not None:
+                            self.assertIsNone(result)
+                            result = error
+                        self.assertEqual(outcome(parse_iso8601, timestamp), result_outcome(result))
+
+    def test_002_parse_if_valid(self) -> None:
+        """`parse_if_valid` returns what `parse_iso8601` does, or `None` instead of raising."""
+        for name, timestamps in TIMESTAMPS.items():
+            for timestamp in timestamps:
+                with self.subTest(corpus=name, timestamp=timestamp):
+                    expected = outcome(parse_iso8601, timestamp)
+                    if not isinstance(expected[0], datetime.datetime):
+                        expected = None, None
+                    parsed = parse_if_valid(timestamp)
+                    self.assertEqual(expected, (parsed, parsed and parsed.utcoffset()))
+
+    def test_003_locate_error(self) -> None:
+        """`locate_error` points at the part of the timestamp that's wrong."""
+        cases = (
+            ("2020/01/01", "date", 0),
+            ("2020-01-01 12:00", "separator", 10),
+            ("2020-01-01T1", "time", 11),
+            ("2020-01-01T12:00:00+5", "timezone", 19),
+            ("2020-01-01T12:00:00Zx", "trailing", 20),
+            ("0000-01-01", "year", 0),
+            ("2020-13-01", "month", 5),
+            ("2019-02-29", "day", 8),
+            ("2020-01-01T24:00", "hour", 11),
+            ("2020-01-01T12:60", "minute", 14),
+            ("20200101T120060", "second", 13),
+            ("2020-01-01T12:00:00+24:00", "offset", 19),
+        )
+        for timestamp, code, offset in cases:
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(
+                    (code, offset, outcome(parse_iso8601, timestamp)[1]), locate_error(timestamp)
+                )
+
+        for name, timestamps in TIMESTAMPS.items():
+            for timestamp in timestamps:
+                with self.subTest(corpus=name, timestamp=timestamp):
+                    if (location := locate_error(timestamp)) is None:
+                        self.assertIsInstance(parse_iso8601(timestamp), datetime.datetime)
+                        continue
+
+                    code, offset, message = location
+                    error = ParseError(0, code, offset, message).to_exception()
+                    self.assertEqual(outcome(parse_iso8601, timestamp), (type(error), message))
+                    # The missing part of a truncated timestamp starts at its end
+                    self.assertTrue(0 <= offset <= len(timestamp))
+
+
+class FractionalTimeTests(unittest.TestCase):
+    """Fractions of an hour, a minute, or a second."""
+
+    def test_001_same_values_as_the_unit_conversion_loop(self) -> None:
+        """The fraction helpers give the values of the unit-conversion loop they replace."""
+        helpers = {
+            "hour": (("minute", "second", "microsecond"), fractional_hours),
+            "minute": (("second", "microsecond"), fractional_minutes),
+            "second": (("microsecond",), lambda fraction: (fractional_seconds(fraction),)),
+        }
+        for time_unit, (units, helper) in helpers.items():
+            for fraction in FRACTIONS:
+                with self.subTest(time_unit=time_unit, fraction=fraction):
+                    # The loop stops at the first unit without a remainder, so it leaves out zeroes
+                    expected = dict.fromkeys(units, 0)
+                    expected.update(unit_conversion_loop(fraction, time_unit))
+                    self.assertEqual(expected, calculate_fractional_time(fraction, time_unit))
+                    self.assertEqual(expected, dict(zip(units, helper(fraction))))
+
+    def test_002_fractions_are_truncated_exactly(self) -> None:
+        """Every engine truncates a fraction to whole microseconds, like exact arithmetic does."""
+        units = {
+            "2020-01-01T12.": 3_600_000_000,
+            "20200101T12.": 3_600_000_000,
+            "2020-01-01T12:34.": 60_000_000,
+            "20200101T1234.": 60_000_000,
+            "2020-01-01T12:34:56.": 1_000_000,
+            "20200101T123456.": 1_000_000,
+        }
+        for engine, parser in PARSER_ENGINES.items():
+            for prefix, microseconds in units.items():
+                base = parser(prefix[:-1])
+                for fraction in FRACTIONS:
+                    timestamp = f"{prefix}{fraction}"
+                    with self.subTest(engine=engine, timestamp=timestamp):
+                        exact = fractions.Fraction(f"0.{fraction}") * microseconds
+                        expected = base + datetime.timedelta(microseconds=int(exact))
+                        self.assertEqual(expected, parser(timestamp))
+
+    def test_003_rejects_invalid_fractions(self) -> None:
+        """A fraction with more than six decimals, no decimals, or a decimal comma is rejected."""
+        timestamps = (
+            "2020-01-01T12:34:56.1234567",
+            "2020-01-01T12.1234567",
+            "2020-01-01T12:34:56.",
+            "2020-01-01T12:34:56,5",
+        )
+        for engine, parser in PARSER_ENGINES.items():
+            for timestamp in timestamps:
+                with self.subTest(engine=engine, timestamp=timestamp):
+                    with self.assertRaises(InvalidFormat):
+                        parser(timestamp)
+
+
+if __name__ == "__main__":
+    unittest.main()
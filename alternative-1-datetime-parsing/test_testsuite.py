@@ -0,0 +1,491 @@
+import datetime
+import gc
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import textwrap
+import typing
+import unittest
+import unittest.mock
+
+import qualifier
+import test_qualifier
+
+from solution.solution import parse_iso8601
+from testsuite.compare import compare_results, compare_samples, run_compare, slower_p_value
+from testsuite.corpora import (
+    CORPUS_GENERATORS,
+    CORPUS_SIZE,
+    corpus_path,
+    generate_corpus,
+    load_corpus,
+    write_corpora,
+)
+from testsuite import parallel
+from testsuite.targets import DEFAULT_TARGET, Target, load_target, testing_target
+from testsuite.timing import (
+    BenchmarkSettings,
+    garbage_collection,
+    measure_passes,
+    measure_strings,
+    measurement,
+    reject_errors,
+    summarize,
+)
+
+
+class CallCounter:
+    """A parser that counts its calls and records whether the garbage collector was enabled."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.gc_enabled = set()
+
+    def __call__(self, datestring: str) -> str:
+        self.calls += 1
+        self.gc_enabled.add(gc.isenabled())
+        return datestring
+
+
+class TimingTests(unittest.TestCase):
+    """Taking and summarizing timing samples."""
+
+    def test_001_summarize(self) -> None:
+        """The summary has the inclusive percentiles of the samples and their Tukey outliers."""
+        samples = [float(sample) for sample in range(1, 101)]
+        summary = summarize(samples)
+        self.assertEqual(100, summary.samples)
+        self.assertEqual((50.5, 50.5), (summary.median, summary.mean))
+        self.assertEqual(0, summary.outliers)
+        self.assertAlmostEqual(95.05, summary.p95)
+        self.assertAlmostEqual(99.01, summary.p99)
+        self.assertAlmostEqual(statistics.stdev(samples), summary.stdev)
+
+        self.assertEqual(1, summarize([1.0] * 10 + [2.0] * 10 + [100.0]).outliers)
+
+    def test_002_measurement(self) -> None:
+        """A record has the samples, and their summary if there's more than one."""
+        self.assertEqual({"kind": "strings", "samples": [0.5]}, measurement("strings", [0.5]))
+
+        record = measurement("passes", [1.0, 2.0, 3.0])
+        self.assertEqual("passes", record["kind"])
+        self.assertEqual([1.0, 2.0, 3.0], record["samples"])
+        self.assertEqual(2.0, record["median"])
+        summary_keys = {"median", "p95", "p99", "mean", "stdev", "outliers"}
+        self.assertEqual({"kind", "samples", *summary_keys}, record.keys())
+
+    def test_003_garbage_collection(self) -> None:
+        """The state of the garbage collector is restored, even if the block raises."""
+        was_enabled = gc.isenabled()
+        self.addCleanup(gc.enable if was_enabled else gc.disable)
+
+        for initially_enabled, enabled in ((True, False), (False, True)):
+            with self.subTest(initially_enabled=initially_enabled, enabled=enabled):
+                if initially_enabled:
+                    gc.enable()
+                else:
+                    gc.disable()
+                with self.assertRaises(RuntimeError):
+                    with garbage_collection(enabled):
+                        self.assertIs(enabled, gc.isenabled())
+                        raise RuntimeError
+                self.assertIs(initially_enabled, gc.isenabled())
+
+    def test_004_measure(self) -> None:
+        """Every string is parsed in each warmup pass and `number` times per sample."""
+        datestrings = ["2020-01-01"] * 5
+        settings = BenchmarkSettings(warmup=2, repeats=3, number=4, disable_gc=True)
+
+        parser = CallCounter()
+        samples = measure_strings(parser, datestrings, settings)
+        self.assertEqual([3] * 5, [len(string_samples) for string_samples in samples])
+        self.assertEqual((5 * (2 + 3 * 4), {False}), (parser.calls, parser.gc_enabled))
+
+        parser = CallCounter()
+        samples = measure_passes(parser, datestrings, settings._replace(disable_gc=False))
+        self.assertEqual(3, len(samples))
+        self.assertEqual((5 * (2 + 3), {True}), (parser.calls, parser.gc_enabled))
+
+    def test_005_reject_errors(self) -> None:
+        """A parser wrapped by `reject_errors` returns the `ValueError` instead of raising it."""
+        def parser(datestring: str) -> typing.Any:
+            if datestring == "invalid":
+                raise ValueError(datestring)
+            return datestring
+
+        wrapped = reject_errors(parser)
+        self.assertEqual("valid", wrapped("valid"))
+        self.assertIsInstance(wrapped("invalid"), ValueError)
+
+
+class CorporaTests(unittest.TestCase):
+    """Generating and storing the benchmark corpora."""
+
+    def test_001_reproducible(self) -> None:
+        """The same name, size, and seed always give the same strings, and another seed doesn't."""
+        for name in CORPUS_GENERATORS:
+            with self.subTest(corpus=name):
+                corpus = generate_corpus(name, size=50, seed=7)
+                self.assertEqual(corpus, generate_corpus(name, size=50, seed=7))
+                self.assertNotEqual(corpus, generate_corpus(name, size=50, seed=8))
+                self.assertEqual(corpus[:20], generate_corpus(name, size=20, seed=7))
+
+    def test_002_stored_corpora_are_up_to_date(self) -> None:
+        """The stored corpora are those the generators give, so they can be regenerated."""
+        for name in CORPUS_GENERATORS:
+            with self.subTest(corpus=name):
+                self.assertTrue(os.path.exists(corpus_path(name)))
+                self.assertEqual(generate_corpus(name), load_corpus(name))
+
+    def test_003_write_and_load(self) -> None:
+        """Stored corpora are loaded line by line, and missing ones are generated."""
+        with tempfile.TemporaryDirectory() as directory:
+            for name in CORPUS_GENERATORS:
+                with self.subTest(corpus=name, stored=False):
+                    self.assertEqual(generate_corpus(name), load_corpus(name, directory))
+
+            paths = write_corpora(directory)
+            self.assertEqual([corpus_path(name, directory) for name in CORPUS_GENERATORS], paths)
+            for name in CORPUS_GENERATORS:
+                with self.subTest(corpus=name, stored=True):
+                    self.assertEqual(generate_corpus(name), load_corpus(name, directory))
+
+        with self.assertRaises(KeyError):
+            load_corpus("unknown")
+
+    def test_004_shapes(self) -> None:
+        """The valid corpora only have valid strings; most of the invalid-heavy ones are invalid."""
+        for name in CORPUS_GENERATORS:
+            corpus = generate_corpus(name)
+            self.assertEqual(CORPUS_SIZE, len(corpus))
+            invalid = 0
+            for datestring in corpus:
+                try:
+                    parse_iso8601(datestring)
+                except ValueError:
+                    invalid += 1
+
+            with self.subTest(corpus=name):
+                if name == "invalid-heavy":
+                    self.assertGreater(invalid, CORPUS_SIZE // 2)
+                else:
+                    self.assertEqual(0, invalid)
+
+
+def results_document(
+    scale: float = 1.0,
+    passed: bool = True,
+    kind: str = "passes",
+    parser: str = "parse_iso8601",
+) -> typing.Dict[str, typing.Any]:
+    """Return the saved results of a run whose timings are those of a baseline times `scale`."""
+    samples = [sample * scale for sample in (1.0, 1.01, 0.99, 1.02, 0.98, 1.03, 0.97, 1.0)]
+    return {
+        "environment": {"python": "3.11.7", "parser": parser},
+        "benchmark": {"kind": kind, "samples": samples},
+        "corpora": {"mixed": {"kind": kind, "samples": [2 * sample for sample in samples]}},
+        "tests": {"Part 1": {"Accepts valid date strings.": {"passed": passed}}},
+    }
+
+
+class CompareTests(unittest.TestCase):
+    """Comparing the saved results of two runs."""
+
+    def test_001_slower_p_value(self) -> None:
+        """The Mann-Whitney U test with the normal approximation, ties, and continuity."""
+        self.assertAlmostEqual(0.0060929, slower_p_value([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]))
+        self.assertAlmostEqual(0.9966923, slower_p_value([6, 7, 8, 9, 10], [1, 2, 3, 4, 5]))
+        # Tied values share the average of their ranks, which shrinks the variance
+        self.assertAlmostEqual(0.0570142, slower_p_value([1, 1, 2, 2, 3, 3], [2, 2, 3, 3, 4, 5]))
+        self.assertEqual(1.0, slower_p_value([1.0] * 5, [1.0] * 5))
+
+    def test_002_compare_samples(self) -> None:
+        """Only a significant change of more than the threshold gets a verdict."""
+        old = results_document()["benchmark"]
+        # The verdict, whether the change is significant at the 1% level, and the new samples
+        cases = (
+            ("REGRESSION", True, results_document(1.2)["benchmark"]),
+            ("improvement", True, results_document(0.8)["benchmark"]),
+            # Significant, but not more than the threshold of 5%
+            ("unchanged", True, results_document(1.04)["benchmark"]),
+            # More than the threshold, but not significant
+            ("unchanged", False, {"kind": "passes", "samples": [0.9, 1.3, 0.95, 1.25, 1.0, 1.2]}),
+            ("incomparable", None, results_document(1.2, kind="strings")["benchmark"]),
+            ("too few samples", None, {"kind": "passes", "samples": [2.0, 2.0]}),
+        )
+        for verdict, significant, new in cases:
+            with self.subTest(verdict=verdict, samples=new["samples"]):
+                comparison = compare_samples("benchmark", old, new, alpha=0.01, threshold=0.05)
+                self.assertEqual(verdict, comparison.verdict)
+                self.assertAlmostEqual(
+                    statistics.median(new["samples"]) / statistics.median(old["samples"]) - 1,
+                    comparison.change,
+                )
+                if significant is None:
+                    self.assertTrue(math.isnan(comparison.p_value))
+                else:
+                    self.assertIs(significant, comparison.p_value < 0.01)
+
+    def test_003_compare_results(self) -> None:
+        """The benchmark and the corpora measured in both runs are compared."""
+        old, new = results_document(), results_document(1.2)
+        new["corpora"]["date-only"] = new["corpora"]["mixed"]
+        comparisons = compare_results(old, new)
+        self.assertEqual(["benchmark", "corpus mixed"], [item.name for item in comparisons])
+        self.assertEqual(["REGRESSION"] * 2, [item.verdict for item in comparisons])
+
+    def test_004_run_compare(self) -> None:
+        """The exit status is 1 for a significant regression or a test that no longer passes."""
+        cases = (
+            (0, results_document(), results_document(1.01)),
+            (0, results_document(), results_document(0.8)),
+            (1, results_document(), results_document(1.2)),
+            (1, results_document(), results_document(passed=False)),
+            # A test that didn't pass before isn't a regression
+            (0, results_document(passed=False), results_document(passed=False)),
+            # The targets of a run of several targets are paired up by name
+            (1, {"targets": {"a": results_document(), "b": results_document()}},
+             {"targets": {"b": results_document(1.2), "c": results_document()}}),
+            (0, {"targets": {"a": results_document(), "b": results_document()}},
+             {"targets": {"c": results_document(1.2)}}),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for status, old, new in cases:
+                paths = os.path.join(directory, "old.json"), os.path.join(directory, "new.json")
+                for path, document in zip(paths, (old, new)):
+                    with open(path, "w", encoding="utf-8") as file:
+                        json.dump(document, file)
+
+                with self.subTest(old=old, new=new):
+                    stream = io.StringIO()
+                    self.assertEqual(status, run_compare(*paths, stream=stream))
+
+            # A single target is compared with a single target of another name, with a warning
+            for path, parser in zip(paths, ("old:parse", "new:parse")):
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(results_document(parser=parser), file)
+
+            stream = io.StringIO()
+            self.assertEqual(0, run_compare(*paths, stream=stream))
+            warning = "Warning: the parser differs: 'old:parse' -> 'new:parse'"
+            self.assertIn(warning, stream.getvalue())
+
+
+class TargetTests(unittest.TestCase):
+    """Loading the parsers the test suite runs against."""
+
+    def test_001_load_target(self) -> None:
+        """A `module:callable` specification loads the callable, which may be nested."""
+        self.assertEqual(
+            Target("solution.solution:parse_iso8601", parse_iso8601),
+            load_target("solution.solution:parse_iso8601"),
+        )
+        target = load_target("datetime:datetime.fromisoformat")
+        self.assertEqual(datetime.datetime(2020, 1, 1), target.parser("2020-01-01"))
+
+        self.assertIs(qualifier.parse_iso8601, load_target(DEFAULT_TARGET).parser)
+
+    def test_002_rejects_invalid_targets(self) -> None:
+        """Malformed specifications, missing attributes, and non-callables raise a `ValueError`."""
+        cases = (
+            ("solution.solution", "expected a `module:callable` target"),
+            (":parse_iso8601", "expected a `module:callable` target"),
+            ("solution.solution:", "expected a `module:callable` target"),
+            ("solution.solution:parse", "has no attribute 'parse'"),
+            ("solution.solution:parse_iso8601.missing", "has no attribute 'parse_iso8601.missing'"),
+            ("solution.solution:DEFAULT_ENGINE", "is not callable"),
+        )
+        for specification, message in cases:
+            with self.subTest(specification=specification):
+                with self.assertRaises(ValueError) as context:
+                    load_target(specification)
+                self.assertIn(message, str(context.exception))
+
+        # Import errors are raised as they are
+        with self.assertRaises(ImportError):
+            load_target("solution.missing:parse_iso8601")
+
+    def test_003_testing_target(self) -> None:
+        """The tests call the parser of the target within the block, and the original after it."""
+        original = test_qualifier.parse_iso8601
+        target = Target("test:parser", lambda datestring: datestring)
+
+        with testing_target(target):
+            self.assertIs(target.parser, test_qualifier.parse_iso8601)
+        self.assertIs(original, test_qualifier.parse_iso8601)
+
+        with self.assertRaises(RuntimeError):
+            with testing_target(target):
+                raise RuntimeError
+        self.assertIs(original, test_qualifier.parse_iso8601)
+
+        other = Target("test:other", lambda datestring: None)
+        with testing_target(target):
+            with testing_target(other):
+                self.assertIs(other.parser, test_qualifier.parse_iso8601)
+            self.assertIs(target.parser, test_qualifier.parse_iso8601)
+        self.assertIs(original, test_qualifier.parse_iso8601)
+
+
+# A test module with many test cases, some of which fail, that the parallel runner splits up
+SHARDED_TEST_MODULE = textwrap.dedent(
+    """
+    import unittest
+
+    import test_qualifier
+
+
+    class ShardedTests(unittest.TestCase):
+        def test_001_many_test_cases(self):
+            for number in test_qualifier.iter_test_cases(range(500)):
+                with self.subTest(number=number):
+                    self.assertNotEqual(0, number % 7)
+
+        def test_002_two_loops(self):
+            for number in test_qualifier.iter_test_cases(range(30)):
+                with self.subTest(number=number):
+                    self.assertLess(number, 25)
+            for letter in test_qualifier.iter_test_cases("abcdefghij"):
+                with self.subTest(letter=letter):
+                    self.assertNotIn(letter, "aeiou")
+
+        def test_003_no_test_cases(self):
+            self.assertEqual(1, 2)
+
+        def test_004_error_after_the_test_cases(self):
+            for number in test_qualifier.iter_test_cases(range(40)):
+                with self.subTest(number=number):
+                    pass
+            raise KeyError("after the test cases")
+
+        def test_005_unpicklable_exception(self):
+            for number in test_qualifier.iter_test_cases(range(20)):
+                with self.subTest(number=number):
+                    if number == 13:
+                        error = ValueError("unlucky")
+                        error.callback = lambda: None
+                        raise error
+    """
+)
+
+
+class EventResult(unittest.TestResult):
+    """A test result that records the events a test suite reports, for comparison."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.events = []
+
+    def startTest(self, test: unittest.TestCase) -> None:
+        super().startTest(test)
+        self.events.append(("start", test.id()))
+
+    def addSubTest(self, test: typing.Any, subtest: typing.Any, outcome: typing.Any) -> None:
+        failure = repr(outcome[1]) if outcome else None
+        self.events.append(("subtest", test.id(), dict(subtest.params), failure))
+
+    def addError(self, test: unittest.TestCase, err: typing.Any) -> None:
+        self.events.append(("error", test.id(), repr(err[1])))
+
+    def addFailure(self, test: unittest.TestCase, err: typing.Any) -> None:
+        self.events.append(("failure", test.id(), repr(err[1])))
+
+    def addSuccess(self, test: unittest.TestCase) -> None:
+        self.events.append(("success", test.id()))
+
+
+class ParallelTests(unittest.TestCase):
+    """Running the test cases of a suite in worker processes."""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with open(os.path.join(directory.name, "sharded_tests.py"), "w") as file:
+            file.write(SHARDED_TEST_MODULE)
+
+        sys.path.insert(0, directory.name)
+        self.addCleanup(sys.path.remove, directory.name)
+        self.addCleanup(sys.modules.pop, "sharded_tests", None)
+
+    def load_suite(self) -> unittest.TestSuite:
+        """Load the suite of the sharded test module; a suite drops its tests once it has run."""
+        return unittest.defaultTestLoader.loadTestsFromName("sharded_tests")
+
+    def test_001_counts_the_test_cases(self) -> None:
+        """The test cases of every loop of a test method are counted, without running them."""
+        tests = parallel.iter_tests(self.load_suite())
+        self.assertEqual([500, 40, 0, 40, 20], [parallel.count_test_cases(test) for test in tests])
+
+    def test_002_split_test_cases(self) -> None:
+        """The shards are contiguous ranges of test cases of about the same size."""
+        counts = [("a", 5), ("b", 0), ("c", 7)]
+        self.assertEqual(
+            [
+                [("a", 0, 4)],
+                [("a", 4, 5), ("b", 0, None), ("c", 0, 3)],
+                [("c", 3, 7)],
+            ],
+            parallel.split_test_cases(counts, 3),
+        )
+        self.assertEqual([[("a", 0, None)]], parallel.split_test_cases([("a", 0)], 4))
+
+        counts = [("a", 500), ("b", 40), ("c", 0), ("d", 40), ("e", 20)]
+        for shards in (1, 2, 3, 8, 600, 1000):
+            with self.subTest(shards=shards):
+                split = parallel.split_test_cases(counts, shards)
+                self.assertLessEqual(len(split), shards)
+                covered = {name: [] for name, _ in counts}
+                for test_slice in (test_slice for shard in split for test_slice in shard):
+                    if test_slice.stop is not None:
+                        covered[test_slice.test_id].extend(
+                            range(test_slice.start, test_slice.stop)
+                        )
+                self.assertEqual({name: list(range(count)) for name, count in counts}, covered)
+
+    def run_parallel(self, workers: int, processors: int, min_test_cases: int) -> EventResult:
+        """Run the sharded tests with `run_parallel`, as if the machine had `processors`."""
+        result = EventResult()
+        cpu_count = unittest.mock.patch.object(parallel.os, "cpu_count", return_value=processors)
+        with cpu_count, unittest.mock.patch.object(
+            parallel, "MIN_PARALLEL_TEST_CASES", min_test_cases
+        ):
+            parallel.run_parallel(
+                self.load_suite(), result, "solution.solution:parse_iso8601", workers
+            )
+        return result
+
+    def test_003_same_events_as_a_sequential_run(self) -> None:
+        """The merged records replay the subtests, failures, and errors of a sequential run."""
+        expected = EventResult()
+        self.load_suite()(expected)
+
+        for workers in (2, 3, 5):
+            with self.subTest(workers=workers):
+                actual = self.run_parallel(workers, processors=8, min_test_cases=0)
+                self.assertEqual(len(expected.events), len(actual.events))
+                for expected_event, actual_event in zip(expected.events, actual.events):
+                    self.assertEqual(expected_event, actual_event)
+
+    def test_004_runs_in_this_process(self) -> None:
+        """No worker processes are started for a small suite, or with a single processor."""
+        expected = EventResult()
+        self.load_suite()(expected)
+
+        cases = (
+            ("small suite", 8, parallel.MIN_PARALLEL_TEST_CASES),
+            ("single processor", 1, 0),
+        )
+        for name, processors, min_test_cases in cases:
+            with self.subTest(name):
+                futures = parallel.concurrent.futures
+                with unittest.mock.patch.object(futures, "ProcessPoolExecutor") as executor:
+                    actual = self.run_parallel(4, processors, min_test_cases)
+                executor.assert_not_called()
+                self.assertEqual(expected.events, actual.events)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,169 @@
 import argparse
+import sys
 
 import testsuite.runner
+from testsuite.compare import run_compare
+from testsuite.corpora import CORPUS_GENERATORS, write_corpora
+from testsuite.targets import DEFAULT_TARGET, Target, load_target
+from testsuite.timing import BenchmarkSettings
+
+
+def positive_integer(value: str) -> int:
+    """Parse a command line argument that should be a positive integer."""
+    if not value.isdecimal() or int(value) < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return int(value)
+
+
+def target(value: str) -> Target:
+    """Parse a command line argument that should be the `module:callable` of a parser."""
+    try:
+        return load_target(value)
+    except (ImportError, ValueError) as exception:
+        raise argparse.ArgumentTypeError(str(exception)) from None
 
 
 parser = argparse.ArgumentParser(
     prog="python -m testsuite",
     description="Python Discord Code Jam: Qualifier Test Suite"
 )
-testsuite.runner.run_testsuite()
+parser.add_argument(
+    "--target",
+    action="append",
+    type=target,
+    metavar="MODULE:CALLABLE",
+    help=(
+        "run the tests and the benchmark against this parser instead of the qualifier, like "
+        "`solution.solution:parse_iso8601` (may be given more than once to compare parsers; "
+        f"default: {DEFAULT_TARGET})"
+    ),
+)
+parser.add_argument(
+    "--workers",
+    type=positive_integer,
+    default=1,
+    metavar="N",
+    help="run the tests in N worker processes; the output stays in order (default: 1)",
+)
+parser.add_argument(
+    "--benchmark",
+    action="append",
+    choices=sorted(testsuite.runner.BENCHMARKS),
+    metavar="NAME",
+    help="also run the named benchmark of the example solution (may be given more than once)",
+)
+
+parser.add_argument(
+    "--corpus",
+    action="append",
+    default=[],
+    choices=[*CORPUS_GENERATORS, "all"],
+    metavar="NAME",
+    help=(
+        "also report the throughput of `parse_iso8601` on the named corpus (may be given more "
+        f"than once, or `all`): {', '.join(CORPUS_GENERATORS)}"
+    ),
+)
+parser.add_argument(
+    "--json",
+    metavar="PATH",
+    help="save the test results and benchmark measurements as JSON, for `compare`",
+)
+parser.add_argument(
+    "--generate-corpora",
+    action="store_true",
+    help="regenerate the stored corpora from their seeds and exit",
+)
+
+defaults = BenchmarkSettings()
+statistical = parser.add_argument_group(
+    "statistical benchmark",
+    "Report the median, p95, p99, standard deviation, and outliers of the per-string timings of "
+    "`parse_iso8601` instead of only the total and the average. The settings also apply to the "
+    "corpus throughput, which is measured in passes over each corpus.",
+)
+statistical.add_argument(
+    "--statistical",
+    action="store_true",
+    help="run a statistical benchmark of `parse_iso8601`",
+)
+statistical.add_argument(
+    "--warmup",
+    type=int,
+    default=defaults.warmup,
+    metavar="N",
+    help=f"passes over the strings before measuring (default: {defaults.warmup})",
+)
+statistical.add_argument(
+    "--repeats",
+    type=positive_integer,
+    default=defaults.repeats,
+    metavar="N",
+    help=f"timing samples per string, at least 2 (default: {defaults.repeats})",
+)
+statistical.add_argument(
+    "--number",
+    type=positive_integer,
+    default=defaults.number,
+    metavar="N",
+    help=f"calls per timing sample (default: {defaults.number})",
+)
+statistical.add_argument(
+    "--disable-gc",
+    action="store_true",
+    help="disable the garbage collector while measuring",
+)
+
+commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+compare = commands.add_parser(
+    "compare",
+    help="compare two runs saved with --json and flag significant regressions",
+    description=(
+        "Compare the benchmark and corpus timings of two runs saved with --json. A measurement "
+        "regressed if it's significantly slower (one-sided Mann-Whitney U test) by more than the "
+        "threshold. The exit status is 1 if there are regressions or newly failing tests."
+    ),
+)
+compare.add_argument("old", help="the JSON results of the baseline run")
+compare.add_argument("new", help="the JSON results of the run to check")
+compare.add_argument(
+    "--alpha",
+    type=float,
+    default=0.01,
+    help="the significance level of the test (default: 0.01)",
+)
+compare.add_argument(
+    "--threshold",
+    type=float,
+    default=0.05,
+    help="the smallest relative slowdown of the median to flag (default: 0.05)",
+)
+
+args = parser.parse_args()
+if args.command == "compare":
+    sys.exit(run_compare(args.old, args.new, alpha=args.alpha, threshold=args.threshold))
+
+if args.generate_corpora:
+    for path in write_corpora():
+        print(f"Wrote {path}")
+    parser.exit()
+
+if args.repeats < 2:
+    parser.error("--repeats should be at least 2 to calculate a distribution")
+if args.warmup < 0:
+    parser.error("--warmup should not be negative")
+
+benchmark_settings = BenchmarkSettings(
+    warmup=args.warmup, repeats=args.repeats, number=args.number, disable_gc=args.disable_gc
+)
+
+corpora = list(CORPUS_GENERATORS) if "all" in args.corpus else list(dict.fromkeys(args.corpus))
+testsuite.runner.run_testsuite(
+    benchmarks=args.benchmark,
+    benchmark_settings=benchmark_settings,
+    statistical=args.statistical,
+    corpora=corpora,
+    json_path=args.json,
+    targets=args.target,
+    workers=args.workers,
+)
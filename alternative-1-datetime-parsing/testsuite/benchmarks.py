@@ -0,0 +1,774 @@
+import asyncio
+import datetime
+import os
+import random
+import tempfile
+import threading
+import timeit
+import typing
+import unittest
+import unittest.mock
+
+from solution import accelerated, solution
+from solution.buffers import parse_mmap
+from solution.cache import CachedParser
+from solution.columnar import parse_iso8601_epoch
+from solution.compiled import compile_parser
+from solution.learning import FormatLearningParser
+from solution.parallel import parse_iso8601_parallel
+from solution.records import parse_iso8601_records
+from solution.streaming import parse_file, parse_stream
+from solution.validation import is_valid_iso8601, validate_iso8601_many
+
+try:
+    from solution.vectorized import parse_iso8601_vectorized
+except ImportError:  # pragma: no cover - NumPy is an optional dependency
+    parse_iso8601_vectorized = None
+
+import test_qualifier
+
+from testsuite.result import StreamWrapper
+
+
+BENCHMARK_STRINGS = "testsuite/benchmark_strings.txt"
+
+Benchmark = typing.Callable[[StreamWrapper, typing.List[str]], None]
+
+
+def load_benchmark_strings(path: str = BENCHMARK_STRINGS) -> typing.List[str]:
+    """Load the benchmark strings, one datetime string per line."""
+    with open(path, "r", encoding="utf-8") as datestrings:
+        return [datestring.rstrip("\n") for datestring in datestrings]
+
+
+def time_runs(
+    function: typing.Callable[[], typing.Any],
+    max_runs: int = 100,
+    max_duration: float = 5.0,
+) -> typing.Tuple[float, int]:
+    """Call `function` repeatedly and return the total duration and the number of runs."""
+    duration = 0.0
+    for run in range(1, max_runs + 1):
+        start = timeit.default_timer()
+        function()
+        duration += timeit.default_timer() - start
+        if duration > max_duration:
+            break
+
+    return duration, run
+
+
+def write_comparison(
+    stream: StreamWrapper,
+    baseline: str,
+    candidates: typing.Dict[str, typing.Callable[[], typing.Any]],
+    strings_per_run: int,
+) -> None:
+    """Time each candidate and write its average time per string relative to the `baseline`."""
+    averages = {}
+    for description, function in candidates.items():
+        duration, runs = time_runs(function)
+        averages[description] = duration / (runs * strings_per_run)
+
+    for description, average in averages.items():
+        speedup = averages[baseline] / average
+        label = stream.fixed_width_text(f"{description}:", 40)
+        stream.write(f"{label}{average:.10f}s per string ({speedup:.2f}x)\n")
+
+
+def benchmark_batch(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare `parse_iso8601_many` with calling `parse_iso8601` in a loop."""
+    parse_iso8601 = solution.parse_iso8601
+
+    write_comparison(
+        stream,
+        baseline="parse_iso8601 loop",
+        candidates={
+            "parse_iso8601 loop": lambda: [parse_iso8601(string) for string in datestrings],
+            "parse_iso8601_many": lambda: solution.parse_iso8601_many(datestrings),
+        },
+        strings_per_run=len(datestrings),
+    )
+
+
+def benchmark_fixed_layout(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare the fixed-layout fast path of `parse_iso8601` with the general parser."""
+    parse_general = solution.parse_general
+    parse_iso8601 = solution.parse_iso8601
+
+    write_comparison(
+        stream,
+        baseline="general parser",
+        candidates={
+            "general parser": lambda: [parse_general(string) for string in datestrings],
+            "fixed-layout fast path": lambda: [parse_iso8601(string) for string in datestrings],
+        },
+        strings_per_run=len(datestrings),
+    )
+
+
+def benchmark_engines(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare the regex-free slicing engine with the regex engine."""
+    parse_general = solution.parse_general
+    parse_sliced = solution.parse_sliced
+
+    write_comparison(
+        stream,
+        baseline="regex engine",
+        candidates={
+            "regex engine": lambda: [parse_general(string) for string in datestrings],
+            "slicing engine": lambda: [parse_sliced(string) for string in datestrings],
+        },
+        strings_per_run=len(datestrings),
+    )
+
+
+def skewed_replay(
+    datestrings: typing.List[str], length: int = 20_000, seed: int = 6
+) -> typing.List[str]:
+    """Replay the strings with a Zipf-like distribution, so a few strings make up most of it."""
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(datestrings) + 1)]
+    return rng.choices(datestrings, weights=weights, k=length)
+
+
+def benchmark_cache(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Measure the hit ratio and the speed of `CachedParser` on a skewed replay."""
+    replay = skewed_replay(datestrings)
+    parse_iso8601 = solution.parse_iso8601
+
+    for maxsize in (64, 256, 1024):
+        cached_parser = CachedParser(maxsize=maxsize)
+        for string in replay:
+            cached_parser(string)
+
+        info = cached_parser.cache_info()
+        label = stream.fixed_width_text(f"Hit ratio (maxsize={maxsize}):", 40)
+        stream.write(f"{label}{cached_parser.hit_ratio:.2%} ({info.evictions} evictions)\n")
+
+    cached_parser = CachedParser(maxsize=256)
+    write_comparison(
+        stream,
+        baseline="parse_iso8601",
+        candidates={
+            "parse_iso8601": lambda: [parse_iso8601(string) for string in replay],
+            "CachedParser (maxsize=256)": lambda: [cached_parser(string) for string in replay],
+        },
+        strings_per_run=len(replay),
+    )
+
+
+# Most timestamps with a timezone use one of a handful of offsets
+COMMON_OFFSETS = ("+00:00", "+01:00", "+02:00", "-05:00", "-08:00", "+05:30", "+09:00", "Z")
+
+
+def timezone_replay(datestrings: typing.List[str], seed: int = 7) -> typing.List[str]:
+    """Append a common timezone designator to each of the strings."""
+    rng = random.Random(seed)
+    return [string + rng.choice(COMMON_OFFSETS) for string in datestrings]
+
+
+def benchmark_timezones(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare interned timezones with creating a new timezone for every offset designator."""
+    timezone_strings = timezone_replay(datestrings)
+    designators = [solution.TIMEZONE_PATTERN.match(string[19:]) for string in timezone_strings]
+    offsets = [
+        (match["sign"], match["hours"], match["minutes"])
+        for match in designators if match["sign"]
+    ]
+
+    def create_timezones() -> None:
+        for sign, hours, minutes in offsets:
+            units = {"hours": int(sign + hours), "minutes": int(sign + minutes)}
+            datetime.timezone(datetime.timedelta(**units))
+
+    def intern_timezones() -> None:
+        for sign, hours, minutes in offsets:
+            solution.offset_timezone(sign, hours, minutes)
+
+    write_comparison(
+        stream,
+        baseline="new timezone per designator",
+        candidates={
+            "new timezone per designator": create_timezones,
+            "interned timezones": intern_timezones,
+        },
+        strings_per_run=len(offsets),
+    )
+
+    parse_iso8601 = solution.parse_iso8601
+    duration, runs = time_runs(lambda: [parse_iso8601(string) for string in timezone_strings])
+    label = stream.fixed_width_text("parse_iso8601 on timezone strings:", 40)
+    stream.write(f"{label}{duration / (runs * len(timezone_strings)):.10f}s per string\n")
+
+
+def invalid_date_replay(datestrings: typing.List[str], seed: int = 8) -> typing.List[str]:
+    """Replace the month and day of each string with an invalid combination."""
+    rng = random.Random(seed)
+    invalid_dates = ("13-01", "00-12", "01-32", "02-30", "04-31", "11-00")
+    return [string[:5] + rng.choice(invalid_dates) + string[10:] for string in datestrings]
+
+
+def benchmark_dates(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare rejecting invalid dates with the lookup tables to letting `datetime` raise."""
+    invalid_strings = invalid_date_replay(datestrings)
+    dates = [
+        {"year": int(string[0:4]), "month": int(string[5:7]), "day": int(string[8:10])}
+        for string in invalid_strings
+    ]
+    time = {"hour": 12, "minute": 30, "second": 15}
+
+    def reject_with_datetime() -> None:
+        for date in dates:
+            try:
+                datetime.datetime(**date, **time)
+            except ValueError:
+                pass
+
+    def reject_with_tables() -> None:
+        for date in dates:
+            try:
+                solution.validate_date(**date)
+            except ValueError:
+                pass
+
+    write_comparison(
+        stream,
+        baseline="datetime constructor",
+        candidates={
+            "datetime constructor": reject_with_datetime,
+            "lookup tables": reject_with_tables,
+        },
+        strings_per_run=len(dates),
+    )
+
+    def parse_all() -> None:
+        for string in invalid_strings:
+            try:
+                solution.parse_general(string)
+            except ValueError:
+                pass
+
+    duration, runs = time_runs(parse_all)
+    label = stream.fixed_width_text("general parser on invalid dates:", 40)
+    stream.write(f"{label}{duration / (runs * len(invalid_strings)):.10f}s per string\n")
+
+
+def benchmark_streaming(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare streaming the benchmark file with reading it into a list before parsing."""
+    parse_iso8601 = solution.parse_iso8601
+
+    def read_then_parse() -> None:
+        for string in load_benchmark_strings():
+            parse_iso8601(string)
+
+    def stream_file() -> None:
+        for _ in parse_file(BENCHMARK_STRINGS):
+            pass
+
+    write_comparison(
+        stream,
+        baseline="read into a list",
+        candidates={"read into a list": read_then_parse, "parse_file": stream_file},
+        strings_per_run=len(datestrings),
+    )
+
+
+def benchmark_buffers(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare parsing a memory-mapped file in chunks with reading the file with `parse_file`."""
+    repeats = 200
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as file:
+        for _ in range(repeats):
+            file.write("\n".join(datestrings) + "\n")
+
+    def consume(results: typing.Iterator[typing.Any]) -> None:
+        for _ in results:
+            pass
+
+    try:
+        write_comparison(
+            stream,
+            baseline="parse_file (read)",
+            candidates={
+                "parse_file (read)": lambda: consume(parse_file(file.name)),
+                "parse_mmap (mmap)": lambda: consume(parse_mmap(file.name)),
+            },
+            strings_per_run=repeats * len(datestrings),
+        )
+    finally:
+        os.remove(file.name)
+
+
+def benchmark_columnar(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare the epoch columns of `parse_iso8601_epoch` with `parse_iso8601(...).timestamp()`."""
+    parse_iso8601 = solution.parse_iso8601
+
+    write_comparison(
+        stream,
+        baseline="parse_iso8601(...).timestamp()",
+        candidates={
+            "parse_iso8601(...).timestamp()": (
+                lambda: [parse_iso8601(string).timestamp() for string in datestrings]
+            ),
+            "parse_iso8601_epoch": lambda: parse_iso8601_epoch(datestrings),
+        },
+        strings_per_run=len(datestrings),
+    )
+
+
+def benchmark_vectorized(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare the NumPy arrays of `parse_iso8601_vectorized` with `parse_iso8601_epoch`."""
+    if parse_iso8601_vectorized is None:
+        stream.write("The vectorized parser requires NumPy, which isn't installed.\n")
+        return
+
+    parse_iso8601 = solution.parse_iso8601
+
+    write_comparison(
+        stream,
+        baseline="parse_iso8601(...).timestamp()",
+        candidates={
+            "parse_iso8601(...).timestamp()": (
+                lambda: [parse_iso8601(string).timestamp() for string in datestrings]
+            ),
+            "parse_iso8601_epoch": lambda: parse_iso8601_epoch(datestrings),
+            "parse_iso8601_vectorized": lambda: parse_iso8601_vectorized(datestrings),
+        },
+        strings_per_run=len(datestrings),
+    )
+
+
+def benchmark_scaling(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Report the throughput of `parse_iso8601_parallel` with an increasing number of workers."""
+    # Parallel parsing only pays off for large inputs, so we parse a corpus of a few million lines
+    repeats = 2_000_000 // len(datestrings) + 1
+    corpus = ("\n".join(datestrings) + "\n").encode("ascii") * repeats
+    lines = len(datestrings) * repeats
+
+    processors = os.cpu_count() or 1
+    baseline = None
+    for workers in sorted({1, 2, 4, processors}):
+        duration, runs = time_runs(lambda: parse_iso8601_parallel(corpus, workers), max_runs=3)
+        throughput = runs * lines / duration
+        baseline = baseline or throughput
+        speedup = throughput / baseline
+
+        label = stream.fixed_width_text(f"{workers} worker{'s' if workers > 1 else ''}:", 40)
+        stream.write(f"{label}{throughput:,.0f} strings per second ({speedup:.2f}x)\n")
+
+    stream.write(f"Parsed {lines:,} strings on {processors} processor(s).\n")
+
+
+def parse_outcome(parser: typing.Callable[[str], typing.Any], timestamp: str) -> typing.Any:
+    """Return a comparable outcome of parsing `timestamp`: its result or its exception."""
+    try:
+        return outcome_of(parser(timestamp))
+    except ValueError as exception:
+        return outcome_of(exception)
+
+
+def outcome_of(
+    result: typing.Union[datetime.datetime, ValueError, solution.ParseError]
+) -> typing.Any:
+    """Return a comparable outcome; aware datetimes are compared including their UTC offset."""
+    if isinstance(result, solution.ParseError):
+        result = result.to_exception()
+    if isinstance(result, ValueError):
+        return type(result), str(result)
+
+    return result, result.utcoffset()
+
+
+def record_test_corpus() -> typing.List[typing.Tuple[str, typing.Any]]:
+    """Run `test_qualifier` against the example solution and record every input and its outcome."""
+    corpus = []
+
+    def recording_parser(timestamp: str) -> datetime.datetime:
+        corpus.append((timestamp, parse_outcome(solution.parse_iso8601, timestamp)))
+        return solution.parse_iso8601(timestamp)
+
+    result = unittest.TestResult()
+    with unittest.mock.patch.object(test_qualifier, "parse_iso8601", recording_parser):
+        unittest.defaultTestLoader.loadTestsFromModule(test_qualifier).run(result)
+
+    if not result.wasSuccessful():
+        raise RuntimeError("the example solution does not pass `test_qualifier`")
+
+    return corpus
+
+
+def benchmark_threads(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Parse the `test_qualifier` corpus from many threads at once and check every result."""
+    corpus = record_test_corpus()
+    timestamps = [timestamp for timestamp, _ in corpus]
+    expected = [outcome for _, outcome in corpus]
+    rounds = 50
+    engines = sorted(solution.PARSER_ENGINES)
+
+    baseline = None
+    for threads in (1, 2, 4, 8, 16):
+        barrier = threading.Barrier(threads)
+        mismatches = []
+
+        def stress() -> None:
+            barrier.wait()
+            for _ in range(rounds):
+                # Every engine and the batch parser use different module-level tables and patterns
+                for engine in engines:
+                    outcomes = [
+                        parse_outcome(lambda string: solution.parse_iso8601(string, engine), string)
+                        for string in timestamps
+                    ]
+                    mismatches.extend(
+                        timestamp for timestamp, outcome, expected_outcome
+                        in zip(timestamps, outcomes, expected) if outcome != expected_outcome
+                    )
+
+                batch = solution.parse_iso8601_many(timestamps, raise_errors=False)
+                mismatches.extend(
+                    timestamp for timestamp, result, expected_outcome
+                    in zip(timestamps, batch, expected) if outcome_of(result) != expected_outcome
+                )
+
+        workers = [threading.Thread(target=stress) for _ in range(threads)]
+        start = timeit.default_timer()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        duration = timeit.default_timer() - start
+
+        throughput = threads * rounds * (len(engines) + 1) * len(timestamps) / duration
+        baseline = baseline or throughput
+        speedup = throughput / baseline
+
+        label = stream.fixed_width_text(f"{threads} thread{'s' if threads > 1 else ''}:", 40)
+        status = f"{len(mismatches)} mismatches" if mismatches else "all results correct"
+        stream.write(f"{label}{throughput:,.0f} strings per second ({speedup:.2f}x), {status}\n")
+
+
+def benchmark_asyncio(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare `parse_stream` with a `readline` loop on a stream served by a local server."""
+    parse_iso8601 = solution.parse_iso8601
+
+    # The server sends the benchmark strings in bursts; the latency of a line is the time between
+    # the server writing its burst and the client getting its result. We measure the throughput
+    # with bursts sent back to back, and the latency with bursts sent at a pace the client can keep.
+    bursts = 100
+    pace = 0.02
+    payload = ("\n".join(datestrings) + "\n").encode("ascii")
+
+    async def readline_loop(reader: asyncio.StreamReader) -> typing.AsyncIterator[typing.Any]:
+        line_no = 0
+        while (line := await reader.readline()):
+            line_no += 1
+            try:
+                yield line_no, parse_iso8601(line.decode("utf-8", errors="replace").rstrip("\r\n"))
+            except ValueError as exception:
+                yield line_no, exception
+
+    async def measure(
+        consume: typing.Callable[[asyncio.StreamReader], typing.AsyncIterator[typing.Any]],
+        interval: float,
+    ) -> typing.Tuple[float, typing.List[float], float]:
+        sent_at = []
+
+        async def serve(_: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            for _ in range(bursts):
+                sent_at.append(timeit.default_timer())
+                writer.write(payload)
+                await writer.drain()
+                await asyncio.sleep(interval)
+            writer.close()
+            await writer.wait_closed()
+
+        # A task that should wake up every millisecond tells us how long the parser holds the loop
+        longest_stall = 0.0
+
+        async def heartbeat() -> None:
+            nonlocal longest_stall
+            while True:
+                before = timeit.default_timer()
+                await asyncio.sleep(0.001)
+                longest_stall = max(longest_stall, timeit.default_timer() - before - 0.001)
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            heartbeat_task = asyncio.create_task(heartbeat())
+
+            latencies = []
+            start = timeit.default_timer()
+            async for line_no, _ in consume(reader):
+                now = timeit.default_timer()
+                latencies.append(now - sent_at[(line_no - 1) // len(datestrings)])
+            duration = timeit.default_timer() - start
+
+            heartbeat_task.cancel()
+            writer.close()
+            await writer.wait_closed()
+
+        return duration, latencies, longest_stall
+
+    # The throughput is reported relative to the `readline` loop, whichever is faster
+    consumers = {"readline loop": readline_loop, "parse_stream": parse_stream}
+    baseline = None
+    for description, consume in consumers.items():
+        duration, latencies, _ = asyncio.run(measure(consume, 0.0))
+        throughput = len(latencies) / duration
+        baseline = baseline or throughput
+
+        _, latencies, longest_stall = asyncio.run(measure(consume, pace))
+        latencies.sort()
+        mean = sum(latencies) / len(latencies) * 1000
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+
+        label = stream.fixed_width_text(f"{description}:", 40)
+        stream.write(
+            f"{label}{throughput:,.0f}/s ({throughput / baseline:.2f}x), "
+            f"latency {mean:.2f}ms (p99 {p99:.2f}ms), "
+            f"stall {longest_stall * 1000:.2f}ms\n"
+        )
+
+
+# The formats of the compiled parser benchmark
+COMPILED_FORMATS = (
+    "YYYY-MM-DD",
+    "YYYYMMDD",
+    "YYYY-MM-DDThh:mm:ss",
+    "YYYYMMDDThhmmss",
+    "YYYY-MM-DDThh:mm:ssZ",
+    "YYYY-MM-DDThh:mm:ss.ffffff",
+    "YYYY-MM-DDThh:mm:ss.ffffff±hh:mm",
+    "YYYYMMDDThhmmss.ffffff±hhmm",
+    "YYYY-MM-DDThh:mm.fff",
+)
+
+
+def format_timestamp(timestamp: datetime.datetime, spec: str) -> str:
+    """Format an aware `timestamp` according to a `compile_parser` spec."""
+    offset = int(timestamp.utcoffset().total_seconds()) // 60
+    sign = "-" if offset < 0 else "+"
+    hours, minutes = divmod(abs(offset), 60)
+
+    formatted = (
+        spec.replace("±hh:mm", f"{sign}{hours:02}:{minutes:02}")
+        .replace("±hhmm", f"{sign}{hours:02}{minutes:02}")
+        .replace("YYYY", f"{timestamp.year:04}")
+        .replace("MM", f"{timestamp.month:02}")
+        .replace("DD", f"{timestamp.day:02}")
+        .replace("hh", f"{timestamp.hour:02}")
+        .replace("mm", f"{timestamp.minute:02}")
+        .replace("ss", f"{timestamp.second:02}")
+    )
+    decimals = formatted.count("f")
+    return formatted.replace("f" * decimals, f"{timestamp.microsecond:06}"[:decimals])
+
+
+def benchmark_compiled(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare a compiled parser for each of the `COMPILED_FORMATS` with `parse_iso8601`."""
+    parse_iso8601 = solution.parse_iso8601
+
+    # Give the benchmark strings random microseconds and UTC offsets for the richer formats
+    rng = random.Random(16)
+    timestamps = [
+        parse_iso8601(datestring).replace(
+            microsecond=rng.randrange(1_000_000),
+            tzinfo=solution.OFFSET_TIMEZONES[rng.choice((0, 60, 120, -300, -480, 330, 540))],
+        )
+        for datestring in datestrings
+    ]
+
+    for spec in COMPILED_FORMATS:
+        strings = [format_timestamp(timestamp, spec) for timestamp in timestamps]
+        compiled_parser = compile_parser(spec)
+
+        durations = {}
+        for description, parser in {"parse_iso8601": parse_iso8601, spec: compiled_parser}.items():
+            duration, runs = time_runs(lambda: [parser(string) for string in strings], max_runs=50)
+            durations[description] = duration / (runs * len(strings))
+
+        label = stream.fixed_width_text(f"{spec}:", 40)
+        average = durations[spec]
+        speedup = durations["parse_iso8601"] / average
+        stream.write(f"{label}{average:.10f}s per string ({speedup:.2f}x)\n")
+
+
+def mixed_format_feed(
+    timestamps: typing.List[datetime.datetime], length: int = 100_000, seed: int = 17
+) -> typing.List[str]:
+    """Format the timestamps in long runs of one of the `COMPILED_FORMATS`, with a few outliers."""
+    rng = random.Random(seed)
+    feed = []
+    while len(feed) < length:
+        spec = rng.choice(COMPILED_FORMATS)
+        for timestamp in rng.choices(timestamps, k=rng.randrange(1_000, 10_000)):
+            # About one in a hundred timestamps has a different format than the rest of its run
+            feed.append(format_timestamp(
+                timestamp, rng.choice(COMPILED_FORMATS) if rng.random() < 0.01 else spec
+            ))
+
+    return feed[:length]
+
+
+def benchmark_learning(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare `FormatLearningParser` with `parse_iso8601` on a feed with long runs of a format."""
+    parse_iso8601 = solution.parse_iso8601
+
+    rng = random.Random(17)
+    timestamps = [
+        parse_iso8601(datestring).replace(
+            microsecond=rng.randrange(1_000_000),
+            tzinfo=solution.OFFSET_TIMEZONES[rng.choice((0, 60, 120, -300, -480, 330, 540))],
+        )
+        for datestring in datestrings
+    ]
+    feed = mixed_format_feed(timestamps)
+
+    learning_parser = FormatLearningParser()
+    learning_parser.parse_many(feed)
+    info = learning_parser.learning_info()
+    label = stream.fixed_width_text("Fast path hit ratio:", 40)
+    stream.write(
+        f"{label}{info.hits / len(feed):.2%} "
+        f"({info.switches} switches, {info.fallbacks} fallbacks)\n"
+    )
+
+    write_comparison(
+        stream,
+        baseline="parse_iso8601",
+        candidates={
+            "parse_iso8601": lambda: [parse_iso8601(string) for string in feed],
+            "parse_iso8601_many": lambda: solution.parse_iso8601_many(feed),
+            "FormatLearningParser": lambda: FormatLearningParser().parse_many(feed),
+        },
+        strings_per_run=len(feed),
+    )
+
+
+def benchmark_backend(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Report the backend of `solution.accelerated` and compare it with the pure-Python parser."""
+    label = stream.fixed_width_text("Backend:", 40)
+    if accelerated.BACKEND == "c":
+        stream.write(f"{label}c ({accelerated.parse_ascii.__module__})\n")
+    else:
+        stream.write(f"{label}python (build the C extension with `python -m solution.build`)\n")
+
+    parse_python, parse_accelerated = solution.parse_iso8601, accelerated.parse_iso8601
+    write_comparison(
+        stream,
+        baseline="python",
+        candidates={
+            "python": lambda: [parse_python(string) for string in datestrings],
+            accelerated.BACKEND: lambda: [parse_accelerated(string) for string in datestrings],
+        },
+        strings_per_run=len(datestrings),
+    )
+
+
+def benchmark_validation(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare the validators with catching the exceptions of `parse_iso8601`."""
+    parse_iso8601 = solution.parse_iso8601
+
+    rng = random.Random(19)
+    timestamps = [
+        parse_iso8601(datestring).replace(
+            microsecond=rng.randrange(1_000_000),
+            tzinfo=solution.OFFSET_TIMEZONES[rng.choice((0, 60, 120, -300, -480, 330, 540))],
+        )
+        for datestring in datestrings
+    ]
+    # The outcome of a rejected string is the type of its exception and its message
+    invalid_strings = [
+        timestamp for timestamp, (result, _) in record_test_corpus() if isinstance(result, type)
+    ]
+    corpora = {
+        "valid, YYYY-MM-DDThh:mm:ss": datestrings,
+        "valid, mixed formats": [
+            format_timestamp(timestamp, rng.choice(COMPILED_FORMATS)) for timestamp in timestamps
+        ],
+        "invalid dates": invalid_date_replay(datestrings),
+        "invalid, test_003 rejects": invalid_strings * (len(datestrings) // len(invalid_strings)),
+    }
+
+    def try_parse(strings: typing.List[str]) -> None:
+        for string in strings:
+            try:
+                parse_iso8601(string)
+            except ValueError:
+                pass
+
+    for description, strings in corpora.items():
+        stream.write(f"{description} ({len(strings)} strings):\n")
+        write_comparison(
+            stream,
+            baseline="try: parse_iso8601",
+            candidates={
+                "try: parse_iso8601": lambda: try_parse(strings),
+                "is_valid_iso8601": lambda: [is_valid_iso8601(string) for string in strings],
+                "validate_iso8601_many": lambda: validate_iso8601_many(strings),
+            },
+            strings_per_run=len(strings),
+        )
+
+
+def benchmark_errors(stream: StreamWrapper, datestrings: typing.List[str]) -> None:
+    """Compare error records with collecting exceptions on batches with many invalid strings."""
+    parse_iso8601 = solution.parse_iso8601
+
+    # The outcome of a rejected string is the type of its exception and its message
+    invalid_strings = [
+        timestamp for timestamp, (result, _) in record_test_corpus() if isinstance(result, type)
+    ]
+
+    rng = random.Random(20)
+    for invalid_rate in (0.0, 0.5):
+        batch = [
+            rng.choice(invalid_strings) if rng.random() < invalid_rate else datestring
+            for datestring in datestrings * 10
+        ]
+
+        def collect_exceptions() -> typing.List[typing.Union[datetime.datetime, ValueError]]:
+            results = []
+            for timestamp in batch:
+                try:
+                    results.append(parse_iso8601(timestamp))
+                except ValueError as exception:
+                    results.append(exception)
+            return results
+
+        stream.write(f"{invalid_rate:.0%} invalid strings:\n")
+        write_comparison(
+            stream,
+            baseline="try: parse_iso8601",
+            candidates={
+                "try: parse_iso8601": collect_exceptions,
+                "parse_iso8601_many": lambda: solution.parse_iso8601_many(
+                    batch, raise_errors=False
+                ),
+                "parse_iso8601_records": lambda: parse_iso8601_records(batch),
+            },
+            strings_per_run=len(batch),
+        )
+
+
+BENCHMARKS: typing.Dict[str, Benchmark] = {
+    "batch": benchmark_batch,
+    "fixed-layout": benchmark_fixed_layout,
+    "engines": benchmark_engines,
+    "cache": benchmark_cache,
+    "timezones": benchmark_timezones,
+    "dates": benchmark_dates,
+    "streaming": benchmark_streaming,
+    "buffers": benchmark_buffers,
+    "columnar": benchmark_columnar,
+    "vectorized": benchmark_vectorized,
+    "scaling": benchmark_scaling,
+    "threads": benchmark_threads,
+    "asyncio": benchmark_asyncio,
+    "compiled": benchmark_compiled,
+    "learning": benchmark_learning,
+    "backend": benchmark_backend,
+    "validation": benchmark_validation,
+    "errors": benchmark_errors,
+}
@@ -0,0 +1,237 @@
+import json
+import math
+import statistics
+import sys
+import typing
+
+from testsuite.result import StreamWrapper
+
+
+# The environment details that make a comparison of timings questionable when they differ
+ENVIRONMENT_KEYS = (
+    "python", "implementation", "machine", "cpu_count", "parser", "backend", "engine"
+)
+
+
+class Comparison(typing.NamedTuple):
+    """The comparison of the timing samples of one benchmark in two runs."""
+
+    name: str
+    old_median: float
+    new_median: float
+    # The relative change of the median; positive if the new run is slower
+    change: float
+    # The one-sided p-value of the new run being slower, or faster for an improvement
+    p_value: float
+    verdict: str
+
+
+def load_results(path: str) -> typing.Dict[str, typing.Any]:
+    """Load the JSON results saved by `python -m testsuite --json PATH`."""
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def slower_p_value(old: typing.Sequence[float], new: typing.Sequence[float]) -> float:
+    """
+    Return the one-sided p-value of the samples in `new` tending to be larger than those in `old`.
+
+    This is the Mann-Whitney U test with the normal approximation, corrected for ties and
+    continuity. It doesn't assume the timings are normally distributed, which they rarely are, and
+    it's robust against the occasional outlier. It needs a handful of samples on both sides.
+    """
+    old_size, new_size = len(old), len(new)
+    size = old_size + new_size
+    values = sorted([(value, False) for value in old] + [(value, True) for value in new])
+
+    # Tied values share the average of their ranks
+    rank_sum = 0.0
+    tie_correction = 0
+    start = 0
+    while start < size:
+        end = start
+        while end < size and values[end][0] == values[start][0]:
+            end += 1
+
+        ties = end - start
+        rank = (start + 1 + end) / 2
+        rank_sum += rank * sum(is_new for _, is_new in values[start:end])
+        tie_correction += ties ** 3 - ties
+        start = end
+
+    u_statistic = rank_sum - new_size * (new_size + 1) / 2
+    variance = old_size * new_size / 12 * ((size + 1) - tie_correction / (size * (size - 1)))
+    if variance <= 0:
+        # All samples are equal
+        return 1.0
+
+    z_score = (u_statistic - old_size * new_size / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z_score / math.sqrt(2))
+
+
+def compare_samples(
+    name: str,
+    old: typing.Dict[str, typing.Any],
+    new: typing.Dict[str, typing.Any],
+    alpha: float,
+    threshold: float,
+) -> Comparison:
+    """
+    Compare the timing samples of a benchmark in two runs.
+
+    A difference is only reported if it's statistically significant at the `alpha` level and the
+    median changed by more than the `threshold`, so tiny but consistent differences don't fail a
+    pipeline.
+    """
+    old_samples, new_samples = old["samples"], new["samples"]
+    old_median, new_median = statistics.median(old_samples), statistics.median(new_samples)
+    change = new_median / old_median - 1
+
+    if old["kind"] != new["kind"]:
+        return Comparison(name, old_median, new_median, change, math.nan, "incomparable")
+    if min(len(old_samples), len(new_samples)) < 3:
+        return Comparison(name, old_median, new_median, change, math.nan, "too few samples")
+
+    if change > 0:
+        p_value = slower_p_value(old_samples, new_samples)
+        verdict = "REGRESSION" if p_value < alpha and change > threshold else "unchanged"
+    else:
+        p_value = slower_p_value(new_samples, old_samples)
+        verdict = "improvement" if p_value < alpha and -change > threshold else "unchanged"
+
+    return Comparison(name, old_median, new_median, change, p_value, verdict)
+
+
+def compare_results(
+    old: typing.Dict[str, typing.Any],
+    new: typing.Dict[str, typing.Any],
+    alpha: float = 0.01,
+    threshold: float = 0.05,
+) -> typing.List[Comparison]:
+    """Compare the benchmark and every corpus that were measured in both runs."""
+    comparisons = []
+    if old.get("benchmark") and new.get("benchmark"):
+        comparisons.append(
+            compare_samples("benchmark", old["benchmark"], new["benchmark"], alpha, threshold)
+        )
+
+    for name, measurement in new.get("corpora", {}).items():
+        if name in old.get("corpora", {}):
+            old_measurement = old["corpora"][name]
+            comparisons.append(
+                compare_samples(f"corpus {name}", old_measurement, measurement, alpha, threshold)
+            )
+
+    return comparisons
+
+
+def failed_tests(
+    old: typing.Dict[str, typing.Any], new: typing.Dict[str, typing.Any]
+) -> typing.List[str]:
+    """Return the descriptions of the tests that passed in the old run but not in the new one."""
+    failed = []
+    for section, tests in old.get("tests", {}).items():
+        for description, result in tests.items():
+            new_result = new.get("tests", {}).get(section, {}).get(description)
+            if result["passed"] and not (new_result and new_result["passed"]):
+                failed.append(f"{section}: {description}")
+
+    return failed
+
+
+def paired_targets(
+    old: typing.Dict[str, typing.Any], new: typing.Dict[str, typing.Any]
+) -> typing.List[typing.Tuple[str, typing.Dict[str, typing.Any], typing.Dict[str, typing.Any]]]:
+    """
+    Pair up the results of the targets of two runs, by the name of their target.
+
+    A run of several targets saves a document per target under `targets`. If both runs have a
+    single target, they're compared even if the targets differ, like an old and a new version of a
+    parser; the environment warnings point out the difference.
+    """
+    old_targets, new_targets = target_documents(old), target_documents(new)
+    if len(old_targets) == len(new_targets) == 1:
+        (name, new_results), = new_targets.items()
+        return [(name, *old_targets.values(), new_results)]
+
+    return [
+        (name, old_targets[name], new_results)
+        for name, new_results in new_targets.items()
+        if name in old_targets
+    ]
+
+
+def target_documents(results: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """Return the results of each target of a run, by the name of the target."""
+    if "targets" in results:
+        return results["targets"]
+    return {results.get("environment", {}).get("parser", "parse_iso8601"): results}
+
+
+def run_compare(
+    old_path: str,
+    new_path: str,
+    alpha: float = 0.01,
+    threshold: float = 0.05,
+    stream: typing.Optional[typing.TextIO] = None,
+) -> int:
+    """
+    Compare two saved runs, write a report, and return 1 if there are regressions, or 0 otherwise.
+
+    A regression is a benchmark or corpus that got significantly slower (see `compare_samples`), or
+    a test that passed in the old run and doesn't pass in the new one.
+    """
+    stream = StreamWrapper(stream or sys.stderr, max_width=100)
+    old_results, new_results = load_results(old_path), load_results(new_path)
+
+    stream.write_section_header("Benchmark Comparison")
+    stream.writeln(f"Old: {old_path}")
+    stream.writeln(f"New: {new_path}")
+
+    regressions, failed = [], []
+    if not (targets := paired_targets(old_results, new_results)):
+        stream.writeln()
+        stream.writeln("The runs have no targets in common.")
+
+    for target, old, new in targets:
+        stream.writeln()
+        if len(targets) > 1:
+            stream.writeln(f"Target: {target}")
+        old_environment, new_environment = old.get("environment", {}), new.get("environment", {})
+        for key in ENVIRONMENT_KEYS:
+            if old_environment.get(key) != new_environment.get(key):
+                stream.writeln(
+                    f"Warning: the {key} differs: "
+                    f"{old_environment.get(key)!r} -> {new_environment.get(key)!r}"
+                )
+
+        comparisons = compare_results(old, new, alpha, threshold)
+        stream.writeln(
+            f"{'Measurement':<28}{'Old median':>14}{'New median':>14}{'Change':>10}"
+            f"{'p-value':>10}  Verdict"
+        )
+        stream.write_separator("-")
+        for comparison in comparisons:
+            stream.writeln(
+                f"{comparison.name[:27]:<28}{comparison.old_median:>13.10f}s"
+                f"{comparison.new_median:>13.10f}s{comparison.change:>+10.1%}"
+                f"{comparison.p_value:>10.4f}  {comparison.verdict}"
+            )
+        if not comparisons:
+            stream.writeln("The runs have no measurements in common.")
+
+        regressions += [
+            comparison for comparison in comparisons if comparison.verdict == "REGRESSION"
+        ]
+        prefix = f"{target}: " if len(targets) > 1 else ""
+        failed += [f"{prefix}{description}" for description in failed_tests(old, new)]
+
+    stream.writeln()
+    for description in failed:
+        stream.writeln(f"Test no longer passes: {description}")
+    stream.writeln(
+        f"{len(regressions)} significant regression(s) at alpha={alpha} "
+        f"and a threshold of {threshold:.0%}, {len(failed)} failing test(s)"
+    )
+
+    return 1 if regressions or failed else 0
@@ -0,0 +1,179 @@
+import calendar
+import os
+import random
+import typing
+
+
+CORPORA_DIRECTORY = "testsuite/corpora"
+
+# Every corpus is generated with its own seed, so changing one generator leaves the others alone
+CORPUS_SIZE = 1000
+CORPUS_SEED = 22
+
+# The offsets we use for timezone designators, in minutes
+OFFSETS = (0, 60, 120, 180, -180, -240, -300, -420, -480, 330, 345, 540, 570, 600, 780)
+
+Generator = typing.Callable[[random.Random], str]
+
+
+def random_fields(rng: random.Random) -> typing.Dict[str, str]:
+    """Return the zero-padded fields of a random valid date and time."""
+    year, month = rng.randint(1583, 2500), rng.randint(1, 12)
+    day = rng.randint(1, calendar.monthrange(year, month)[1])
+    return {
+        "year": f"{year:04}",
+        "month": f"{month:02}",
+        "day": f"{day:02}",
+        "hour": f"{rng.randrange(24):02}",
+        "minute": f"{rng.randrange(60):02}",
+        "second": f"{rng.randrange(60):02}",
+    }
+
+
+def random_date(rng: random.Random, truncated: bool) -> str:
+    """Return a random `YYYY-MM-DD` or `YYYYMMDD` date."""
+    fields = random_fields(rng)
+    separator = "" if truncated else "-"
+    return separator.join((fields["year"], fields["month"], fields["day"]))
+
+
+def random_time(rng: random.Random, truncated: bool, units: int) -> str:
+    """Return a random `hh`, `hh:mm`, or `hh:mm:ss` time, or its truncated equivalent."""
+    fields = random_fields(rng)
+    separator = "" if truncated else ":"
+    return separator.join((fields["hour"], fields["minute"], fields["second"])[:units])
+
+
+def random_fraction(rng: random.Random) -> str:
+    """Return a random fraction with one to six decimals."""
+    decimals = rng.randint(1, 6)
+    return "." + "".join(rng.choice("0123456789") for _ in range(decimals))
+
+
+def random_timezone(rng: random.Random, truncated: bool) -> str:
+    """Return a random `Z`, `±hh:mm`, `±hhmm`, or `±hh` timezone designator."""
+    if rng.random() < 0.2:
+        return "Z"
+
+    offset = rng.choice(OFFSETS)
+    sign = "-" if offset < 0 else "+"
+    hours, minutes = divmod(abs(offset), 60)
+    if not minutes and rng.random() < 0.3:
+        return f"{sign}{hours:02}"
+    separator = "" if truncated else ":"
+    return f"{sign}{hours:02}{separator}{minutes:02}"
+
+
+def date_only(rng: random.Random) -> str:
+    """A date without a time, extended or truncated."""
+    return random_date(rng, truncated=rng.random() < 0.5)
+
+
+def truncated(rng: random.Random) -> str:
+    """A truncated date with a truncated `hh`, `hhmm`, or `hhmmss` time."""
+    return f"{random_date(rng, True)}T{random_time(rng, True, rng.randint(1, 3))}"
+
+
+def fractional(rng: random.Random) -> str:
+    """A date and time with a fraction of its smallest unit, extended or truncated."""
+    is_truncated = rng.random() < 0.3
+    time = random_time(rng, is_truncated, rng.choice((1, 2, 3, 3, 3)))
+    return f"{random_date(rng, is_truncated)}T{time}{random_fraction(rng)}"
+
+
+def timezone_offset(rng: random.Random) -> str:
+    """A date and time with a timezone designator, mostly with seconds."""
+    is_truncated = rng.random() < 0.2
+    time = random_time(rng, is_truncated, rng.choice((1, 2, 3, 3, 3, 3)))
+    return f"{random_date(rng, is_truncated)}T{time}{random_timezone(rng, is_truncated)}"
+
+
+def mixed(rng: random.Random) -> str:
+    """Any of the valid shapes, weighted like a typical feed: mostly `YYYY-MM-DDThh:mm:ss`."""
+    shape = rng.random()
+    if shape < 0.4:
+        return f"{random_date(rng, False)}T{random_time(rng, False, 3)}"
+    if shape < 0.55:
+        return date_only(rng)
+    if shape < 0.7:
+        return truncated(rng)
+    if shape < 0.85:
+        return fractional(rng)
+    return timezone_offset(rng)
+
+
+# Ways to break a valid timestamp: invalid values in a valid format, and invalid formats
+INVALID_REPLACEMENTS = (
+    # Invalid values
+    lambda string: string[:5] + "13" + string[7:],
+    lambda string: string[:8] + "32" + string[10:],
+    lambda string: string[:5] + "02-30" + string[10:],
+    lambda string: string[:11] + "24" + string[13:],
+    lambda string: string[:14] + "60" + string[16:],
+    lambda string: string + "+24:00",
+    # Invalid formats
+    lambda string: string.replace("-", "/"),
+    lambda string: string.replace("T", " "),
+    lambda string: string[:4] + string[5:],
+    lambda string: string + ".1234567",
+    lambda string: string + "abc",
+    lambda string: string[:-1],
+)
+
+
+def invalid_heavy(rng: random.Random) -> str:
+    """Three quarters of invalid `YYYY-MM-DDThh:mm:ss` timestamps, broken in different ways."""
+    timestamp = f"{random_date(rng, False)}T{random_time(rng, False, 3)}"
+    if rng.random() < 0.25:
+        return timestamp
+    return rng.choice(INVALID_REPLACEMENTS)(timestamp)
+
+
+CORPUS_GENERATORS: typing.Dict[str, Generator] = {
+    "date-only": date_only,
+    "truncated": truncated,
+    "fractional": fractional,
+    "tz-offset": timezone_offset,
+    "mixed": mixed,
+    "invalid-heavy": invalid_heavy,
+}
+
+
+def generate_corpus(
+    name: str, size: int = CORPUS_SIZE, seed: int = CORPUS_SEED
+) -> typing.List[str]:
+    """Generate the named corpus; the same name, size, and seed always give the same strings."""
+    # Seeding with a string is reproducible across runs, unlike seeding with the `hash` of a string
+    rng = random.Random(f"{seed}:{name}")
+    generator = CORPUS_GENERATORS[name]
+    return [generator(rng) for _ in range(size)]
+
+
+def corpus_path(name: str, directory: str = CORPORA_DIRECTORY) -> str:
+    """Return the path of the stored corpus with this name."""
+    return os.path.join(directory, f"{name}.txt")
+
+
+def write_corpora(directory: str = CORPORA_DIRECTORY) -> typing.List[str]:
+    """Generate all corpora, store them with one string per line, and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name in CORPUS_GENERATORS:
+        path = corpus_path(name, directory)
+        with open(path, "w", encoding="utf-8", newline="\n") as corpus:
+            corpus.writelines(f"{string}\n" for string in generate_corpus(name))
+        paths.append(path)
+
+    return paths
+
+
+def load_corpus(name: str, directory: str = CORPORA_DIRECTORY) -> typing.List[str]:
+    """Load a stored corpus, one string per line, or generate it if it hasn't been stored."""
+    if name not in CORPUS_GENERATORS:
+        raise KeyError(f"unknown corpus: {name!r}")
+
+    try:
+        with open(corpus_path(name, directory), "r", encoding="utf-8") as corpus:
+            return [string.rstrip("\n") for string in corpus]
+    except FileNotFoundError:
+        return generate_corpus(name)
@@ -0,0 +1,272 @@
+import concurrent.futures
+import contextlib
+import math
+import os
+import pickle
+import typing
+import unittest
+
+import test_qualifier
+from testsuite.targets import load_target, testing_target
+
+
+# An exception of a subtest or a test, without its traceback, which can't be sent between processes
+Failure = typing.Optional[BaseException]
+
+# Below this many test cases, the tests run in this process: they take less than about 0.1s, which
+# is not much more than it takes to start the worker processes and send the records back
+MIN_PARALLEL_TEST_CASES = 5_000
+
+# The test cases are split into this many shards per worker, so a worker that gets the slow test
+# cases doesn't keep the others waiting
+SHARDS_PER_WORKER = 4
+
+Selector = typing.Callable[[typing.Sequence[typing.Any]], typing.Sequence[typing.Any]]
+
+
+class TestRecord(typing.NamedTuple):
+    """The outcome of a test method that ran in a worker process, to replay in the main process."""
+
+    # The parameters of each subtest, in the order they ran, with the exception it failed with
+    subtests: typing.List[typing.Tuple[typing.Dict[str, typing.Any], Failure]]
+    # The errors and failures of the test method outside of its subtests, like `("Error", error)`
+    outcomes: typing.List[typing.Tuple[str, BaseException]]
+
+
+class ReplayedSubTest(typing.NamedTuple):
+    """A stand-in for the subtest of a `TestRecord`, with the parameters `StreamWrapper` shows."""
+
+    test_id: str
+    params: typing.Dict[str, typing.Any]
+
+    def __str__(self) -> str:
+        return f"{self.test_id} {self.params!r}"
+
+
+class ReplayedException(Exception):
+    """A stand-in for an exception that can't be pickled, which keeps the representation of it."""
+
+    def __init__(self, representation: str) -> None:
+        super().__init__(representation)
+        self.representation = representation
+
+    def __repr__(self) -> str:
+        return self.representation
+
+
+def portable(exception: BaseException) -> BaseException:
+    """Return the exception if it survives pickling, or a stand-in with the same representation."""
+    try:
+        pickle.loads(pickle.dumps(exception))
+    except Exception:
+        return ReplayedException(repr(exception))
+    return exception
+
+
+class RecordingResult(unittest.TestResult):
+    """A test result that records the outcome of a single test method as a `TestRecord`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.record = TestRecord(subtests=[], outcomes=[])
+
+    def addSubTest(
+        self,
+        test: unittest.TestCase,
+        subtest: unittest.TestCase,
+        outcome: typing.Optional[typing.Tuple[typing.Any, BaseException, typing.Any]],
+    ) -> None:
+        """Record the parameters of a subtest and the exception it failed with, if any."""
+        failure = portable(outcome[1]) if outcome else None
+        self.record.subtests.append((dict(subtest.params), failure))
+
+    def addError(self, test: unittest.TestCase, err: typing.Any) -> None:
+        """Record an error of the test method outside of its subtests."""
+        self.record.outcomes.append(("Error", portable(err[1])))
+
+    def addFailure(self, test: unittest.TestCase, err: typing.Any) -> None:
+        """Record a failure of the test method outside of its subtests."""
+        self.record.outcomes.append(("Failure", portable(err[1])))
+
+
+class TestSlice(typing.NamedTuple):
+    """The test cases `start` up to `stop` of a test method, or all of it if `stop` is `None`."""
+
+    test_id: str
+    start: int = 0
+    stop: typing.Optional[int] = None
+
+
+@contextlib.contextmanager
+def selecting_test_cases(select: Selector) -> typing.Iterator[None]:
+    """Let the test methods of `test_qualifier` run the test cases `select` returns."""
+    original = test_qualifier.iter_test_cases
+    test_qualifier.iter_test_cases = select
+    try:
+        yield
+    finally:
+        test_qualifier.iter_test_cases = original
+
+
+def count_test_cases(test: unittest.TestCase) -> int:
+    """Count the test cases of a test method, by running it without any of them."""
+    counts = []
+
+    def count(test_cases: typing.Sequence[typing.Any]) -> typing.Sequence[typing.Any]:
+        counts.append(len(test_cases))
+        return ()
+
+    with selecting_test_cases(count):
+        test(unittest.TestResult())
+
+    return sum(counts)
+
+
+def run_slice(test_slice: TestSlice) -> TestRecord:
+    """Run the test cases of a slice of a test method and record their outcome."""
+    test = unittest.defaultTestLoader.loadTestsFromName(test_slice.test_id)
+    result = RecordingResult()
+    if test_slice.stop is None:
+        test(result)
+        return result.record
+
+    # A test method can have more than one loop over test cases; we number them across the loops
+    seen = 0
+
+    def select(test_cases: typing.Sequence[typing.Any]) -> typing.Sequence[typing.Any]:
+        nonlocal seen
+        start, seen = seen, seen + len(test_cases)
+        return test_cases[max(test_slice.start - start, 0):max(test_slice.stop - start, 0)]
+
+    with selecting_test_cases(select):
+        test(result)
+
+    return result.record
+
+
+def run_shard(target_name: str, shard: typing.List[TestSlice]) -> typing.List[TestRecord]:
+    """Run the slices of test methods of a shard against the named target, in a worker process."""
+    with testing_target(load_target(target_name)):
+        return [run_slice(test_slice) for test_slice in shard]
+
+
+def split_test_cases(
+    counts: typing.List[typing.Tuple[str, int]], shards: int
+) -> typing.List[typing.List[TestSlice]]:
+    """
+    Split the test cases of the test methods into `shards` contiguous ranges of about equal size.
+
+    The `counts` are the test ids and the number of test cases of the test methods, in order. A
+    shard is a list of slices of consecutive test methods, so a test method can be split between
+    shards. Test methods without test cases are run whole, in the shard they fall in.
+    """
+    size = math.ceil(sum(count for _, count in counts) / shards) or 1
+    split = [[]]
+    filled = 0
+    for test_id, count in counts:
+        if not count:
+            split[-1].append(TestSlice(test_id))
+            continue
+
+        start = 0
+        while start < count:
+            if filled == size:
+                split.append([])
+                filled = 0
+
+            stop = min(count, start + size - filled)
+            split[-1].append(TestSlice(test_id, start, stop))
+            filled += stop - start
+            start = stop
+
+    return [shard for shard in split if shard]
+
+
+def merge_records(records: typing.Iterable[TestRecord]) -> TestRecord:
+    """
+    Merge the records of the slices of a test method, in order.
+
+    The code of a test method outside of its test cases runs in every slice, so an error there is
+    recorded by each of them; we keep one of each.
+    """
+    merged = TestRecord(subtests=[], outcomes=[])
+    seen = set()
+    for record in records:
+        merged.subtests.extend(record.subtests)
+        for kind, exception in record.outcomes:
+            if (key := (kind, type(exception), repr(exception))) not in seen:
+                seen.add(key)
+                merged.outcomes.append((kind, exception))
+
+    return merged
+
+
+def replay(result: unittest.TestResult, test: unittest.TestCase, record: TestRecord) -> None:
+    """Report the recorded outcome of a test method to the result, as if it ran in this process."""
+    result.startTest(test)
+    for params, failure in record.subtests:
+        outcome = (type(failure), failure, None) if failure is not None else None
+        result.addSubTest(test, ReplayedSubTest(test.id(), params), outcome)
+    for kind, exception in record.outcomes:
+        getattr(result, f"add{kind}")(test, (type(exception), exception, None))
+    result.stopTest(test)
+
+
+def iter_tests(suite: unittest.TestSuite) -> typing.Iterator[unittest.TestCase]:
+    """Yield the test methods of a test suite and its nested suites, in the order they run."""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        else:
+            yield test
+
+
+def run_parallel(
+    suite: unittest.TestSuite,
+    result: unittest.TestResult,
+    target_name: str,
+    workers: int,
+) -> None:
+    """
+    Run the test cases of a suite in a pool of `workers` processes and report them in order.
+
+    The unit of work is a test case: we count the test cases of every test method, split them
+    into contiguous shards with `split_test_cases`, and run each shard in a worker, which records
+    the parameters and exceptions of the subtests. We merge the records of each test method and
+    replay them in the order of the suite, so the `results` of a `QualifierTestResult` and the
+    output of its stream are the same as those of a sequential run; the tracebacks of the failures
+    are lost, but the output doesn't show them.
+
+    A suite with fewer than `MIN_PARALLEL_TEST_CASES` test cases runs in this process instead, and
+    so does any suite on a machine with a single processor, where the workers can only take turns.
+    """
+    target = load_target(target_name)
+    tests = list(iter_tests(suite))
+    with testing_target(target):
+        counts = [(test.id(), count_test_cases(test)) for test in tests]
+
+        workers = min(workers, os.cpu_count() or 1)
+        if workers < 2 or sum(count for _, count in counts) < MIN_PARALLEL_TEST_CASES:
+            suite(result)
+            return
+
+    shards = split_test_cases(counts, workers * SHARDS_PER_WORKER)
+    slices = {test.id(): [] for test in tests}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        shard_records = executor.map(run_shard, [target_name] * len(shards), shards)
+
+        # The shards are in the order of the suite, so a test method is complete once we've seen
+        # the records of the shard with its last slice
+        replayed = 0
+        for shard, records in zip(shards, shard_records):
+            for test_slice, record in zip(shard, records):
+                slices[test_slice.test_id].append(record)
+
+            last_id = shard[-1].test_id
+            while replayed < len(tests) and tests[replayed].id() != last_id:
+                test = tests[replayed]
+                replay(result, test, merge_records(slices.pop(test.id())))
+                replayed += 1
+
+        for test in tests[replayed:]:
+            replay(result, test, merge_records(slices.pop(test.id())))
@@ -1,15 +1,28 @@
 import datetime
 import io
+import json
+import os
+import platform
 import sys
 import timeit
 import typing
 import unittest
 
-from qualifier import parse_iso8601
-
 import test_qualifier
 
+from testsuite.benchmarks import BENCHMARKS, load_benchmark_strings
+from testsuite.corpora import load_corpus
+from testsuite.parallel import run_parallel
 from testsuite.result import QualifierTestResult, StreamWrapper
+from testsuite.targets import DEFAULT_TARGET, Target, load_target, testing_target
+from testsuite.timing import (
+    BenchmarkSettings,
+    measure_passes,
+    measure_strings,
+    measurement,
+    reject_errors,
+    summarize,
+)
 
 
 class QualifierTestRunner:
@@ -24,6 +37,11 @@ class QualifierTestRunner:
         resultclass: typing.Optional[typing.Type[unittest.TestResult]] = None,
         console_width: int = 100,
         title: str = "Python Discord Winter Code Jam: Qualifier Test Suite",
+        benchmark_settings: typing.Optional[BenchmarkSettings] = None,
+        statistical: bool = False,
+        corpora: typing.Sequence[str] = (),
+        target: typing.Optional[Target] = None,
+        workers: int = 1,
         **kwargs,
     ) -> None:
         if stream is None:
@@ -36,6 +54,24 @@ class QualifierTestRunner:
         self.verbosity = verbosity
         self.title = title
 
+        # The parser the tests and the benchmarks call
+        self.target = target or load_target(DEFAULT_TARGET)
+        # The number of processes the tests run in; see `testsuite.parallel.run_parallel`
+        self.workers = workers
+
+        # The settings of the statistical benchmark, which runs instead of the quick benchmark if
+        # `statistical` is set, and of the corpus benchmark
+        self.benchmark_settings = benchmark_settings or BenchmarkSettings()
+        self.statistical = statistical
+        # The names of the corpora to report the throughput of after the benchmark
+        self.corpora = corpora
+
+        # The results of the tests and the measurements of the benchmarks, as they're saved as JSON
+        self.results = {}
+        self.benchmark_results = {}
+        self.corpus_results = {}
+        self.duration = None
+
         if resultclass is not None:
             self.resultclass = resultclass
 
@@ -51,6 +87,7 @@ class QualifierTestRunner:
         self.stream.writeln(
             f"Date: {datetime.datetime.utcnow().strftime(r'%Y-%m-%d %H:%M:%S')} UTC"
         )
+        self.stream.writeln(f"Target: {self.target.name}")
         self.stream.writeln()
 
     def write_footer(self, result: unittest.TestResult, duration: float) -> None:
@@ -65,6 +102,8 @@ class QualifierTestRunner:
         ):
             try:
                 self.run_benchmark()
+                if self.corpora:
+                    self.run_corpus_benchmark(self.corpora)
             except Exception as e:
                 self.stream.writeln(f"Something went wrong while running the benchmark: {e!r}")
                 self.stream.writeln("Did your `parse_iso8601` function fail on one of the strings?")
@@ -81,39 +120,265 @@ class QualifierTestRunner:
         # Record the start time
         start = timeit.default_timer()
 
-        # Pass the TestResult instance to the test suite to run the tests
-        test(result)
+        # Pass the TestResult instance to the test suite to run the tests against our target
+        if self.workers > 1:
+            run_parallel(test, result, self.target.name, self.workers)
+        else:
+            with testing_target(self.target):
+                test(result)
 
         # Record the end time
         duration = timeit.default_timer() - start
+        self.duration = duration
+        self.results = result.results
 
         self.write_footer(result, duration)
         return result.results
 
     def run_benchmark(self) -> None:
-        """Run a benchmark on the `parse_iso8601` function."""
+        """Run a benchmark on the `parse_iso8601` function of the target."""
+        if self.statistical:
+            self.run_statistical_benchmark(self.benchmark_settings)
+            return
+
         with open("testsuite/benchmark_strings.txt", "r", encoding="utf-8") as datestrings:
             datestrings = [datestring.rstrip("\n") for datestring in datestrings]
 
+        parse_iso8601 = self.target.parser
         duration = 0.0
+        samples = []
         for run in range(1, 101):
             start = timeit.default_timer()
             for datestring in datestrings:
                 parse_iso8601(datestring)
-            duration += timeit.default_timer() - start
+            samples.append((timeit.default_timer() - start) / len(datestrings))
+            duration += samples[-1] * len(datestrings)
             if duration > 5:
                 break
 
+        self.benchmark_results = measurement("passes", samples)
         cases_tested = run * len(datestrings)
         self.stream.write(f"Number of strings:  {cases_tested}\n")
         self.stream.write(f"Total time:         {duration:.10f}s\n")
         self.stream.write(f"Average time:       {duration/cases_tested:.10f}s\n")
 
+    def run_statistical_benchmark(self, settings: BenchmarkSettings, slowest: int = 5) -> None:
+        """
+        Run a benchmark on the `parse_iso8601` function and report the distribution of its timings.
+
+        After a few warmup passes, we take a number of timing samples of each string (see
+        `testsuite.timing.measure_strings`). We report the distribution of all samples, the number
+        of outliers within the samples of each string, and the `slowest` strings by their median.
+        """
+        datestrings = load_benchmark_strings()
+        samples = measure_strings(self.target.parser, datestrings, settings)
+        summaries = [summarize(string_samples) for string_samples in samples]
+        overall = summarize([sample for string_samples in samples for sample in string_samples])
+        outliers = sum(summary.outliers for summary in summaries)
+
+        # We save the median of each string; they're compared as a distribution by `compare`
+        self.benchmark_results = measurement("strings", [summary.median for summary in summaries])
+        self.benchmark_results.update(settings=settings._asdict(), outliers=outliers)
+
+        gc_state = "disabled" if settings.disable_gc else "enabled"
+        self.stream.write(f"Number of strings:  {len(datestrings)}\n")
+        self.stream.write(
+            f"Samples:            {settings.repeats} per string, {settings.number} calls each, "
+            f"after {settings.warmup} warmup passes (GC {gc_state})\n"
+        )
+        self.stream.write(f"Median time:        {overall.median:.10f}s\n")
+        self.stream.write(f"p95 time:           {overall.p95:.10f}s\n")
+        self.stream.write(f"p99 time:           {overall.p99:.10f}s\n")
+        self.stream.write(f"Standard deviation: {overall.stdev:.10f}s\n")
+        self.stream.write(
+            f"Outliers:           {outliers} of {overall.samples} samples "
+            f"({outliers / overall.samples:.2%})\n"
+        )
+
+        self.stream.writeln()
+        self.stream.write("Slowest strings by their median time, in microseconds:\n")
+        ranking = sorted(range(len(datestrings)), key=lambda index: summaries[index].median)
+        for index in reversed(ranking[-slowest:]):
+            summary = summaries[index]
+            label = self.stream.fixed_width_text(f"{datestrings[index]!r}:", 24)
+            self.stream.write(
+                f"{label}median {summary.median * 1e6:.3f}, p95 {summary.p95 * 1e6:.3f}, "
+                f"p99 {summary.p99 * 1e6:.3f}, stdev {summary.stdev * 1e6:.3f}, "
+                f"{summary.outliers} outliers\n"
+            )
+
+    def run_corpus_benchmark(self, names: typing.Iterable[str]) -> None:
+        """
+        Report the throughput of the `parse_iso8601` function on each of the named corpora.
+
+        Each corpus exercises different formats (see `testsuite.corpora`), so a speedup on one
+        format can't hide a slowdown on another. We take a timing sample of each pass over the
+        corpus, with the benchmark settings: the average time per string of that pass. We report
+        the median and the 95th percentile of those averages, not percentiles of the individual
+        strings, which `run_statistical_benchmark` reports. Invalid strings are expected to raise a
+        `ValueError`, which is part of the measured time.
+        """
+        settings = self.benchmark_settings
+        parser = reject_errors(self.target.parser)
+
+        self.stream.writeln()
+        self.stream.write(
+            f"Throughput per corpus ({settings.repeats} passes, median and p95 of the average time "
+            f"per string of a pass):\n"
+        )
+        for name in names:
+            corpus = load_corpus(name)
+            rejected = sum(isinstance(parser(string), ValueError) for string in corpus)
+            samples = measure_passes(parser, corpus, settings)
+            summary = summarize(samples)
+
+            self.corpus_results[name] = measurement("passes", samples)
+            self.corpus_results[name].update(strings=len(corpus), invalid=rejected)
+
+            label = self.stream.fixed_width_text(f"{name} ({len(corpus)}, {rejected} invalid):", 34)
+            self.stream.write(
+                f"{label}{1 / summary.median:>12,.0f} strings/s, "
+                f"{summary.median:.10f}s (p95 {summary.p95:.10f}s)\n"
+            )
+
+    def environment(self) -> typing.Dict[str, typing.Any]:
+        """Describe the environment of this run, so results of different runs can be compared."""
+        # The parser module may report its backend, like `solution.accelerated` does
+        parser_module = sys.modules.get(getattr(self.target.parser, "__module__", None))
+        return {
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "parser": self.target.name,
+            "backend": getattr(parser_module, "BACKEND", "python"),
+            "engine": os.environ.get("ISO8601_PARSER_ENGINE", "regex"),
+        }
+
+    def results_document(self) -> typing.Dict[str, typing.Any]:
+        """
+        Return the test results and the benchmark measurements of this run as a JSON document.
+
+        The tests are the nested dictionary `QualifierTestResult` builds. Each measurement contains
+        its timing samples, so `python -m testsuite compare` can test the difference between two
+        runs for significance.
+        """
+        return {
+            "environment": self.environment(),
+            "duration": self.duration,
+            "tests": self.results,
+            "benchmark": self.benchmark_results,
+            "corpora": self.corpus_results,
+        }
+
+    def run_solution_benchmarks(self, names: typing.Iterable[str]) -> None:
+        """Run the named benchmarks of the optimized APIs in the example solution."""
+        datestrings = load_benchmark_strings()
+        for name in names:
+            benchmark = BENCHMARKS[name]
+            self.stream.write_section_header(f"Solution Benchmark: {name}")
+            benchmark(self.stream, datestrings)
+
+
+def write_target_comparison(
+    stream: StreamWrapper, runners: typing.Sequence[QualifierTestRunner]
+) -> None:
+    """
+    Write the test results and the benchmark timings of several targets side by side.
+
+    The throughput and the latencies come from the measurements of the benchmark of each target:
+    the time per string of each pass, or the median time of each string for a statistical
+    benchmark. A target without measurements didn't pass the basic requirements.
+    """
+    stream.write_section_header("Target Comparison")
+    stream.writeln(
+        f"{'Target':<40}{'Tests':>12}{'Strings/s':>16}{'Median (us)':>16}{'p95 (us)':>16}"
+    )
+    stream.write_separator("-")
+    for runner in runners:
+        tests = [test for section in runner.results.values() for test in section.values()]
+        passed = sum(test["passed"] for test in tests)
+        label = stream.fixed_width_text(runner.target.name, 40)
+        if "median" in (benchmark := runner.benchmark_results):
+            stream.writeln(
+                f"{label}{f'{passed}/{len(tests)}':>12}{1 / benchmark['median']:>16,.0f}"
+                f"{benchmark['median'] * 1e6:>16.3f}{benchmark['p95'] * 1e6:>16.3f}"
+            )
+        else:
+            stream.writeln(f"{label}{f'{passed}/{len(tests)}':>12}{'-':>16}{'-':>16}{'-':>16}")
+
+    corpora = list(runners[0].corpora)
+    if not corpora:
+        return
 
-def run_testsuite() -> None:
-    """Run an ascii-based test suite."""
+    # All six corpora still fit next to a shortened target name within the console width
+    width = max(28, stream.max_width - 12 * len(corpora))
+    stream.writeln()
+    stream.writeln("Throughput per corpus, in strings per second:")
+    stream.writeln(f"{'Target':<{width}}" + "".join(f"{name[:11]:>12}" for name in corpora))
+    stream.write_separator("-")
+    for runner in runners:
+        columns = (
+            f"{1 / runner.corpus_results[name]['median']:>12,.0f}"
+            if name in runner.corpus_results else f"{'-':>12}"
+            for name in corpora
+        )
+        stream.writeln(stream.fixed_width_text(runner.target.name, width) + "".join(columns))
+
+
+def run_testsuite(
+    benchmarks: typing.Optional[typing.Iterable[str]] = None,
+    benchmark_settings: typing.Optional[BenchmarkSettings] = None,
+    statistical: bool = False,
+    corpora: typing.Sequence[str] = (),
+    json_path: typing.Optional[str] = None,
+    targets: typing.Sequence[Target] = (),
+    workers: int = 1,
+) -> None:
+    """
+    Run an ascii-based test suite, optionally followed by the named solution benchmarks.
+
+    The tests and the benchmark run against each of the `targets`, or against the `parse_iso8601`
+    function of the qualifier if there are none; several targets are compared side by side at
+    the end. If `statistical` is set, the benchmark of `parse_iso8601` is a statistical benchmark.
+    The throughput of `parse_iso8601` is reported for each of the named `corpora` after the
+    benchmark. Both use the `benchmark_settings`, or the defaults of `BenchmarkSettings`. The
+    results are saved as JSON to `json_path` if it's given, with a document per target if there
+    are several. The tests run in parallel if there's more than one of the `workers`.
+    """
     test_loader = unittest.TestLoader()
     test_loader.sortTestMethodsUsing = None
-    test_suite = test_loader.loadTestsFromModule(test_qualifier)
-    runner = QualifierTestRunner(verbosity=2)
-    runner.run(test_suite)
+
+    runners = []
+    for target in targets or [load_target(DEFAULT_TARGET)]:
+        # A test suite drops its tests once they've run, so every target needs a new one
+        test_suite = test_loader.loadTestsFromModule(test_qualifier)
+        runner = QualifierTestRunner(
+            verbosity=2,
+            benchmark_settings=benchmark_settings,
+            statistical=statistical,
+            corpora=corpora,
+            target=target,
+            workers=workers,
+        )
+        runner.run(test_suite)
+        runners.append(runner)
+
+    if len(runners) > 1:
+        write_target_comparison(runners[0].stream, runners)
+
+    if benchmarks:
+        runners[0].run_solution_benchmarks(benchmarks)
+
+    if json_path:
+        if len(runners) == 1:
+            document = runners[0].results_document()
+        else:
+            document = {
+                "targets": {runner.target.name: runner.results_document() for runner in runners}
+            }
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+            file.write("\n")
@@ -0,0 +1,57 @@
+import contextlib
+import importlib
+import typing
+
+import test_qualifier
+
+
+# The parser the test suite tests if no other target is given: the qualifier submission
+DEFAULT_TARGET = "qualifier:parse_iso8601"
+
+Parser = typing.Callable[[str], typing.Any]
+
+
+class Target(typing.NamedTuple):
+    """A named parser callable to run the test suite and the benchmarks against."""
+
+    # The `module:callable` specification the parser was loaded from
+    name: str
+    parser: Parser
+
+
+def load_target(specification: str) -> Target:
+    """
+    Import the parser of a `module:callable` specification, like `solution.solution:parse_iso8601`.
+
+    The callable may be an attribute of an attribute, like `module:instance.parse`, so a method of
+    a configured parser instance can be a target too. A `ValueError` is raised if the specification
+    is malformed or doesn't refer to a callable; import errors are raised as they are.
+    """
+    module_name, separator, qualname = specification.partition(":")
+    if not (module_name and separator and qualname):
+        raise ValueError(f"expected a `module:callable` target, got {specification!r}")
+
+    parser = importlib.import_module(module_name)
+    for attribute in qualname.split("."):
+        if (parser := getattr(parser, attribute, None)) is None:
+            raise ValueError(f"module {module_name!r} has no attribute {qualname!r}")
+
+    if not callable(parser):
+        raise ValueError(f"{specification!r} is not callable")
+    return Target(specification, parser)
+
+
+@contextlib.contextmanager
+def testing_target(target: Target) -> typing.Iterator[None]:
+    """
+    Let the tests in `test_qualifier` call the parser of the target within the block.
+
+    The tests call the `parse_iso8601` they import from `qualifier`, so they can still be run on
+    their own; we replace that global for the duration of the block and restore it afterwards.
+    """
+    original = test_qualifier.parse_iso8601
+    test_qualifier.parse_iso8601 = target.parser
+    try:
+        yield
+    finally:
+        test_qualifier.parse_iso8601 = original
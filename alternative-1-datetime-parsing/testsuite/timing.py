@@ -0,0 +1,163 @@
+import contextlib
+import gc
+import statistics
+import timeit
+import typing
+
+
+class BenchmarkSettings(typing.NamedTuple):
+    """The settings of a statistical benchmark run."""
+
+    # Passes over all strings before we start measuring, to warm up caches and allocators
+    warmup: int = 3
+    # The number of timing samples we take for each string
+    repeats: int = 30
+    # The number of calls per sample; their average time is the sample
+    number: int = 10
+    # Disable the garbage collector while we measure, so its pauses don't end up in the samples
+    disable_gc: bool = False
+
+
+class TimingSummary(typing.NamedTuple):
+    """The distribution of a set of timing samples, in seconds per call."""
+
+    samples: int
+    median: float
+    p95: float
+    p99: float
+    mean: float
+    stdev: float
+    # The samples outside of Tukey's fences: more than 1.5 IQR below Q1 or above Q3
+    outliers: int
+
+
+def count_outliers(samples: typing.Sequence[float]) -> int:
+    """Count the samples outside of Tukey's fences of the distribution."""
+    first_quartile, _, third_quartile = statistics.quantiles(samples, n=4, method="inclusive")
+    margin = 1.5 * (third_quartile - first_quartile)
+    low, high = first_quartile - margin, third_quartile + margin
+    return sum(1 for sample in samples if sample < low or sample > high)
+
+
+def summarize(samples: typing.Sequence[float]) -> TimingSummary:
+    """Summarize at least two timing samples."""
+    percentiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return TimingSummary(
+        samples=len(samples),
+        median=statistics.median(samples),
+        p95=percentiles[94],
+        p99=percentiles[98],
+        mean=statistics.fmean(samples),
+        stdev=statistics.stdev(samples),
+        outliers=count_outliers(samples),
+    )
+
+
+def measurement(kind: str, samples: typing.Sequence[float]) -> typing.Dict[str, typing.Any]:
+    """
+    Return a JSON-serializable record of the timing samples of a benchmark and their summary.
+
+    The `kind` tells what a sample is: the time per string of a pass over all strings (`passes`),
+    or the median time of a single string (`strings`). Only samples of the same kind can be
+    compared. A single sample can't be summarized, so its record only contains the sample.
+    """
+    record = {"kind": kind, "samples": list(samples)}
+    if len(samples) > 1:
+        summary = summarize(samples)
+        record.update(
+            median=summary.median,
+            p95=summary.p95,
+            p99=summary.p99,
+            mean=summary.mean,
+            stdev=summary.stdev,
+            outliers=summary.outliers,
+        )
+    return record
+
+
+@contextlib.contextmanager
+def garbage_collection(enabled: bool) -> typing.Iterator[None]:
+    """Enable or disable the garbage collector within the block and restore it afterwards."""
+    was_enabled = gc.isenabled()
+    if enabled:
+        gc.enable()
+    else:
+        gc.collect()
+        gc.disable()
+
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+        else:
+            gc.disable()
+
+
+def measure_strings(
+    parser: typing.Callable[[str], typing.Any],
+    datestrings: typing.Sequence[str],
+    settings: BenchmarkSettings,
+) -> typing.List[typing.List[float]]:
+    """
+    Take `settings.repeats` timing samples of parsing each of the strings.
+
+    We take one sample of every string before we take the next sample of any of them, so a slow
+    period of the machine is spread over all strings instead of skewing the samples of a few.
+    """
+    samples = [[] for _ in datestrings]
+    calls = range(settings.number)
+    timer = timeit.default_timer
+
+    with garbage_collection(enabled=not settings.disable_gc):
+        for _ in range(settings.warmup):
+            for datestring in datestrings:
+                parser(datestring)
+
+        for _ in range(settings.repeats):
+            for string_samples, datestring in zip(samples, datestrings):
+                start = timer()
+                for _ in calls:
+                    parser(datestring)
+                string_samples.append((timer() - start) / settings.number)
+
+    return samples
+
+
+def measure_passes(
+    parser: typing.Callable[[str], typing.Any],
+    datestrings: typing.Sequence[str],
+    settings: BenchmarkSettings,
+) -> typing.List[float]:
+    """
+    Take `settings.repeats` timing samples of parsing all strings, in seconds per string.
+
+    Each sample is the average time of a pass over all strings. The parser should not raise for
+    invalid strings; wrap it with `reject_errors` for corpora with invalid strings.
+    """
+    samples = []
+    timer = timeit.default_timer
+
+    with garbage_collection(enabled=not settings.disable_gc):
+        for _ in range(settings.warmup):
+            for datestring in datestrings:
+                parser(datestring)
+
+        for _ in range(settings.repeats):
+            start = timer()
+            for datestring in datestrings:
+                parser(datestring)
+            samples.append((timer() - start) / len(datestrings))
+
+    return samples
+
+
+def reject_errors(parser: typing.Callable[[str], typing.Any]) -> typing.Callable[[str], typing.Any]:
+    """Wrap a parser so it returns the `ValueError` for an invalid string instead of raising it."""
+    def parse(datestring: str) -> typing.Any:
+        try:
+            return parser(datestring)
+        except ValueError as exception:
+            return exception
+
+    return parse